@@ -0,0 +1,140 @@
+"""Reads hotkeys and hotstrings from AutoHotkey (v1 and v2) scripts, one line at a time."""
+import re
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional
+from hotkeys import MODIFIER_KEYS, hotkey_from_parts, key_name
+
+# Modifier symbols
+MODIFIER_SYMBOLS = {'^': 'Ctrl', '!': 'Alt', '+': 'Shift', '#': 'Win'}
+# Prefixes that change how a hotkey fires, not which keys it is
+FLAG_SYMBOLS = {'*': 'wildcard', '~': 'pass_through', '$': 'hook'}
+SIDE_SYMBOLS = '<>'
+
+# key, optional "& key" (custom combination), optional " up"
+KEYS = re.compile(r'(?i)(\S+?)(?:\s+&\s+~?(\S+?))?(\s+up)?\s*$')
+HOTSTRING = re.compile(r':([^:\s]*):(.+?)::(.*)$')
+INLINE_COMMENT = re.compile(r'(?<!`)\s+;.*$')
+DIRECTIVE = re.compile(r'#\w+')
+CONTEXT_DIRECTIVES = ('#if', '#hotif', '#ifwinactive', '#ifwinnotactive', '#ifwinexist', '#ifwinnotexist')
+
+
+def translate_hotkey(combo: str) -> Optional[Dict]:
+    """Translate an AutoHotkey hotkey ('~<^!s', 'a & b', '+F1 up') to the launcher's form.
+
+    Returns:
+        {'hotkey': 'Ctrl+Alt+S', 'release': bool, 'flags': [...]} or None if
+        combo isn't a hotkey. A custom combination 'a & b' becomes 'A+B';
+        left/right prefixes are dropped, and modifier keys ('LWin', 'a & LCtrl')
+        count as modifiers.
+    """
+    modifiers = set()
+    flags = []
+    position = 0
+    # A symbol is a modifier only while a key follows it ('^+' is Ctrl and the + key)
+    while position < len(combo) - 1:
+        symbol = combo[position]
+        if symbol in MODIFIER_SYMBOLS:
+            modifiers.add(MODIFIER_SYMBOLS[symbol])
+        elif symbol in FLAG_SYMBOLS:
+            flags.append(FLAG_SYMBOLS[symbol])
+        elif symbol not in SIDE_SYMBOLS:
+            break
+        position += 1
+
+    match = KEYS.match(combo, position)
+    if not match:
+        return None
+    first, second, release = match.groups()
+    keys = [first] if second is None else [first, second]
+    if any(key_name(key) is None and key.lower() not in MODIFIER_KEYS for key in keys):
+        return None
+    hotkey = hotkey_from_parts(sorted(modifiers) + keys)
+    return {'hotkey': str(hotkey), 'release': bool(release), 'flags': flags}
+
+
+def _hotkey_end(line: str) -> int:
+    """Index of the '::' ending a hotkey on line, or -1."""
+    position = 0
+    while position < len(line) - 1 and (line[position] in MODIFIER_SYMBOLS or line[position] in FLAG_SYMBOLS
+                                        or line[position] in SIDE_SYMBOLS):
+        position += 1
+    if position and line.startswith('::', position) and not line.startswith(':::', position):
+        return position  # The key was the last symbol: '^+::' is Ctrl and the + key
+    return line.find('::', position + 1)  # The key is at least one character, and may itself be ':'
+
+
+def iter_ahk(lines: Iterable[str]) -> Iterator[Dict]:
+    """Tokenize script lines into hotkeys and hotstrings.
+
+    Skips ; comments, /* */ blocks and ( ) continuation sections, and
+    tracks #If/#HotIf context sections.
+
+    Yields:
+        {'kind': 'hotkey', 'hotkey', 'raw', 'release', 'flags', 'action', 'context', 'line'} or
+        {'kind': 'hotstring', 'trigger', 'options', 'action', 'context', 'line'}; action is '' when
+        the hotkey's body is on the following lines, context the active #If line (or None)
+    """
+    context = None
+    in_comment = False
+    in_continuation = False
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        if in_comment:
+            if '*/' in line:
+                in_comment = False
+            continue
+        if in_continuation:
+            if line.startswith(')'):
+                in_continuation = False
+            continue
+
+        first = line[0]
+        if first == ';':
+            continue
+        if first == '/' and line.startswith('/*'):
+            in_comment = '*/' not in line[2:]
+            continue
+        if first == '(' and ')' not in line:
+            in_continuation = True
+            continue
+        if first == '#':
+            match = DIRECTIVE.match(line)
+            directive = match.group() if match else ''
+            if directive.lower() in CONTEXT_DIRECTIVES:
+                argument = INLINE_COMMENT.sub('', line[len(directive):]).strip(' ,\t')
+                context = f'{directive} {argument}' if argument else None
+                continue
+        if '::' not in line:
+            continue
+
+        line = INLINE_COMMENT.sub('', line)
+        if first == ':':
+            match = HOTSTRING.match(line)
+            if match:
+                options, trigger, action = match.groups()
+                yield {'kind': 'hotstring', 'trigger': trigger, 'options': options, 'action': action.strip(),
+                       'context': context, 'line': number}
+                continue
+
+        end = _hotkey_end(line)
+        if end < 0:
+            continue
+        raw = line[:end].rstrip()
+        hotkey = translate_hotkey(raw)
+        if hotkey is None:
+            continue
+        action = line[end + 2:].strip()
+        yield dict(hotkey, kind='hotkey', raw=raw, action='' if action == '{' else action, context=context,
+                   line=number)
+
+
+def read_ahk(path: Path) -> Iterator[Dict]:
+    """Tokenize an AutoHotkey script file (UTF-8, with or without BOM), streaming it line by line.
+
+    Raises:
+        OSError: if the file can't be read
+    """
+    with open(path, 'r', encoding='utf-8-sig', errors='replace') as f:
+        yield from iter_ahk(f)
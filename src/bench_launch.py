@@ -0,0 +1,171 @@
+"""Benchmark: shell launch vs direct spawn from a precompiled launch plan.
+
+Usage: python bench_launch.py [command] [iterations]
+       python bench_launch.py --fork-server [iterations] [module ...]
+       python bench_launch.py --prewarm command [iterations] [companion file ...]
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from launch_plan import compile_plan
+from fork_server import ForkServer
+from prewarmer import resident_pages
+
+# Modules the sample script imports (and the fork server preloads) for --fork-server
+DEFAULT_PRELOAD = ['json', 'email.mime.multipart', 'http.client', 'tkinter']
+
+
+def time_spawns(spawn, iterations):
+    """Return per-launch (spawn_ms, total_ms) lists for a spawn function."""
+    spawn_times = []
+    total_times = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        process = spawn()
+        spawned = time.perf_counter()
+        process.wait()
+        done = time.perf_counter()
+        spawn_times.append((spawned - start) * 1000)
+        total_times.append((done - start) * 1000)
+    return spawn_times, total_times
+
+
+def describe(label, samples):
+    samples = sorted(samples)
+    median = samples[len(samples) // 2]
+    print(f"  {label:<22} median {median:7.2f} ms   min {samples[0]:7.2f} ms   max {samples[-1]:7.2f} ms")
+
+
+def time_first_line(start_child, iterations):
+    """Return launch-to-first-line times (ms) for a function that starts a child writing to an fd."""
+    samples = []
+    for _ in range(iterations):
+        read_fd, write_fd = os.pipe()
+        start = time.perf_counter()
+        process = start_child(write_fd)
+        os.close(write_fd)
+        with os.fdopen(read_fd) as output:
+            output.readline()
+        samples.append((time.perf_counter() - start) * 1000)
+        process.wait()
+    return samples
+
+
+def bench_fork_server(iterations, modules):
+    """Compare a cold interpreter start with a fork from the warm fork server."""
+    with tempfile.NamedTemporaryFile('w', suffix='.py', delete=False) as script:
+        script.write(''.join(f"import {name}\n" for name in modules))
+        script.write("print('ready', flush=True)\n")
+    plan = compile_plan({'name': 'bench', 'path': script.name})
+
+    server = ForkServer(preload=modules)
+    server.start()
+    try:
+        server.spawn([script.name]).wait()  # Let the preload finish before timing
+
+        print(f"Script imports: {', '.join(modules)}")
+        print(f"Iterations: {iterations}")
+        print()
+        cold = time_first_line(lambda fd: plan.spawn(stdout=fd), iterations)
+        warm = time_first_line(lambda fd: server.spawn([script.name], stdout=fd), iterations)
+    finally:
+        server.stop()
+        os.unlink(script.name)
+
+    print("Launch to first line:")
+    describe("cold interpreter", cold)
+    describe("fork server", warm)
+
+
+def set_cached(paths, cached):
+    """Drop files from the page cache (POSIX_FADV_DONTNEED) or read them back in."""
+    for path in paths:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            if cached:
+                # WILLNEED is asynchronous (and what the prewarmer uses); reading makes the timing deterministic
+                while os.read(fd, 1024 * 1024):
+                    pass
+            else:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+
+
+def resident_fraction(path):
+    """Fraction of a file's pages in the page cache (None without mincore)."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        vec = resident_pages(fd, os.fstat(fd).st_size)
+    finally:
+        os.close(fd)
+    return sum(flags & 1 for flags in vec) / len(vec) if vec else None
+
+
+def bench_prewarm(command, iterations, companions):
+    """Compare launches with the target evicted from the page cache against prewarmed ones."""
+    if not hasattr(os, 'posix_fadvise'):
+        print("--prewarm needs posix_fadvise (Linux)")
+        return
+    plan = compile_plan({'name': 'bench', 'path': command})
+    paths = [path for path in [plan.executable or plan.target] + companions if path]
+    print(f"Command: {command}")
+    print(f"Files:   {', '.join(paths)} ({sum(os.path.getsize(p) for p in paths) / 1e6:.1f} MB)")
+    print(f"Iterations: {iterations}")
+    print()
+
+    cold = []
+    warm = []
+    evicted = None
+    for _ in range(iterations):
+        set_cached(paths, False)
+        evicted = resident_fraction(paths[0])
+        cold += time_spawns(lambda: plan.spawn(stdout=subprocess.DEVNULL), 1)[1]
+        set_cached(paths, True)
+        warm += time_spawns(lambda: plan.spawn(stdout=subprocess.DEVNULL), 1)[1]
+    if evicted is not None:
+        print(f"Resident after eviction: {evicted:.0%} of {paths[0]}")
+
+    print("Launch to exit:")
+    describe("evicted", cold)
+    describe("prewarmed", warm)
+    print(f"  difference (median)    {sorted(cold)[len(cold) // 2] - sorted(warm)[len(warm) // 2]:7.2f} ms")
+
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == '--prewarm':
+        iterations = int(sys.argv[3]) if len(sys.argv) > 3 else 10
+        bench_prewarm(sys.argv[2], iterations, sys.argv[4:])
+        return
+
+    if len(sys.argv) > 1 and sys.argv[1] == '--fork-server':
+        iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+        bench_fork_server(iterations, sys.argv[3:] or DEFAULT_PRELOAD)
+        return
+
+    command = sys.argv[1] if len(sys.argv) > 1 else ('where /?' if sys.platform == 'win32' else 'true')
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    plan = compile_plan({'name': 'bench', 'path': command})
+    print(f"Command: {command}")
+    print(f"Plan:    {plan}")
+    print(f"Iterations: {iterations}")
+    print()
+
+    shell_spawn, shell_total = time_spawns(
+        lambda: subprocess.Popen(command, shell=True, stdout=subprocess.DEVNULL), iterations)
+    plan_spawn, plan_total = time_spawns(
+        lambda: plan.spawn(stdout=subprocess.DEVNULL), iterations)
+
+    print("Shell (shell=True):")
+    describe("spawn", shell_spawn)
+    describe("spawn + exit", shell_total)
+    print("Direct (launch plan):")
+    describe("spawn", plan_spawn)
+    describe("spawn + exit", plan_total)
+
+
+if __name__ == '__main__':
+    main()
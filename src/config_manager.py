@@ -2,7 +2,9 @@
 import json
 import os
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List
+from shortcut_store import ShortcutStore
+from shortcut_collections import CollectionManager
 
 
 class ConfigManager:
@@ -15,7 +17,17 @@ class ConfigManager:
         """Initialize config manager and load configuration."""
         self.config_dir = self._get_config_directory()
         self.config_path = self.config_dir / self.CONFIG_FILENAME
+        self.store = None  # Built once the config is loaded
         self.config = self._load_config()
+        self.store = ShortcutStore(self.config.get('shortcuts', []))
+
+        # Persist IDs given to shortcuts from older configs
+        if self.store.assigned_ids:
+            self.save_config()
+
+        # Only the manifest and pinned collections are loaded here
+        self.collections = CollectionManager(self.config_dir, self.config.setdefault('collections', []))
+        self._migrate_imported_shortcuts()
 
     def _get_config_directory(self) -> Path:
         """Get the configuration directory path (creates if doesn't exist)."""
@@ -77,6 +89,13 @@ class ConfigManager:
         """Save configuration to file."""
         if config is not None:
             self.config = config
+            if self.store is not None:
+                self.store = ShortcutStore(self.config.get('shortcuts', []))
+                self.collections.flush()  # The rebuilt manager reads collections from disk
+                self.collections = CollectionManager(self.config_dir, self.config.setdefault('collections', []))
+
+        if self.store is not None:
+            self.config['shortcuts'] = self.store.to_list()
 
         with open(self.config_path, 'w', encoding='utf-8') as f:
             json.dump(self.config, f, indent=2, ensure_ascii=False)
@@ -94,6 +113,70 @@ class ConfigManager:
                 return default
         return value
 
-    def get_shortcuts(self):
+    def get_shortcuts(self) -> List[Dict[str, Any]]:
         """Get the list of configured shortcuts."""
-        return self.config.get('shortcuts', [])
+        return self.store.to_list()
+
+    def get_popup_shortcuts(self) -> List[Dict[str, Any]]:
+        """Get shortcuts shown in the popup: config shortcuts plus pinned collections."""
+        shortcuts = self.store.to_list()
+        for name in self.collections.pinned_names():
+            store = self.collections.get(name)
+            if store is not None:
+                shortcuts.extend(store.to_list())
+        return shortcuts
+
+    def update_shortcut(self, shortcut_id: str, **fields) -> bool:
+        """Update a shortcut wherever it lives and save the file it came from.
+
+        Returns False if no loaded shortcut has that ID.
+        """
+        if shortcut_id in self.store:
+            self.store.update(shortcut_id, **fields)
+            self.save_config()
+            return True
+
+        name = self.collections.find(shortcut_id)
+        if name is None:
+            return False
+        self.collections.get(name).update(shortcut_id, **fields)
+        self.collections.save(name)
+        return True
+
+    def import_collection(self, name: str, shortcuts: List[Dict[str, Any]]):
+        """Replace a collection's shortcuts with freshly imported ones (creating it unpinned) and save."""
+        self.collections.create(name, shortcuts, pinned=name in self.collections.pinned_names())
+        self.save_config()
+
+    def _migrate_imported_shortcuts(self):
+        """Move imported shortcuts (those with a 'source') out of config.json, one collection per source.
+
+        Older versions kept scanned ShareX, AutoHotkey and Start Menu entries in
+        the 'shortcuts' array. They go into unpinned collections, searchable
+        from the popup; shortcuts added by hand have no 'source' and stay.
+        """
+        groups = {}
+        for shortcut in self.store.to_list():
+            if shortcut.get('source'):
+                groups.setdefault(shortcut['source'], []).append(shortcut)
+        if not groups:
+            return
+
+        for name, shortcuts in groups.items():
+            store = self.collections.get(name)
+            if store is None:
+                self.collections.create(name, shortcuts)
+            else:
+                for shortcut in shortcuts:
+                    if shortcut['id'] not in store:
+                        store.add(shortcut)
+                self.collections.save(name)
+            for shortcut in shortcuts:
+                self.store.remove(shortcut['id'])
+            print(f"Moved {len(shortcuts)} imported shortcuts to the '{name}' collection")
+        self.save_config()
+
+    def set_shortcuts(self, shortcuts: List[Dict[str, Any]]):
+        """Replace all shortcuts (assigning IDs to new ones). Call save_config() to persist."""
+        self.store = ShortcutStore(shortcuts)
+        self.config['shortcuts'] = self.store.to_list()
@@ -0,0 +1,577 @@
+"""On-disk file-name index over configured folders, kept up to date incrementally."""
+import ctypes
+import json
+import mmap
+import os
+import queue
+import select
+import struct
+import sys
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+MAGIC = b'OTFX'
+VERSION = 1
+SECTIONS = ('roots', 'dir_offsets', 'dir_blob', 'dir_mtimes', 'name_offsets', 'name_blob', 'file_dirs',
+            'tri_keys', 'tri_offsets', 'postings')
+HEADER = struct.Struct('<4sI' + 'QQ' * len(SECTIONS))  # magic, version, (offset, length) per section
+
+DEFAULT_EXCLUDE = ['node_modules', '__pycache__', '$RECYCLE.BIN', 'System Volume Information']
+
+
+def _encode(text: str) -> bytes:
+    return text.encode('utf-8', 'surrogateescape')
+
+
+def _decode(data) -> str:
+    return bytes(data).decode('utf-8', 'surrogateescape')
+
+
+def _trigrams(key: bytes) -> set:
+    """Distinct 3-byte substrings of a case-folded name, as integers."""
+    return {int.from_bytes(key[i:i + 3], 'big') for i in range(len(key) - 2)}
+
+
+def lower_thread_priority():
+    """Run the calling thread at background CPU (and, where supported, I/O) priority."""
+    try:
+        if sys.platform == 'win32':
+            kernel32 = ctypes.windll.kernel32
+            kernel32.SetThreadPriority(kernel32.GetCurrentThread(), 0x00010000)  # THREAD_MODE_BACKGROUND_BEGIN
+        elif sys.platform.startswith('linux'):
+            # Per-thread on Linux; without an explicit I/O class, I/O priority follows nice
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 19)
+    except (AttributeError, OSError):
+        pass
+
+
+def write_index(path: Path, roots: List[str], dirs: Dict[str, int], files: Iterable[Tuple[str, str]]):
+    """Write an index file next to path and return it, for the caller to move into place.
+
+    Args:
+        path: Index file to (re)place
+        roots: Indexed roots (a change of roots forces a rebuild)
+        dirs: {directory: mtime_ns} of every indexed directory
+        files: (directory, file name) pairs
+    """
+    dir_paths = sorted(dirs)
+    dir_ids = {d: i for i, d in enumerate(dir_paths)}
+    files = sorted(files, key=lambda f: (f[1].casefold(), f[0]))
+
+    dir_offsets, dir_blob = array('I', [0]), bytearray()
+    for d in dir_paths:
+        dir_blob += _encode(d)
+        dir_offsets.append(len(dir_blob))
+
+    name_offsets, name_blob, file_dirs = array('I', [0]), bytearray(), array('I')
+    postings = {}  # {trigram: array of file numbers}, built in file order so each list is sorted
+    for number, (directory, name) in enumerate(files):
+        name_blob += _encode(name)
+        name_offsets.append(len(name_blob))
+        file_dirs.append(dir_ids[directory])
+        for tri in _trigrams(_encode(name.casefold())):
+            postings.setdefault(tri, array('I')).append(number)
+
+    tri_keys = array('I', sorted(postings))
+    tri_offsets, all_postings = array('I', [0]), array('I')
+    for tri in tri_keys:
+        all_postings.extend(postings[tri])
+        tri_offsets.append(len(all_postings))
+
+    sections = {
+        'roots': _encode(json.dumps(roots)),
+        'dir_offsets': dir_offsets.tobytes(),
+        'dir_blob': bytes(dir_blob),
+        'dir_mtimes': array('q', (dirs[d] for d in dir_paths)).tobytes(),
+        'name_offsets': name_offsets.tobytes(),
+        'name_blob': bytes(name_blob),
+        'file_dirs': file_dirs.tobytes(),
+        'tri_keys': tri_keys.tobytes(),
+        'tri_offsets': tri_offsets.tobytes(),
+        'postings': all_postings.tobytes(),
+    }
+
+    tmp_path = path.with_suffix('.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(b'\0' * HEADER.size)
+        table = []
+        for name in SECTIONS:
+            f.write(b'\0' * (-f.tell() % 8))  # Keep arrays aligned
+            table += [f.tell(), len(sections[name])]
+            f.write(sections[name])
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, VERSION, *table))
+    return tmp_path
+
+
+class _NameKeys:
+    """Case-folded names of a mapped index as a sequence, for bisect."""
+
+    def __init__(self, mapped):
+        self.mapped = mapped
+
+    def __len__(self):
+        return len(self.mapped)
+
+    def __getitem__(self, number):
+        return self.mapped.name(number).casefold()
+
+
+class MappedIndex:
+    """Read-only view of an index file; names and postings are read straight from the mapping."""
+
+    def __init__(self, path: Path):
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._views = []
+        try:
+            magic, version, *table = HEADER.unpack_from(self._map)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"{path} is not a version {VERSION} file index")
+            buffer = memoryview(self._map)
+            self._views.append(buffer)
+            for i, name in enumerate(SECTIONS):
+                offset, length = table[2 * i], table[2 * i + 1]
+                if offset + length > len(self._map):
+                    raise ValueError(f"{path} is truncated")
+                setattr(self, name, self._view(buffer[offset:offset + length]))
+            for name, fmt in (('dir_offsets', 'I'), ('dir_mtimes', 'q'), ('name_offsets', 'I'), ('file_dirs', 'I'),
+                              ('tri_keys', 'I'), ('tri_offsets', 'I'), ('postings', 'I')):
+                setattr(self, name, self._view(getattr(self, name).cast(fmt)))
+        except Exception:
+            self.close()
+            raise
+
+        self.roots = json.loads(_decode(self.roots))
+        self.dir_paths = [_decode(self.dir_blob[self.dir_offsets[i]:self.dir_offsets[i + 1]])
+                          for i in range(len(self.dir_offsets) - 1)]
+        self.keys = _NameKeys(self)
+
+    def _view(self, view):
+        self._views.append(view)
+        return view
+
+    def __len__(self):
+        return len(self.name_offsets) - 1
+
+    def name(self, number: int) -> str:
+        return _decode(self.name_blob[self.name_offsets[number]:self.name_offsets[number + 1]])
+
+    def directory(self, number: int) -> str:
+        return self.dir_paths[self.file_dirs[number]]
+
+    def dirs(self) -> Dict[str, int]:
+        return {d: self.dir_mtimes[i] for i, d in enumerate(self.dir_paths)}
+
+    def files(self) -> Iterable[Tuple[str, str]]:
+        for number in range(len(self)):
+            yield self.directory(number), self.name(number)
+
+    def prefix_matches(self, prefix: str) -> Iterable[int]:
+        """File numbers whose case-folded name starts with prefix, in name order."""
+        number = bisect_left(self.keys, prefix)
+        while number < len(self) and self.keys[number].startswith(prefix):
+            yield number
+            number += 1
+
+    def substring_candidates(self, folded: str) -> Iterable[int]:
+        """File numbers that have every trigram of folded (a superset of the names containing it)."""
+        lists = []
+        for tri in _trigrams(_encode(folded)):
+            i = bisect_left(self.tri_keys, tri)
+            if i == len(self.tri_keys) or self.tri_keys[i] != tri:
+                return
+            lists.append(self.postings[self.tri_offsets[i]:self.tri_offsets[i + 1]])
+        lists.sort(key=len)
+        for number in lists[0]:
+            if all(_contains(other, number) for other in lists[1:]):
+                yield number
+
+    def close(self):
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._map.close()
+
+
+def _contains(sorted_numbers, number: int) -> bool:
+    i = bisect_left(sorted_numbers, number)
+    return i < len(sorted_numbers) and sorted_numbers[i] == number
+
+
+def scan_dir(path: str, exclude: set, include_hidden: bool) -> Optional[Tuple[int, List[str], List[str]]]:
+    """List a directory without following links. Returns (mtime_ns, file names, subdirectories) or None."""
+    try:
+        mtime = os.stat(path).st_mtime_ns
+        files, subdirs = [], []
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.name in exclude or (not include_hidden and entry.name.startswith('.')):
+                    continue
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    else:
+                        files.append(entry.name)
+                except OSError:
+                    continue
+        return mtime, files, subdirs
+    except OSError:
+        return None  # Vanished or unreadable
+
+
+class Inotify:
+    """Minimal ctypes inotify wrapper reporting which watched directories changed (Linux only)."""
+
+    MASK = 0x100 | 0x200 | 0x40 | 0x80 | 0x400 | 0x800 | 0x01000000  # CREATE, DELETE, MOVED_*, *_SELF, ONLYDIR
+    CLOSE_WRITE = 0x08  # Add to the mask to also hear about files written in place
+    IGNORED = 0x8000  # The watch is gone (removed, or its directory deleted)
+    EVENT = struct.Struct('iIII')
+
+    def __init__(self, mask: int = MASK):
+        self.mask = mask
+        self._libc = ctypes.CDLL(None, use_errno=True)
+        self.fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        self._paths = {}  # {watch descriptor: directory}
+        self._wds = {}  # {directory: watch descriptor}
+
+    def add(self, path: str) -> bool:
+        wd = self._libc.inotify_add_watch(self.fd, _encode(path), self.mask)
+        if wd < 0:
+            return False  # Usually ENOSPC: out of fs.inotify.max_user_watches
+        self._paths[wd] = path
+        self._wds[path] = wd
+        return True
+
+    def remove(self, path: str):
+        """Stop watching a directory (no-op if it isn't watched)."""
+        wd = self._wds.pop(path, None)
+        if wd is not None and self._paths.pop(wd, None) is not None:
+            self._libc.inotify_rm_watch(self.fd, wd)  # EINVAL if the kernel already dropped it
+
+    def __len__(self):
+        return len(self._paths)
+
+    def read(self, timeout: float) -> set:
+        """Wait up to timeout seconds; return the directories with changes."""
+        changed = set()
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return changed
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+        offset = 0
+        while offset < len(data):
+            wd, mask, _cookie, length = self.EVENT.unpack_from(data, offset)
+            offset += self.EVENT.size + length
+            if wd in self._paths:
+                changed.add(self._paths[wd])
+                if mask & self.IGNORED:  # The descriptor may be reused for another directory
+                    path = self._paths.pop(wd)
+                    if self._wds.get(path) == wd:
+                        del self._wds[path]
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+class FileIndex:
+    """File names under a set of roots, searchable by prefix and substring.
+
+    The index lives in one file (see write_index): directories with their
+    mtimes, file names sorted case-insensitively (prefix queries are a
+    binary search), and trigram posting lists over the case-folded names
+    (substring queries intersect the query's trigrams, then check the few
+    candidates). It is memory-mapped, so opening it costs nothing per file.
+
+    The first build walks the roots in parallel, one directory per task.
+    After that, a directory is only re-read when its mtime changes: at
+    startup and every rescan_s every indexed directory is stat'ed, and on
+    Linux the first max_watches directories (shallowest first) are also
+    watched with inotify. Re-read directories are kept in memory and take
+    precedence over the mapped data until the file is rewritten, at most
+    every WRITE_INTERVAL. All indexing runs on background-priority threads.
+    """
+
+    WRITE_INTERVAL = 60.0
+    DEBOUNCE = 0.5
+
+    def __init__(self, path: Path, roots: List[str], exclude: List[str] = None, include_hidden: bool = False,
+                 workers: int = 4, rescan_s: float = 300, max_watches: int = 8192):
+        """Initialize the index (nothing is read until open() or start()).
+
+        Args:
+            path: Index file
+            roots: Folders to index (~ and environment variables are expanded)
+            exclude: File and folder names to skip anywhere
+            include_hidden: Index names starting with a dot
+            workers: Threads for the initial build
+            rescan_s: Seconds between mtime sweeps
+            max_watches: Most directories to watch with inotify
+        """
+        self.path = Path(path)
+        self.roots = [os.path.abspath(os.path.expandvars(os.path.expanduser(r))) for r in roots]
+        self.exclude = set(DEFAULT_EXCLUDE if exclude is None else exclude)
+        self.include_hidden = include_hidden
+        self.workers = max(1, workers)
+        self.rescan_s = rescan_s
+        self.max_watches = max_watches
+
+        self._lock = threading.Lock()
+        self._mapped = None
+        self._dirs = {}  # {directory: mtime_ns} for everything indexed
+        self._overlay = {}  # {directory: file names} re-read since the file was written ([] if removed)
+        self._last_write = 0.0
+        self._inotify = None
+        self._stopping = threading.Event()
+        self._thread = None
+        self.last_build_ms = None
+
+    def open(self) -> bool:
+        """Map the existing index file. Returns False if there is none (or it is stale or damaged)."""
+        try:
+            mapped = MappedIndex(self.path)
+        except (OSError, ValueError) as e:
+            if not isinstance(e, FileNotFoundError):
+                print(f"Ignoring file index {self.path}: {e}")
+            return False
+        if mapped.roots != self.roots:
+            mapped.close()
+            return False
+        with self._lock:
+            self._replace_mapped(mapped)
+        return True
+
+    def start(self):
+        """Open or build the index and keep it updated from a background thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='file-index', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stopping.set()
+
+    def __len__(self):
+        with self._lock:
+            mapped = len(self._mapped) if self._mapped else 0
+            return mapped + sum(len(names) for names in self._overlay.values())
+
+    def search(self, query: str, limit: int = 50) -> List[str]:
+        """Get paths whose file name contains query (case-insensitive), prefix matches first."""
+        folded = query.casefold()
+        if not folded:
+            return []
+        with self._lock:
+            mapped, overlay = self._mapped, self._overlay
+            prefix, substring = [], []
+
+            def current(number):
+                return mapped.directory(number) not in overlay
+
+            if mapped:
+                for number in mapped.prefix_matches(folded):
+                    if current(number):
+                        prefix.append(os.path.join(mapped.directory(number), mapped.name(number)))
+                        if len(prefix) >= limit:
+                            break
+            for directory, names in overlay.items():
+                for name in names:
+                    key = name.casefold()
+                    if key.startswith(folded):
+                        prefix.append(os.path.join(directory, name))
+                    elif folded in key:
+                        substring.append(os.path.join(directory, name))
+
+            if mapped and len(folded) >= 3 and len(prefix) + len(substring) < limit:
+                for number in mapped.substring_candidates(folded):
+                    key = mapped.keys[number]
+                    if folded in key and not key.startswith(folded) and current(number):
+                        substring.append(os.path.join(mapped.directory(number), mapped.name(number)))
+                        if len(prefix) + len(substring) >= limit:
+                            break
+        return (prefix + substring)[:limit]
+
+    def build(self):
+        """Index the roots from scratch (parallel walk) and write the index file."""
+        started = time.perf_counter()
+        dirs, files = self._walk(self.roots)
+        self._write(dirs, files)
+        self.last_build_ms = (time.perf_counter() - started) * 1000
+        print(f"Indexed {len(files)} files in {len(dirs)} folders ({self.last_build_ms:.0f}ms)")
+
+    def update(self, directories: Iterable[str] = None):
+        """Re-read directories whose mtime changed (all indexed ones if none are given)."""
+        with self._lock:
+            known = dict(self._dirs)
+        candidates = known if directories is None else [d for d in directories if d in known]
+        changed = []
+        for directory in candidates:
+            try:
+                mtime = os.stat(directory).st_mtime_ns
+            except OSError:
+                mtime = None
+            if mtime != known[directory]:
+                changed.append(directory)
+        for directory in changed:
+            self._reread(directory, known)
+        return len(changed)
+
+    def close(self):
+        self.stop()
+        with self._lock:
+            self._replace_mapped(None)
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+    def _walk(self, roots: List[str]) -> Tuple[Dict[str, int], List[Tuple[str, str]]]:
+        """List every directory under roots, one directory per pool task."""
+        dirs, files = {}, []
+        listings = queue.Queue()  # (directory, listing) as tasks finish
+
+        def task(directory):
+            listings.put((directory, scan_dir(directory, self.exclude, self.include_hidden)))
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='file-index',
+                                initializer=lower_thread_priority) as pool:
+            outstanding = 0
+            futures = []
+            for root in roots:
+                if os.path.isdir(root):
+                    futures.append(pool.submit(task, root))
+                    outstanding += 1
+            while outstanding and not self._stopping.is_set():
+                directory, listing = listings.get()
+                outstanding -= 1
+                if listing is None:
+                    continue
+                mtime, names, subdirs = listing
+                dirs[directory] = mtime
+                files.extend((directory, name) for name in names)
+                for subdir in subdirs:
+                    futures.append(pool.submit(task, subdir))
+                    outstanding += 1
+            if outstanding:
+                for future in futures:
+                    future.cancel()  # shutdown(cancel_futures=True) needs Python 3.9
+        return dirs, files
+
+    def _reread(self, directory: str, known: Dict[str, int]):
+        """Refresh one changed directory: its files, new subdirectories, and removed ones."""
+        listing = scan_dir(directory, self.exclude, self.include_hidden)
+        with self._lock:
+            if listing is None:
+                removed = [d for d in self._dirs if d == directory or d.startswith(directory + os.sep)]
+                for d in removed:
+                    del self._dirs[d]
+                    self._overlay[d] = []
+                return
+            mtime, names, subdirs = listing
+            self._dirs[directory] = mtime
+            self._overlay[directory] = names
+            gone_prefixes = [d + os.sep for d in known if os.path.dirname(d) == directory and d not in subdirs]
+            for d in [d for d in self._dirs if any((d + os.sep).startswith(p) for p in gone_prefixes)]:
+                del self._dirs[d]
+                self._overlay[d] = []
+
+        new = [d for d in subdirs if d not in known]
+        if new:
+            dirs, files = self._walk(new)
+            with self._lock:
+                self._dirs.update(dirs)
+                for d in dirs:
+                    self._overlay[d] = [name for parent, name in files if parent == d]
+            for d in dirs:
+                self._watch(d)
+
+    def _write(self, dirs: Dict[str, int], files: List[Tuple[str, str]]):
+        """Write a new index file and map it in place of the old one."""
+        tmp_path = write_index(self.path, self.roots, dirs, files)
+        with self._lock:
+            self._replace_mapped(None)  # Windows can't replace a mapped file
+            os.replace(tmp_path, self.path)
+            self._replace_mapped(MappedIndex(self.path))
+            self._overlay = {}
+        self._last_write = time.monotonic()
+
+    def _flush(self):
+        """Fold the re-read directories into a new index file."""
+        with self._lock:
+            # Under the lock: close() may unmap the index meanwhile
+            mapped, overlay, dirs = self._mapped, dict(self._overlay), dict(self._dirs)
+            files = [(d, name) for d, name in mapped.files() if d not in overlay] if mapped else []
+        files += [(d, name) for d, names in overlay.items() if d in dirs for name in names]
+        self._write(dirs, files)
+
+    def _replace_mapped(self, mapped: Optional[MappedIndex]):
+        """Swap the mapping (lock held)."""
+        if self._mapped:
+            self._mapped.close()
+        self._mapped = mapped
+        if mapped:
+            self._dirs = mapped.dirs()
+
+    def _watch(self, directory: str):
+        if self._inotify is not None and len(self._inotify) < self.max_watches:
+            self._inotify.add(directory)
+
+    def _run(self):
+        """Index thread: open or build, then follow changes."""
+        lower_thread_priority()
+        try:
+            if self.open():
+                started = time.perf_counter()
+                changed = self.update()
+                print(f"File index: {len(self)} files, {changed} folders changed since last run "
+                      f"({(time.perf_counter() - started) * 1000:.0f}ms)")
+            else:
+                self.build()
+        except Exception as e:
+            print(f"File index failed: {e}")
+            return
+
+        if sys.platform.startswith('linux'):
+            try:
+                self._inotify = Inotify()
+                with self._lock:
+                    shallow_first = sorted(self._dirs, key=lambda d: d.count(os.sep))
+                for directory in shallow_first[:self.max_watches]:
+                    self._watch(directory)
+            except (OSError, AttributeError) as e:
+                print(f"File index: no inotify ({e}); relying on periodic rescans")
+                self._inotify = None
+
+        next_sweep = time.monotonic() + self.rescan_s
+        while not self._stopping.is_set():
+            try:
+                timeout = max(0.0, next_sweep - time.monotonic())
+                if self._inotify is not None:
+                    changed = self._inotify.read(min(timeout, self.WRITE_INTERVAL))
+                    if changed:
+                        # Collect the rest of a burst (e.g. an unpacked archive) before re-reading
+                        while not self._stopping.is_set():
+                            more = self._inotify.read(self.DEBOUNCE)
+                            if not more:
+                                break
+                            changed |= more
+                        self.update(changed)
+                else:
+                    self._stopping.wait(min(timeout, self.WRITE_INTERVAL))
+
+                if time.monotonic() >= next_sweep:
+                    self.update()
+                    next_sweep = time.monotonic() + self.rescan_s
+                if self._overlay and time.monotonic() - self._last_write >= self.WRITE_INTERVAL:
+                    self._flush()
+            except Exception as e:
+                print(f"File index update failed: {e}")
+                self._stopping.wait(self.rescan_s)
@@ -0,0 +1,105 @@
+"""Writes the .lnk fixtures next to this script (python make_fixtures.py); test_lnk.py reads them.
+
+Each link is assembled field by field from MS-SHLLINK, so the corpus covers
+cases no real Start Menu is guaranteed to have.
+"""
+import struct
+import uuid
+from pathlib import Path
+
+HEADER = struct.Struct('<I16sIIQQQIiIHHII')
+LINK_CLSID = uuid.UUID('00021401-0000-0000-c000-000000000046').bytes_le
+HAS_ID_LIST, HAS_LINK_INFO, HAS_NAME, HAS_RELATIVE_PATH = 0x01, 0x02, 0x04, 0x08
+HAS_WORKING_DIR, HAS_ARGUMENTS, HAS_ICON_LOCATION, IS_UNICODE = 0x10, 0x20, 0x40, 0x80
+FORCE_NO_LINK_INFO = 0x100
+STRING_FIELDS = ((HAS_NAME, 'description'), (HAS_RELATIVE_PATH, 'relative_path'),
+                 (HAS_WORKING_DIR, 'working_dir'), (HAS_ARGUMENTS, 'arguments'),
+                 (HAS_ICON_LOCATION, 'icon_location'))
+FOLDERID_PROGRAMS = uuid.UUID('a77f5d77-2e2b-44c3-a6a2-aba601054a51')
+
+
+def local_link_info(path: str, unicode: bool = False) -> bytes:
+    """LinkInfo with VolumeIDAndLocalBasePath (plus the Unicode copy when unicode)."""
+    header_size = 0x24 if unicode else 0x1C
+    volume = struct.pack('<4I', 0x11, 3, 0x1234ABCD, 0x10) + b'\0'
+    base = path.encode('cp1252', 'replace') + b'\0'
+    suffix = b'\0'
+    volume_offset = header_size
+    base_offset = volume_offset + len(volume)
+    suffix_offset = base_offset + len(base)
+    body = volume + base + suffix
+    extra = b''
+    if unicode:
+        base_w = path.encode('utf-16-le') + b'\0\0'
+        base_offset_w = suffix_offset + len(suffix)
+        suffix_offset_w = base_offset_w + len(base_w)
+        extra = struct.pack('<2I', base_offset_w, suffix_offset_w)
+        body += base_w + b'\0\0'
+    size = header_size + len(body)
+    return struct.pack('<7I', size, header_size, 0x1, volume_offset, base_offset, 0, suffix_offset) + extra + body
+
+
+def network_link_info(share: str, suffix: str) -> bytes:
+    """LinkInfo with CommonNetworkRelativeLinkAndPathSuffix."""
+    name = share.encode('cp1252') + b'\0'
+    network = struct.pack('<5I', 0x14 + len(name), 0, 0x14, 0, 0) + name
+    suffix_bytes = suffix.encode('cp1252') + b'\0'
+    network_offset = 0x1C
+    suffix_offset = network_offset + len(network)
+    size = suffix_offset + len(suffix_bytes)
+    return struct.pack('<7I', size, 0x1C, 0x2, 0, 0, network_offset, suffix_offset) + network + suffix_bytes
+
+
+def environment_block(target: str) -> bytes:
+    ansi = target.encode('cp1252').ljust(260, b'\0')
+    wide = target.encode('utf-16-le').ljust(520, b'\0')
+    return struct.pack('<II', 0x314, 0xA0000001) + ansi + wide
+
+
+def known_folder_block(folder: uuid.UUID) -> bytes:
+    return struct.pack('<II', 0x1C, 0xA000000B) + folder.bytes_le + struct.pack('<I', 0)
+
+
+def build_lnk(link_info: bytes = None, strings: dict = None, unicode: bool = True, hotkey: int = 0,
+              extra: bytes = b'', force_no_link_info: bool = False, icon_index: int = 0) -> bytes:
+    strings = strings or {}
+    flags = HAS_ID_LIST | (IS_UNICODE if unicode else 0)
+    if link_info is not None:
+        flags |= HAS_LINK_INFO
+    if force_no_link_info:
+        flags |= FORCE_NO_LINK_INFO
+    string_data = b''
+    for flag, field in STRING_FIELDS:
+        if field in strings:
+            flags |= flag
+            text = strings[field]
+            string_data += struct.pack('<H', len(text)) + text.encode('utf-16-le' if unicode else 'cp1252')
+    header = HEADER.pack(HEADER.size, LINK_CLSID, flags, 0x20, 0, 0, 0, 0, icon_index, 1, hotkey, 0, 0, 0)
+    id_list = struct.pack('<H', 2) + b'\0\0'  # Just the terminal item ID
+    return header + id_list + (link_info or b'') + string_data + extra + b'\0\0\0\0'
+
+
+FIXTURES = {
+    'local.lnk': build_lnk(local_link_info(r'C:\Program Files\App\app.exe'),
+                           {'description': 'The app', 'working_dir': r'C:\Program Files\App',
+                            'arguments': '--new-window', 'icon_location': r'C:\Program Files\App\app.ico'},
+                           hotkey=0x0600 | 0x4B, icon_index=2),
+    'unicode.lnk': build_lnk(local_link_info(r'C:\Users\Zoë\Café\café.exe', unicode=True),
+                             {'arguments': '--λ'}, hotkey=0x0300 | 0x70),
+    'network.lnk': build_lnk(network_link_info(r'\\server\share', r'tools\run.exe'), unicode=False,
+                             strings={'working_dir': r'\\server\share\tools'}),
+    'environment.lnk': build_lnk(strings={'arguments': '/A'},
+                                 extra=environment_block(r'%WINDIR%\notepad.exe')
+                                 + known_folder_block(FOLDERID_PROGRAMS)),
+    'relative.lnk': build_lnk(strings={'relative_path': r'..\bin\tool.exe'}),
+    'force_no_link_info.lnk': build_lnk(local_link_info(r'C:\Ignored\old.exe'), {'arguments': '--safe'},
+                                        force_no_link_info=True, extra=environment_block(r'C:\Real\new.exe')),
+    'ansi_strings.lnk': build_lnk(local_link_info(r'C:\Tools\ansi.exe'), {'description': 'Résumé tool'},
+                                  unicode=False, hotkey=0x0100 | 0x74),
+}
+
+if __name__ == '__main__':
+    folder = Path(__file__).parent
+    for name, data in FIXTURES.items():
+        (folder / name).write_bytes(data)
+        print(f'{name}: {len(data)} bytes')
@@ -0,0 +1,324 @@
+"""Warm fork-server for launching Python-script shortcuts (Linux only)."""
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+from typing import Dict, List, Optional
+
+# Variables kept when reset_env is on; everything else comes from the shortcut's 'env'
+PRESERVED_ENV = ('PATH', 'HOME', 'USER', 'LOGNAME', 'SHELL', 'LANG', 'LC_ALL', 'TERM',
+                 'DISPLAY', 'WAYLAND_DISPLAY', 'XAUTHORITY', 'XDG_RUNTIME_DIR',
+                 'XDG_SESSION_TYPE', 'DBUS_SESSION_BUS_ADDRESS')
+
+MAX_MESSAGE = 65536
+
+
+class ForkedProcess:
+    """Handle for a child forked by the helper, with the parts of Popen the executor uses."""
+
+    def __init__(self, pid: int, argv: List[str]):
+        self.pid = pid
+        self.args = argv
+        self.returncode = None
+        self._exited = threading.Event()
+
+    def poll(self) -> Optional[int]:
+        """Get the exit code, or None while the child is running."""
+        return self.returncode
+
+    def wait(self, timeout: float = None) -> Optional[int]:
+        """Wait for the child to exit and return its exit code."""
+        if not self._exited.wait(timeout):
+            raise subprocess.TimeoutExpired(self.args, timeout)
+        return self.returncode
+
+    def _set_exited(self, returncode: int):
+        self.returncode = returncode
+        self._exited.set()
+
+    def __repr__(self):
+        return f"ForkedProcess(pid={self.pid}, returncode={self.returncode})"
+
+
+class ForkServer:
+    """Starts Python scripts by forking a pre-warmed interpreter.
+
+    A helper process (this module run with --serve) imports the configured
+    preload modules once, then waits on a socket. Each launch request makes
+    it fork; the child applies the safety options and runs the script with
+    runpy, so it skips interpreter start-up and the preloaded imports.
+
+    The helper is single-threaded, so forking it is safe, unlike forking the
+    launcher itself (Tk, keyboard hook and executor threads). It reaps its
+    own children and reports their exit codes back over the socket.
+
+    Options:
+        preload: Module names imported by the helper before the first fork
+        setsid: Start each script in a new session, detached from the launcher
+        close_fds: Close every inherited descriptor above stderr in the child
+        reset_env: Start from PRESERVED_ENV only instead of the helper's environment
+    """
+
+    STARTUP_TIMEOUT = 30.0  # First request also waits for the preload imports
+
+    def __init__(self, preload: List[str] = None, setsid: bool = True, close_fds: bool = True,
+                 reset_env: bool = False):
+        self.options = {
+            'preload': list(preload or []),
+            'setsid': setsid,
+            'close_fds': close_fds,
+            'reset_env': reset_env,
+        }
+        self._helper = None
+        self._sock = None
+        self._reader = None
+        self._lock = threading.Lock()  # One request in flight at a time
+        self._replies = {}  # {request id: reply dict}
+        self._reply_ready = threading.Condition()
+        self._processes = {}  # {pid: ForkedProcess}
+        self._next_id = 0
+
+    @property
+    def alive(self) -> bool:
+        return self._helper is not None and self._helper.poll() is None
+
+    def start(self):
+        """Start the helper process (returns before the preload imports finish)."""
+        if not hasattr(socket, 'send_fds') or not sys.platform.startswith('linux'):
+            raise OSError("The fork server needs Linux and Python 3.9+")
+
+        parent_sock, child_sock = socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+        try:
+            self._helper = subprocess.Popen(
+                [sys.executable, os.path.abspath(__file__), '--serve',
+                 str(child_sock.fileno()), json.dumps(self.options)],
+                pass_fds=(child_sock.fileno(),),
+                stdin=subprocess.DEVNULL
+            )
+        finally:
+            child_sock.close()
+
+        self._sock = parent_sock
+        self._reader = threading.Thread(target=self._read_replies, args=(parent_sock,),
+                                        name='fork-server', daemon=True)
+        self._reader.start()
+        print(f"Fork server started (pid {self._helper.pid}, preload: {', '.join(self.options['preload']) or 'none'})")
+
+    def spawn(self, argv: List[str], cwd: str = None, env: Dict[str, str] = None,
+              stdin: int = None, stdout: int = None, stderr: int = None) -> ForkedProcess:
+        """Fork a child that runs argv[0] as a Python script with argv[1:] as arguments.
+
+        Args:
+            argv: Script path followed by its arguments
+            cwd: Working directory for the script
+            env: Variables added on top of the child's environment
+            stdin, stdout, stderr: Optional file descriptors passed to the child
+        """
+        with self._lock:
+            if not self.alive:
+                if self._helper is not None:
+                    print("Fork server exited, restarting it")
+                self.start()
+
+            self._next_id += 1
+            request_id = self._next_id
+            stdio = [stdin, stdout, stderr]
+            request = {
+                'id': request_id,
+                'argv': argv,
+                'cwd': cwd,
+                'env': env or {},
+                'stdio': [fd is not None for fd in stdio],
+            }
+            socket.send_fds(self._sock, [json.dumps(request).encode('utf-8')],
+                            [fd for fd in stdio if fd is not None])
+
+            with self._reply_ready:
+                if not self._reply_ready.wait_for(lambda: request_id in self._replies or not self.alive,
+                                                  timeout=self.STARTUP_TIMEOUT):
+                    raise OSError("Fork server did not answer")
+                reply = self._replies.pop(request_id, None)
+
+        if reply is None:
+            raise OSError("Fork server exited")
+        if 'error' in reply:
+            raise OSError(reply['error'])
+        return reply['process']  # Not looked up in _processes: a quick script may have exited already
+
+    def stop(self):
+        """Stop the helper. Children already running are left alone."""
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+        if self._helper is not None:
+            try:
+                self._helper.wait(timeout=1)
+            except subprocess.TimeoutExpired:
+                self._helper.kill()
+                self._helper.wait()
+
+    def _read_replies(self, sock: socket.socket):
+        """Reader thread: route spawn replies and exit notices from the helper."""
+        while True:
+            try:
+                data = sock.recv(MAX_MESSAGE)
+            except OSError:
+                data = b''
+            if not data:
+                break
+
+            message = json.loads(data)
+            if 'exited' in message:
+                process = self._processes.pop(message['exited'], None)
+                if process is not None:
+                    process._set_exited(message['returncode'])
+                continue
+
+            if 'pid' in message:
+                # Created before the reply is handed over, so its exit notice (next message) finds it
+                message['process'] = ForkedProcess(message['pid'], message['argv'])
+                self._processes[message['pid']] = message['process']
+            with self._reply_ready:
+                self._replies[message['id']] = message
+                self._reply_ready.notify_all()
+
+        # Helper gone: exit codes of its orphans can no longer be collected
+        for process in list(self._processes.values()):
+            process._set_exited(-1)
+        self._processes.clear()
+        with self._reply_ready:
+            self._reply_ready.notify_all()
+
+
+def _serve(sock_fd: int, options: Dict):
+    """Helper main loop: preload, then fork one child per request."""
+    import importlib
+    import selectors
+    import signal
+
+    for name in options['preload']:
+        try:
+            importlib.import_module(name)
+        except Exception as e:
+            print(f"Fork server could not preload {name}: {e}")
+
+    sock = socket.socket(fileno=sock_fd)
+
+    # SIGCHLD only wakes the loop; children are reaped there, never inside the handler
+    wake_read, wake_write = os.pipe()
+    os.set_blocking(wake_read, False)
+    os.set_blocking(wake_write, False)
+    signal.set_wakeup_fd(wake_write)
+    signal.signal(signal.SIGCHLD, lambda signum, frame: None)
+
+    selector = selectors.DefaultSelector()
+    selector.register(sock, selectors.EVENT_READ)
+    selector.register(wake_read, selectors.EVENT_READ)
+
+    def send(message):
+        sock.send(json.dumps(message).encode('utf-8'))
+
+    while True:
+        for key, _events in selector.select():
+            if key.fileobj is sock:
+                data, fds, _flags, _addr = socket.recv_fds(sock, MAX_MESSAGE, 3)
+                if not data:
+                    return
+                request = json.loads(data)
+                try:
+                    pid = os.fork()
+                except OSError as e:
+                    send({'id': request['id'], 'error': str(e)})
+                else:
+                    if pid == 0:
+                        _run_child(request, fds, options, (sock.fileno(), wake_read, wake_write))
+                    send({'id': request['id'], 'pid': pid, 'argv': request['argv']})
+                finally:
+                    for fd in fds:
+                        os.close(fd)
+            else:
+                try:
+                    os.read(wake_read, 4096)
+                except BlockingIOError:
+                    pass
+                while True:
+                    try:
+                        pid, status = os.waitpid(-1, os.WNOHANG)
+                    except ChildProcessError:
+                        break
+                    if pid == 0:
+                        break
+                    send({'exited': pid, 'returncode': os.waitstatus_to_exitcode(status)})
+
+
+def _run_child(request: Dict, fds: List[int], options: Dict, server_fds: tuple):
+    """Forked child: apply the safety options and run the script. Never returns."""
+    import runpy
+    import signal
+    import traceback
+
+    code = 1
+    try:
+        signal.set_wakeup_fd(-1)
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+
+        if options['setsid']:
+            os.setsid()
+
+        # stdin defaults to /dev/null like a GUI launch; stdout/stderr default to the helper's
+        passed = iter(fds)
+        for target, given in enumerate(request['stdio']):
+            if given:
+                os.dup2(next(passed), target)
+            elif target == 0:
+                devnull = os.open(os.devnull, os.O_RDONLY)
+                os.dup2(devnull, 0)
+                os.close(devnull)
+
+        if options['close_fds']:
+            os.closerange(3, os.sysconf('SC_OPEN_MAX'))
+        else:
+            for fd in list(server_fds) + list(fds):
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+
+        if options['reset_env']:
+            env = {name: os.environ[name] for name in PRESERVED_ENV if name in os.environ}
+        else:
+            env = dict(os.environ)
+        env.update(request['env'])
+        os.environ.clear()
+        os.environ.update(env)
+
+        if request['cwd']:
+            os.chdir(request['cwd'])
+
+        script = request['argv'][0]
+        sys.argv = list(request['argv'])
+        sys.path[0] = os.path.dirname(os.path.abspath(script))
+        runpy.run_path(script, run_name='__main__')
+        code = 0
+    except SystemExit as e:
+        if e.code is None:
+            code = 0
+        elif isinstance(e.code, int):
+            code = e.code
+        else:
+            print(e.code, file=sys.stderr)
+            code = 1
+    except BaseException:
+        traceback.print_exc()
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        finally:
+            os._exit(code)
+
+
+if __name__ == '__main__' and len(sys.argv) == 4 and sys.argv[1] == '--serve':
+    _serve(int(sys.argv[2]), json.loads(sys.argv[3]))
@@ -3,6 +3,7 @@ import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
 import keyboard
 from config_manager import ConfigManager
+from hotkeys import hotkey_from_keys
 from typing import List, Dict, Set
 import threading
 import time
@@ -213,34 +214,7 @@ class HotkeyMonitor:
 
     def _build_hotkey_string(self, keys: Set[str]) -> str:
         """Build a normalized hotkey string from a set of keys."""
-        modifiers = []
-        regular_keys = []
-
-        for key in keys:
-            key_lower = key.lower()
-            if key_lower in ['ctrl', 'left ctrl', 'right ctrl']:
-                if 'Ctrl' not in modifiers:
-                    modifiers.append('Ctrl')
-            elif key_lower in ['alt', 'left alt', 'right alt']:
-                if 'Alt' not in modifiers:
-                    modifiers.append('Alt')
-            elif key_lower in ['shift', 'left shift', 'right shift']:
-                if 'Shift' not in modifiers:
-                    modifiers.append('Shift')
-            elif key_lower in ['win', 'left windows', 'right windows']:
-                if 'Win' not in modifiers:
-                    modifiers.append('Win')
-            else:
-                # Normalize key names
-                normalized = key.upper() if len(key) == 1 else key.title()
-                regular_keys.append(normalized)
-
-        # Sort for consistency
-        modifiers.sort()
-        regular_keys.sort()
-
-        parts = modifiers + regular_keys
-        return '+'.join(parts)
+        return str(hotkey_from_keys(keys))
 
     def _register_hotkey(self, hotkey: str):
         """Register a detected hotkey."""
@@ -394,18 +368,18 @@ class HotkeyMonitor:
             return
 
         # Add to config
-        current_shortcuts = self.config.get_shortcuts()
+        existing_names = {s.get('name') for s in self.config.get_shortcuts()}
 
         for item in selected_items:
-            if not any(s.get('name') == item['name'] for s in current_shortcuts):
-                current_shortcuts.append({
+            if item['name'] not in existing_names and not self.config.store.has_hotkey(item['hotkey']):
+                self.config.store.add({
                     'name': item['name'],
                     'hotkey': item['hotkey'],
                     'path': None,
                     'icon': None
                 })
+                existing_names.add(item['name'])
 
-        self.config.config['shortcuts'] = current_shortcuts
         self.config.save_config()
 
         # Notify user
@@ -0,0 +1,169 @@
+"""Replays hotkey shortcuts once the popup has given focus back."""
+import threading
+import time
+from typing import Dict, List, Callable, Optional
+import keyboard
+from hotkeys import keyboard_hotkey
+from metrics import Metrics
+
+
+class HotkeyReplayer:
+    """Sends hotkey shortcuts from one persistent scheduler thread.
+
+    Hotkey strings are parsed into keyboard scan-code sequences once (when
+    the config loads), not on every click. A click schedules a replay that
+    waits for the popup to go away: window_gone() is called when the popup
+    is destroyed, optionally with a check that focus is back on the previous
+    window. The keystroke is sent as soon as that holds and min_delay_ms has
+    passed since the click. If the popup never reports back, the replay is
+    sent fallback_ms after the click, like the old fixed sleep.
+
+    Click-to-keystroke latency is recorded as 'hotkey_ms' per shortcut.
+    """
+
+    FOCUS_POLL_SECONDS = 0.005
+
+    def __init__(self, metrics: Metrics = None, min_delay_ms: float = 0, fallback_ms: float = 150):
+        """Initialize the replayer and start its thread.
+
+        Args:
+            metrics: Metrics instance to record 'hotkey_ms' samples into
+            min_delay_ms: Shortest time between the click and the keystroke
+            fallback_ms: When to send anyway if the popup never reports it is gone
+        """
+        self.metrics = metrics if metrics is not None else Metrics()
+        self.min_delay = min_delay_ms / 1000.0
+        self.fallback = fallback_ms / 1000.0
+
+        self._parsed = {}  # {hotkey string: parsed scan-code steps, or None if unparseable}
+        self._to_compile = []
+        self._pending = []  # [{'shortcut', 'hotkey', 'action', 'clicked', 'ready', 'deadline', 'is_focus_restored'}]
+        self._condition = threading.Condition()
+        self._stopping = False
+
+        self._thread = threading.Thread(target=self._run, name='hotkey-replay', daemon=True)
+        self._thread.start()
+
+    def prepare(self, shortcuts: List[Dict]):
+        """Parse the hotkeys of these shortcuts on the scheduler thread (call after loading config)."""
+        hotkeys = [s['hotkey'] for s in shortcuts if s.get('hotkey')]
+        with self._condition:
+            self._to_compile.extend(h for h in hotkeys if h not in self._parsed)
+            self._condition.notify()
+
+    def schedule(self, shortcut: Dict, clicked_at: float = None, action: Callable = None):
+        """Queue a hotkey shortcut to be sent once the popup is gone.
+
+        Args:
+            shortcut: Shortcut dict with a 'hotkey'
+            clicked_at: time.perf_counter() of the click (defaults to now)
+            action: Optional callable run instead of sending the hotkey (e.g. starting a macro)
+        """
+        clicked = time.perf_counter() if clicked_at is None else clicked_at
+        with self._condition:
+            self._pending.append({
+                'shortcut': dict(shortcut),
+                'hotkey': shortcut.get('hotkey'),
+                'action': action,
+                'clicked': clicked,
+                'ready': False,
+                'deadline': clicked + self.fallback,
+                'is_focus_restored': None,
+            })
+            self._condition.notify()
+
+    def window_gone(self, is_focus_restored: Callable[[], bool] = None):
+        """Release pending replays: the popup window was destroyed.
+
+        Args:
+            is_focus_restored: Optional check polled until focus is back on the
+                previous window (or the fallback deadline passes)
+        """
+        with self._condition:
+            for replay in self._pending:
+                replay['ready'] = True
+                replay['is_focus_restored'] = is_focus_restored
+            self._condition.notify()
+
+    def shutdown(self):
+        """Stop the scheduler thread; unsent replays are dropped."""
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+
+    def _parse(self, hotkey: str) -> Optional[tuple]:
+        """Parse a hotkey string into scan-code steps (cached)."""
+        if hotkey not in self._parsed:
+            try:
+                # The keyboard library has its own names, e.g. "ctrl+shift+page up"
+                self._parsed[hotkey] = keyboard.parse_hotkey(keyboard_hotkey(hotkey))
+            except ValueError as e:
+                print(f"Cannot parse hotkey {hotkey}: {e}")
+                self._parsed[hotkey] = None
+        return self._parsed[hotkey]
+
+    def _due(self, replay: Dict, now: float) -> bool:
+        """Check whether a replay should be sent now."""
+        if now >= replay['deadline']:
+            return True
+        if not replay['ready'] or now < replay['clicked'] + self.min_delay:
+            return False
+        check = replay['is_focus_restored']
+        return check is None or check()
+
+    def _next_wakeup(self, now: float) -> Optional[float]:
+        """Seconds until a pending replay may become due (None: wait for a notify)."""
+        wakeups = []
+        for replay in self._pending:
+            wakeups.append(replay['deadline'])
+            if replay['ready']:
+                earliest = replay['clicked'] + self.min_delay
+                if replay['is_focus_restored'] is not None:
+                    earliest = max(earliest, now + self.FOCUS_POLL_SECONDS)
+                wakeups.append(earliest)
+        return max(0.0, min(wakeups) - now) if wakeups else None
+
+    def _run(self):
+        """Scheduler thread: parse hotkeys and send replays when they are due."""
+        while True:
+            with self._condition:
+                while True:
+                    if self._stopping:
+                        return
+                    now = time.perf_counter()
+                    to_compile, self._to_compile = self._to_compile, []
+                    due = [r for r in self._pending if self._due(r, now)]
+                    if to_compile or due:
+                        break
+                    self._condition.wait(self._next_wakeup(now))
+                sent = {id(r) for r in due}
+                self._pending = [r for r in self._pending if id(r) not in sent]
+
+            for hotkey in to_compile:
+                self._parse(hotkey)
+
+            for replay in due:
+                self._send(replay)
+
+    def _send(self, replay: Dict):
+        """Send one replay's keystrokes (or run its action) and record its latency."""
+        if replay['action'] is not None:
+            try:
+                replay['action']()
+            except Exception as e:
+                print(f"Error running action for {replay['shortcut'].get('name')}: {e}")
+            return
+
+        parsed = self._parse(replay['hotkey'])
+        if parsed is None:
+            return
+        try:
+            keyboard.send(parsed)
+        except Exception as e:
+            print(f"Error sending hotkey {replay['hotkey']}: {e}")
+            return
+
+        shortcut = replay['shortcut']
+        latency = (time.perf_counter() - replay['clicked']) * 1000
+        self.metrics.record('hotkey_ms', shortcut.get('id', shortcut.get('name')), latency)
+        print(f"Hotkey {replay['hotkey']} sent {latency:.0f}ms after click")
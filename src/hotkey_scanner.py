@@ -12,12 +12,7 @@ Requirements: Windows, pywin32 (pip install pywin32)
 import ctypes
 from ctypes import wintypes
 import itertools
-
-# Windows API constants
-MOD_ALT = 0x0001
-MOD_CONTROL = 0x0002
-MOD_SHIFT = 0x0004
-MOD_WIN = 0x0008
+from hotkeys import MOD_ALT, MOD_CONTROL, MOD_SHIFT, MOD_WIN, key_name as canonical_key, make_hotkey
 
 # Virtual key codes
 VK_CODES = {
@@ -120,7 +115,7 @@ def scan_hotkeys(verbose=True):
                 user32.UnregisterHotKey(None, test_id)
             else:
                 # Failed to register - something else has it
-                hotkey_str = f"{mod_name}+{key_name}" if mod_name else key_name
+                hotkey_str = str(make_hotkey(mod_value, canonical_key(key_name) or key_name))
                 registered_hotkeys.append((mod_name, key_name, hotkey_str))
 
                 if verbose:
@@ -0,0 +1,217 @@
+"""Canonical hotkeys: one comparable value for every way a hotkey is written."""
+import re
+import sys
+import threading
+from functools import lru_cache
+from typing import Dict, Hashable, Iterable, List, NamedTuple, Optional
+
+# Modifier bits, as RegisterHotKey takes them
+MOD_ALT = 0x0001
+MOD_CONTROL = 0x0002
+MOD_SHIFT = 0x0004
+MOD_WIN = 0x0008
+# In the order hotkeys are written
+MODIFIER_NAMES = ((MOD_CONTROL, 'Ctrl'), (MOD_ALT, 'Alt'), (MOD_SHIFT, 'Shift'), (MOD_WIN, 'Win'))
+
+# Every spelling of a modifier key (AutoHotkey, keyboard library, .NET/ShareX), either side
+MODIFIER_KEYS = {
+    'ctrl': MOD_CONTROL, 'control': MOD_CONTROL, 'lctrl': MOD_CONTROL, 'rctrl': MOD_CONTROL,
+    'lcontrol': MOD_CONTROL, 'rcontrol': MOD_CONTROL, 'left ctrl': MOD_CONTROL, 'right ctrl': MOD_CONTROL,
+    'alt': MOD_ALT, 'lalt': MOD_ALT, 'ralt': MOD_ALT, 'left alt': MOD_ALT, 'right alt': MOD_ALT,
+    'shift': MOD_SHIFT, 'lshift': MOD_SHIFT, 'rshift': MOD_SHIFT, 'left shift': MOD_SHIFT, 'right shift': MOD_SHIFT,
+    'win': MOD_WIN, 'windows': MOD_WIN, 'lwin': MOD_WIN, 'rwin': MOD_WIN, 'left windows': MOD_WIN,
+    'right windows': MOD_WIN, 'super': MOD_WIN, 'cmd': MOD_WIN,
+}
+
+# Key names (AutoHotkey's list), by lowercase spelling
+KEY_NAMES = {name.lower(): name for name in (
+    'LButton', 'RButton', 'MButton', 'XButton1', 'XButton2', 'WheelDown', 'WheelUp', 'WheelLeft', 'WheelRight',
+    'CapsLock', 'Space', 'Tab', 'Enter', 'Escape', 'Backspace', 'ScrollLock', 'Delete', 'Insert', 'Home', 'End',
+    'PageUp', 'PageDown', 'Up', 'Down', 'Left', 'Right', 'NumLock', 'NumpadDot', 'NumpadDel', 'NumpadIns',
+    'NumpadClear', 'NumpadUp', 'NumpadDown', 'NumpadLeft', 'NumpadRight', 'NumpadHome', 'NumpadEnd',
+    'NumpadPgUp', 'NumpadPgDn', 'NumpadDiv', 'NumpadMult', 'NumpadAdd', 'NumpadSub', 'NumpadEnter',
+    'Browser_Back', 'Browser_Forward', 'Browser_Refresh', 'Browser_Stop', 'Browser_Search', 'Browser_Favorites',
+    'Browser_Home', 'Volume_Mute', 'Volume_Down', 'Volume_Up', 'Media_Next', 'Media_Prev', 'Media_Stop',
+    'Media_Play_Pause', 'Launch_Mail', 'Launch_Media', 'Launch_App1', 'Launch_App2', 'AppsKey', 'PrintScreen',
+    'CtrlBreak', 'Pause', 'Help', 'Sleep')}
+KEY_NAMES.update({f'numpad{i}': f'Numpad{i}' for i in range(10)})
+KEY_NAMES.update({f'f{i}': f'F{i}' for i in range(1, 25)})
+# Other spellings: AutoHotkey abbreviations, keyboard library names, .NET Keys names (ShareX)
+KEY_ALIASES = {
+    'return': 'Enter', 'esc': 'Escape', 'bs': 'Backspace', 'back': 'Backspace', 'del': 'Delete', 'ins': 'Insert',
+    'break': 'Pause', 'pgup': 'PageUp', 'pgdn': 'PageDown', 'prior': 'PageUp', 'next': 'PageDown',
+    'page up': 'PageUp', 'page down': 'PageDown', 'prtscn': 'PrintScreen', 'print screen': 'PrintScreen',
+    'snapshot': 'PrintScreen', 'caps lock': 'CapsLock', 'capital': 'CapsLock', 'num lock': 'NumLock',
+    'scroll lock': 'ScrollLock', 'spacebar': 'Space', 'apps': 'AppsKey', 'menu': 'AppsKey', 'left arrow': 'Left',
+    'right arrow': 'Right', 'up arrow': 'Up', 'down arrow': 'Down', 'oemplus': '=', 'oemminus': '-',
+    'oemcomma': ',', 'oemperiod': '.', 'oemtilde': '`', 'oem1': ';', 'oem2': '/', 'oem4': '[', 'oem5': '\\',
+    'oem6': ']', 'oem7': "'", 'multiply': 'NumpadMult', 'add': 'NumpadAdd', 'subtract': 'NumpadSub',
+    'divide': 'NumpadDiv', 'decimal': 'NumpadDot', 'nummultiply': 'NumpadMult', 'numadd': 'NumpadAdd',
+    'numsubtract': 'NumpadSub', 'numdivide': 'NumpadDiv', 'numdecimal': 'NumpadDot',
+}
+KEY_ALIASES.update({f'd{i}': str(i) for i in range(10)})
+KEY_ALIASES.update({f'num{i}': f'Numpad{i}' for i in range(10)})
+KEY_ALIASES.update({f'numpad {i}': f'Numpad{i}' for i in range(10)})
+VIRTUAL_KEY = re.compile(r'(?i)(vk[0-9a-f]{1,2})?(sc[0-9a-f]{1,3})?$')
+
+# Names the keyboard library spells differently
+KEYBOARD_NAMES = {'Win': 'windows', 'Escape': 'esc', 'PageUp': 'page up', 'PageDown': 'page down',
+                  'PrintScreen': 'print screen', 'CapsLock': 'caps lock', 'NumLock': 'num lock',
+                  'ScrollLock': 'scroll lock', 'AppsKey': 'menu'}
+
+AHK_PREFIXES = '^!+#<>*~$'
+
+
+class Hotkey(NamedTuple):
+    """A hotkey as modifier bits (MOD_*) plus a canonical key name ('' for modifiers alone).
+
+    Equal hotkeys compare and hash equal whatever they were parsed from;
+    values from parse_hotkey() and make_hotkey() are also interned, so they
+    are the same object. str() gives the canonical spelling, 'Ctrl+Alt+S'.
+    """
+
+    modifiers: int
+    key: str
+
+    def __str__(self):
+        return '+'.join([name for bit, name in MODIFIER_NAMES if self.modifiers & bit] + ([self.key] if self.key else []))
+
+
+_interned = {}
+_intern_lock = threading.Lock()
+
+
+def make_hotkey(modifiers: int, key: str) -> Hotkey:
+    """The interned Hotkey for modifier bits and a (canonical) key name."""
+    hotkey = Hotkey(modifiers, sys.intern(key))
+    with _intern_lock:
+        return _interned.setdefault(hotkey, hotkey)
+
+
+def key_name(key: str) -> Optional[str]:
+    """Canonical name of a known key ('esc' -> 'Escape', 'a' -> 'A'), or None if it isn't one."""
+    if len(key) == 1:
+        return key.upper() if not key.isspace() else None
+    lower = key.lower()
+    if lower in KEY_NAMES:
+        return KEY_NAMES[lower]
+    if lower in KEY_ALIASES:
+        return KEY_ALIASES[lower]
+    if VIRTUAL_KEY.match(key) and len(key) > 2:
+        return key[:2].lower() + key[2:].upper()
+    return None
+
+
+def hotkey_from_parts(parts: Iterable[str]) -> Optional[Hotkey]:
+    """Build a Hotkey from key names in any order; modifiers anywhere are folded into the bits.
+
+    Unknown key names are kept (capitalized), so the value still compares
+    equal to itself. Several non-modifier keys are joined in the given order.
+    """
+    modifiers = 0
+    keys = []
+    for part in parts:
+        part = part.strip()
+        if not part:
+            continue
+        bit = MODIFIER_KEYS.get(part.lower())
+        if bit:
+            modifiers |= bit
+        else:
+            keys.append(key_name(part) or part[:1].upper() + part[1:])
+    if not modifiers and not keys:
+        return None
+    return make_hotkey(modifiers, '+'.join(keys))
+
+
+def hotkey_from_keys(names: Iterable[str]) -> Optional[Hotkey]:
+    """Hotkey for a set of held keys (keyboard library names); order doesn't matter."""
+    names = list(names)
+    modifiers = [name for name in names if name.lower() in MODIFIER_KEYS]
+    others = sorted((key_name(name) or name[:1].upper() + name[1:]) for name in names if name not in modifiers)
+    return hotkey_from_parts(modifiers + others)
+
+
+@lru_cache(maxsize=4096)
+def parse_hotkey(text: str) -> Optional[Hotkey]:
+    """Parse a hotkey in any dialect the launcher meets.
+
+    'Ctrl+Alt+S', 'alt+ctrl+s' (any order and case, keyboard library names),
+    'S, Control' (ShareX: key first, then modifiers) and '^!s' or 'a & b'
+    (AutoHotkey) all give the same Hotkey. Results are cached.
+
+    Returns:
+        The Hotkey, or None if text is empty or a sequence ('ctrl+k, ctrl+c')
+    """
+    text = (text or '').strip()
+    if not text:
+        return None
+    if (len(text) > 1 and text[0] in AHK_PREFIXES and text[:2] != '++') or ' & ' in text:
+        from ahk_parser import translate_hotkey  # It names keys through this module
+        translated = translate_hotkey(text)
+        if translated is not None:
+            return parse_hotkey(translated['hotkey'])
+    if ', ' in text:
+        return hotkey_from_parts(text.split(',')) if '+' not in text else None
+    if text == '+':
+        return make_hotkey(0, '+')
+    if text.endswith('++'):
+        return hotkey_from_parts(text[:-2].split('+') + ['+'])
+    return hotkey_from_parts(text.split('+'))
+
+
+def normalize_hotkey(text: str) -> str:
+    """Canonical spelling of a hotkey ('alt+ctrl+s' -> 'Ctrl+Alt+S'); text unchanged if it isn't one."""
+    hotkey = parse_hotkey(text) if text else None
+    return str(hotkey) if hotkey is not None else text
+
+
+def hotkey_key(text: Optional[str]) -> Hashable:
+    """What to index and compare a shortcut's hotkey field by: the Hotkey, or the text if it doesn't parse."""
+    if not text:
+        return text
+    hotkey = parse_hotkey(text)
+    return hotkey if hotkey is not None else text
+
+
+def keyboard_hotkey(text: str) -> str:
+    """A hotkey (or sequence) in the keyboard library's spelling ('Win+PageUp' -> 'windows+page up')."""
+    hotkey = parse_hotkey(text)
+    if hotkey is None:
+        if ',' in text and '+' in text:  # A sequence: convert each step
+            return ', '.join(keyboard_hotkey(step) for step in text.split(','))
+        return text.lower()
+    parts = [KEYBOARD_NAMES.get(name, name) for bit, name in MODIFIER_NAMES if hotkey.modifiers & bit]
+    if hotkey.key:
+        parts.append(KEYBOARD_NAMES.get(hotkey.key, hotkey.key) if hotkey.key != '+' else 'plus')
+    return '+'.join(parts).lower()
+
+
+def dedupe_key(record: Dict) -> Optional[Hashable]:
+    """What dedupe() compares a record by, or None if it has no hotkey (never a duplicate)."""
+    hotkey = record.get('hotkey')
+    if not hotkey:
+        return None
+    return hotkey_key(hotkey), record.get('path'), record.get('context'), record.get('release')
+
+
+def dedupe(records: Iterable[Dict], seen: set = None) -> List[Dict]:
+    """Drop records with the same hotkey and path as an earlier one (in one hashing pass).
+
+    Records without a hotkey are all kept, and so are AutoHotkey bindings of
+    one hotkey under different #If contexts or on release.
+
+    Args:
+        records: Shortcut dicts
+        seen: Optional set of keys (see dedupe_key) from earlier calls, updated in place
+    """
+    seen = set() if seen is None else seen
+    unique = []
+    for record in records:
+        key = dedupe_key(record)
+        if key is not None:
+            if key in seen:
+                continue
+            seen.add(key)
+        unique.append(record)
+    return unique
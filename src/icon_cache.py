@@ -0,0 +1,303 @@
+"""Asynchronous icon loading with a disk-backed thumbnail cache."""
+import base64
+import configparser
+import hashlib
+import io
+import os
+import queue
+import shutil
+import threading
+import tkinter as tk
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional, Callable
+from PIL import Image
+
+IMAGE_EXTENSIONS = {'.png', '.ico', '.jpg', '.jpeg', '.gif', '.bmp', '.webp', '.xpm'}
+
+# Where .desktop Icon= names are looked up (largest sizes first, they downscale best)
+ICON_THEME_DIRS = [
+    Path.home() / '.local' / 'share' / 'icons' / 'hicolor',
+    Path('/usr/share/icons/hicolor'),
+]
+ICON_THEME_SIZES = ['256x256', '128x128', '64x64', '48x48', '32x32', '24x24', '16x16']
+PIXMAP_DIRS = [Path('/usr/share/pixmaps')]
+
+
+def resolve_icon_source(shortcut: Dict) -> Optional[Path]:
+    """Find the file an icon should come from: the 'icon' field, or the target's path."""
+    candidate = shortcut.get('icon') or shortcut.get('path')
+    if not candidate:
+        return None
+
+    path = Path(os.path.expandvars(os.path.expanduser(candidate)))
+    if not path.is_absolute():
+        found = shutil.which(candidate)
+        if not found:
+            return None
+        path = Path(found)
+
+    return path if path.exists() else None
+
+
+def _desktop_icon_path(desktop_file: Path) -> Optional[Path]:
+    """Resolve the Icon= entry of a .desktop file to an image file."""
+    parser = configparser.ConfigParser(interpolation=None, strict=False)
+    try:
+        parser.read(desktop_file, encoding='utf-8')
+        icon = parser.get('Desktop Entry', 'Icon', fallback=None)
+    except (configparser.Error, UnicodeDecodeError):
+        return None
+    if not icon:
+        return None
+
+    if os.path.isabs(icon):
+        return Path(icon) if os.path.exists(icon) else None
+
+    for theme_dir in ICON_THEME_DIRS:
+        for size in ICON_THEME_SIZES:
+            candidate = theme_dir / size / 'apps' / f'{icon}.png'
+            if candidate.exists():
+                return candidate
+    for pixmap_dir in PIXMAP_DIRS:
+        for ext in ('.png', '.xpm'):
+            candidate = pixmap_dir / f'{icon}{ext}'
+            if candidate.exists():
+                return candidate
+    return None
+
+
+def _open_source_image(source: Path) -> Optional[Image.Image]:
+    """Open the image an icon should be made from, or None if there is none."""
+    suffix = source.suffix.lower()
+
+    if suffix in IMAGE_EXTENSIONS:
+        return Image.open(source)
+
+    if suffix == '.desktop':
+        icon_path = _desktop_icon_path(source)
+        return Image.open(icon_path) if icon_path else None
+
+    if suffix in ('.exe', '.dll'):
+        # Embedded resources need an optional parser
+        try:
+            from icoextract import IconExtractor
+        except ImportError:
+            return None
+        try:
+            return Image.open(IconExtractor(str(source)).get_icon())
+        except Exception:
+            return None
+
+    return None
+
+
+class IconCache:
+    """Loads shortcut icons off the UI thread and caches the thumbnails.
+
+    Icons are decoded and downscaled once with Pillow on a small worker pool,
+    then kept as PNG files in a size-bounded LRU directory keyed by target
+    path and mtime. The UI thread only turns finished PNG bytes into
+    PhotoImages (Tk objects may not be created from other threads); those are
+    held in a bounded LRU tied to the current Tk root.
+    """
+
+    DIRNAME = "icons"
+
+    def __init__(self, config_dir: Path, size: int = 16, max_disk_bytes: int = 20 * 1024 * 1024,
+                 max_images: int = 512, workers: int = 2):
+        """Initialize the icon cache.
+
+        Args:
+            config_dir: Configuration directory (thumbnails go in <config_dir>/icons)
+            size: Thumbnail edge length in pixels
+            max_disk_bytes: Size bound for the on-disk thumbnail cache
+            max_images: Most PhotoImages kept in memory at once
+            workers: Background decode threads
+        """
+        self.cache_dir = Path(config_dir) / self.DIRNAME
+        self.size = size
+        self.max_disk_bytes = max_disk_bytes
+        self.max_images = max_images
+
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='icon')
+        self._done = queue.Queue()  # (icon/path field, cache key, png bytes or None) from workers
+        self._pending = {}  # {icon/path field: [callbacks]}
+        self._futures = set()  # Queued and running loads, cancelled on shutdown
+        self._keys = {}  # {icon/path field: cache key}, avoids re-statting per row draw
+        self._images = OrderedDict()  # {cache key: PhotoImage}, LRU order, shared by rows with the same icon
+        self._missing = set()  # Icon/path fields with no icon available
+        self._root = None
+        self._placeholder = None
+
+        # Disk LRU bookkeeping: {cache key: (bytes, last access)}
+        self._disk_lock = threading.Lock()
+        self._disk = {}
+        self._disk_bytes = 0
+        self._scan_disk()
+
+    def attach(self, root: tk.Tk):
+        """Bind PhotoImages to a (new) Tk root; images from an old root are dropped."""
+        if root is not self._root:
+            self._root = root
+            self._images.clear()
+            self._placeholder = None
+            self._missing.clear()  # Retry icons that were unavailable last time
+
+    def placeholder(self) -> tk.PhotoImage:
+        """Get the image shown while an icon loads (or when there is none)."""
+        if self._placeholder is None:
+            self._placeholder = tk.PhotoImage(master=self._root, width=self.size, height=self.size)
+        return self._placeholder
+
+    def get(self, shortcut: Dict, on_ready: Callable = None) -> Optional[tk.PhotoImage]:
+        """Get a shortcut's icon without blocking.
+
+        Returns the PhotoImage if already loaded. Otherwise starts loading it
+        in the background, returns None, and calls on_ready() from the UI
+        thread (via poll()) once it is available.
+        """
+        source = shortcut.get('icon') or shortcut.get('path')
+        if not source or source in self._missing:
+            return None
+
+        key = self._keys.get(source)
+        image = self._images.get(key) if key else None
+        if image is not None:
+            self._images.move_to_end(key)
+            return image
+
+        callbacks = self._pending.get(source)
+        if callbacks is None:
+            self._pending[source] = callbacks = []
+            future = self._executor.submit(self._load, source, dict(shortcut))
+            self._futures.add(future)
+            future.add_done_callback(self._futures.discard)
+        if on_ready:
+            callbacks.append(on_ready)
+        return None
+
+    def poll(self) -> bool:
+        """Turn finished thumbnails into PhotoImages. Call from the Tk thread.
+
+        Returns True if any icon became available.
+        """
+        changed = False
+        while True:
+            try:
+                source, key, png = self._done.get_nowait()
+            except queue.Empty:
+                break
+
+            callbacks = self._pending.pop(source, [])
+            if png is None:
+                self._missing.add(source)
+                continue
+            if self._root is None:
+                continue
+
+            self._keys[source] = key
+            self._images[key] = tk.PhotoImage(master=self._root, data=base64.b64encode(png))
+            while len(self._images) > self.max_images:
+                self._images.popitem(last=False)
+            changed = True
+            for callback in callbacks:
+                callback()
+        return changed
+
+    def shutdown(self):
+        """Stop the worker pool, dropping loads that haven't started."""
+        for future in list(self._futures):
+            future.cancel()  # shutdown(cancel_futures=True) needs Python 3.9
+        self._executor.shutdown(wait=False)
+
+    def _load(self, source_field: str, shortcut: Dict):
+        """Worker: produce PNG thumbnail bytes for a shortcut (from disk cache or source)."""
+        key = None
+        png = None
+        try:
+            source = resolve_icon_source(shortcut)
+            if source is not None:
+                stat = source.stat()
+                raw = f"{source}|{stat.st_mtime_ns}|{stat.st_size}|{self.size}"
+                key = hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+                png = self._read_disk(key)
+                if png is None:
+                    png = self._render(source)
+                    if png is not None:
+                        self._write_disk(key, png)
+        except Exception as e:
+            print(f"Error loading icon for {shortcut.get('name')}: {e}")
+            png = None
+
+        self._done.put((source_field, key, png))
+
+    def _render(self, source: Path) -> Optional[bytes]:
+        """Decode and downscale a source image to PNG bytes."""
+        image = _open_source_image(source)
+        if image is None:
+            return None
+        with image:
+            image = image.convert('RGBA')
+            image.thumbnail((self.size, self.size), Image.LANCZOS)
+            out = io.BytesIO()
+            image.save(out, format='PNG')
+            return out.getvalue()
+
+    def _scan_disk(self):
+        """Index the thumbnail directory for LRU bookkeeping."""
+        try:
+            entries = list(os.scandir(self.cache_dir))
+        except FileNotFoundError:
+            return
+        for entry in entries:
+            if entry.name.endswith('.png'):
+                stat = entry.stat()
+                self._disk[entry.name[:-4]] = (stat.st_size, stat.st_mtime)
+                self._disk_bytes += stat.st_size
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        """Read a cached thumbnail and mark it recently used."""
+        path = self.cache_dir / f'{key}.png'
+        try:
+            png = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        try:
+            os.utime(path)  # mtime doubles as last-access time
+        except OSError:
+            pass
+        with self._disk_lock:
+            if key in self._disk:
+                self._disk[key] = (self._disk[key][0], os.path.getmtime(path))
+        return png
+
+    def _write_disk(self, key: str, png: bytes):
+        """Store a thumbnail, evicting least recently used ones past the size bound."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self.cache_dir / f'{key}.png'
+        tmp_path = path.with_suffix('.tmp')
+        tmp_path.write_bytes(png)
+        tmp_path.replace(path)
+
+        with self._disk_lock:
+            old = self._disk.get(key)
+            if old:
+                self._disk_bytes -= old[0]
+            self._disk[key] = (len(png), os.path.getmtime(path))
+            self._disk_bytes += len(png)
+
+            if self._disk_bytes > self.max_disk_bytes:
+                for old_key, (size, _atime) in sorted(self._disk.items(), key=lambda item: item[1][1]):
+                    if self._disk_bytes <= self.max_disk_bytes * 0.9:
+                        break
+                    if old_key == key:
+                        continue
+                    try:
+                        (self.cache_dir / f'{old_key}.png').unlink()
+                    except FileNotFoundError:
+                        pass
+                    del self._disk[old_key]
+                    self._disk_bytes -= size
@@ -0,0 +1,271 @@
+"""Background launch executor with child process tracking and reaping."""
+import os
+import queue
+import select
+import subprocess
+import sys
+import threading
+import time
+from typing import Dict, List, Callable, Optional
+from metrics import Metrics
+from launch_plan import PlanCache
+from workspace import WorkspaceRun
+from process_index import ProcessIndex
+from single_instance import INSTANCE_ACTIONS, instance_target, focus_process, signal_process
+
+
+class LaunchExecutor:
+    """Spawns shortcut targets off the UI thread and reaps the children.
+
+    submit() only queues the request, so a slow spawn never freezes Tk. A
+    worker thread spawns from precompiled launch plans (no shell unless the
+    command needs one), or hands Python scripts to the optional fork server,
+    and records per-shortcut spawn latency; failures are reported through
+    on_error (called from the worker thread, so UI code must marshal it,
+    e.g. with root.after).
+
+    Shortcuts with 'single_instance' set are looked up in the optional
+    ProcessIndex first; a running copy is focused or signalled instead of
+    spawning another.
+
+    Children are kept in a registry until they exit. A reaper thread collects
+    them: on Linux it waits on pidfds (Python 3.9+), elsewhere it polls with
+    Popen.poll() (waitpid WNOHANG on POSIX, handle release on Windows). A
+    SIGCHLD handler is not used because Python only allows installing signal
+    handlers from the main thread, which the tray icon owns.
+    """
+
+    REAP_INTERVAL = 1.0
+
+    def __init__(self, metrics: Metrics = None, on_error: Callable = None, fork_server=None,
+                 process_index: ProcessIndex = None):
+        """Initialize the executor and start its threads.
+
+        Args:
+            metrics: Metrics instance to record 'spawn_ms' samples into
+            on_error: Default callback(shortcut, exception) for failed launches
+            fork_server: Optional started ForkServer used for .py shortcuts
+            process_index: Optional ProcessIndex for single-instance shortcuts and workspace skips
+        """
+        self.metrics = metrics if metrics is not None else Metrics()
+        self.on_error = on_error
+        self.fork_server = fork_server
+        self.processes = process_index
+        self.plans = PlanCache()
+        self._warned_no_index = False
+
+        self._requests = queue.Queue()
+        self._children = {}  # {pid: {'process', 'shortcut_id', 'name', 'started'}}
+        self._children_lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._child_added = threading.Event()
+        self._use_pidfd = sys.platform.startswith('linux') and hasattr(os, 'pidfd_open')
+
+        self._worker = threading.Thread(target=self._run_worker, name='launch-worker', daemon=True)
+        self._reaper = threading.Thread(target=self._run_reaper, name='launch-reaper', daemon=True)
+        self._worker.start()
+        self._reaper.start()
+
+    def submit(self, shortcut: Dict, on_error: Callable = None, on_spawned: Callable = None):
+        """Queue a shortcut to be launched and return immediately.
+
+        Args:
+            shortcut: Shortcut dict with a 'path'
+            on_error: Callback(shortcut, exception) overriding the default one
+            on_spawned: Optional callback(shortcut, process) after a successful spawn
+        """
+        self._requests.put((dict(shortcut), time.perf_counter(), on_error, on_spawned))
+
+    def prepare(self, shortcuts: List[Dict]):
+        """Compile launch plans for shortcuts in the background (call after loading config)."""
+        threading.Thread(target=self.plans.compile_all, args=(list(shortcuts),),
+                         name='launch-plans', daemon=True).start()
+        if self.processes is not None and any(s.get('single_instance') for s in shortcuts):
+            if self.processes.available:
+                self.processes.start()
+            elif not self._warned_no_index:
+                self._warned_no_index = True
+                print("single_instance: running processes can't be listed here (install psutil); "
+                      "only copies started by the launcher are found")
+
+    def submit_workspace(self, shortcut: Dict, members: List[Dict], on_done: Callable = None):
+        """Launch a workspace's members in the background and return the WorkspaceRun.
+
+        Args:
+            shortcut: The workspace shortcut (its 'workspace' dict holds the options)
+            members: Resolved members from workspace.resolve_members()
+            on_done: Optional callback(report) when every member is handled
+        """
+        run = WorkspaceRun(self, shortcut, members, on_done=on_done)
+        run.start()
+        return run
+
+    def find_instances(self, shortcut: Dict) -> List[int]:
+        """Get PIDs of running copies of a shortcut's target: its own live children
+        plus matches in the process index (by resolved executable and arguments)."""
+        pids = {c['process'].pid for c in self.running(shortcut.get('id'))}
+        if self.processes is not None and self.processes.available and shortcut.get('path'):
+            try:
+                target = instance_target(self.plans.get(shortcut))
+            except ValueError:
+                target = None
+            if target is not None:
+                pids.update(self.processes.find(*target))
+        return sorted(pids)
+
+    def running(self, shortcut_id: str = None) -> List[Dict]:
+        """Get live children, optionally only those launched from one shortcut."""
+        with self._children_lock:
+            children = list(self._children.values())
+        # poll() catches children that exited since the reaper last looked
+        return [c for c in children
+                if (shortcut_id is None or c['shortcut_id'] == shortcut_id) and c['process'].poll() is None]
+
+    def shutdown(self):
+        """Stop the worker and reaper threads (children keep running)."""
+        self._stopping.set()
+        self._requests.put(None)
+        self._child_added.set()
+
+    def _run_worker(self):
+        """Worker thread: spawn queued shortcuts one at a time."""
+        while not self._stopping.is_set():
+            request = self._requests.get()
+            if request is None:
+                break
+
+            shortcut, _queued_at, on_error, _on_spawned = request
+            if shortcut.get('single_instance') and self._reuse_instance(shortcut, on_error):
+                continue
+            self.launch_now(*request)
+
+    def launch_now(self, shortcut: Dict, queued_at: float = None, on_error: Callable = None,
+                   on_spawned: Callable = None) -> Optional[subprocess.Popen]:
+        """Spawn a shortcut on the calling thread, register the child and record metrics.
+
+        Used by the worker thread and by workspace runs, which manage their own
+        concurrency. Returns the process, or None if the spawn failed (or the
+        file was handed to os.startfile, which leaves no process to track).
+        """
+        queued_at = time.perf_counter() if queued_at is None else queued_at
+        try:
+            started = time.perf_counter()
+            process = self._spawn(shortcut)
+            spawned = time.perf_counter()
+        except Exception as e:
+            print(f"Error launching {shortcut.get('name')}: {e}")
+            callback = on_error or self.on_error
+            if callback:
+                try:
+                    callback(shortcut, e)
+                except Exception as callback_error:
+                    print(f"Launch error callback failed: {callback_error}")
+            return None
+
+        self.metrics.record('spawn_ms', shortcut.get('id', shortcut.get('name')), (spawned - started) * 1000)
+        self.metrics.record('queue_ms', shortcut.get('id', shortcut.get('name')), (started - queued_at) * 1000)
+        if process is not None:
+            self._register(process, shortcut)
+
+        if on_spawned:
+            try:
+                on_spawned(shortcut, process)
+            except Exception as callback_error:
+                print(f"Launch callback failed: {callback_error}")
+        return process
+
+    def _reuse_instance(self, shortcut: Dict, on_error: Callable = None) -> bool:
+        """Focus or signal a running copy of a single-instance shortcut.
+
+        Returns True if one was found (then nothing is spawned, even if the
+        focus or signal failed, which is reported through on_error).
+        """
+        started = time.perf_counter()
+        pids = self.find_instances(shortcut)
+        if not pids:
+            return False
+
+        action = shortcut['single_instance'] if shortcut['single_instance'] in INSTANCE_ACTIONS else 'focus'
+        if action == 'signal':
+            done = any(signal_process(pid, shortcut.get('instance_signal')) for pid in pids)
+        else:
+            done = any(focus_process(pid) for pid in pids)
+        self.metrics.record('reuse_ms', shortcut.get('id', shortcut.get('name')), (time.perf_counter() - started) * 1000)
+
+        if done:
+            print(f"{shortcut.get('name')} is already running (pid {pids[0]}), used {action} instead of launching")
+        else:
+            error = RuntimeError(f"already running (pid {pids[0]}) but {action} failed")
+            print(f"Could not {action} {shortcut.get('name')}: {error}")
+            callback = on_error or self.on_error
+            if callback:
+                try:
+                    callback(shortcut, error)
+                except Exception as callback_error:
+                    print(f"Launch error callback failed: {callback_error}")
+        return True
+
+    def _spawn(self, shortcut: Dict) -> Optional[subprocess.Popen]:
+        """Start a shortcut's target from its launch plan."""
+        plan = self.plans.get(shortcut)
+        if plan.interpreter and self.fork_server is not None:
+            try:
+                return self.fork_server.spawn(plan.argv[1:], cwd=plan.cwd, env=plan.env)
+            except OSError as e:
+                print(f"Fork server launch failed, starting {shortcut.get('name')} cold: {e}")
+        return plan.spawn()
+
+    def _register(self, process: subprocess.Popen, shortcut: Dict):
+        """Track a new child until it is reaped."""
+        child = {
+            'process': process,
+            'shortcut_id': shortcut.get('id'),
+            'name': shortcut.get('name'),
+            'started': time.time(),
+            'pidfd': None,
+        }
+        if self._use_pidfd:
+            try:
+                child['pidfd'] = os.pidfd_open(process.pid)
+            except OSError:
+                pass  # Already gone, or pidfds unsupported by the kernel; polling covers it
+
+        with self._children_lock:
+            self._children[process.pid] = child
+        self._child_added.set()
+        if self.processes is not None and shortcut.get('single_instance'):
+            self.processes.add(process.pid)
+
+    def _run_reaper(self):
+        """Reaper thread: collect exited children so none are left as zombies."""
+        while not self._stopping.is_set():
+            with self._children_lock:
+                children = list(self._children.values())
+
+            if not children:
+                self._child_added.wait()
+                self._child_added.clear()
+                continue
+
+            pidfds = [c['pidfd'] for c in children if c['pidfd'] is not None]
+            if pidfds and len(pidfds) == len(children):
+                # Sleep until a child exits (or re-check periodically for new children)
+                poller = select.poll()
+                for fd in pidfds:
+                    poller.register(fd, select.POLLIN)
+                poller.poll(self.REAP_INTERVAL * 1000)
+            else:
+                self._child_added.wait(self.REAP_INTERVAL)
+            self._child_added.clear()
+
+            self._reap(children)
+
+    def _reap(self, children: List[Dict]):
+        """Poll children and drop the ones that have exited."""
+        for child in children:
+            if child['process'].poll() is None:
+                continue
+            with self._children_lock:
+                self._children.pop(child['process'].pid, None)
+            if child['pidfd'] is not None:
+                os.close(child['pidfd'])
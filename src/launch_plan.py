@@ -0,0 +1,234 @@
+"""Precompiled launch plans for shortcuts, with a PATH-aware cache."""
+import json
+import os
+import shlex
+import shutil
+import subprocess
+import sys
+import threading
+from typing import Dict, List, Optional
+
+# Pipes, redirects and command chaining (outside quotes) need a real shell to mean what the user wrote
+SHELL_OPERATORS = set('|&;<>')
+
+# Windows only runs these directly; anything else (documents, .bat, .lnk) goes through the shell
+WINDOWS_EXECUTABLE_SUFFIXES = ('.exe', '.com')
+
+
+class LaunchPlan:
+    """How to start one shortcut, decided once instead of on every click.
+
+    A direct plan has an absolute executable and an argv list and is spawned
+    without a shell. A shell plan keeps the old shell=True behaviour for
+    commands that need one (pipes, redirects, chained commands, documents opened by file
+    association, .bat files, or names that don't resolve on PATH). An open
+    plan hands a file to the system's default application, never to a shell.
+    """
+
+    def __init__(self, argv: List[str], executable: Optional[str] = None, cwd: Optional[str] = None,
+                 env: Optional[Dict[str, str]] = None, interpreter: Optional[str] = None,
+                 shell_command: Optional[str] = None, target: Optional[str] = None,
+                 open_path: Optional[str] = None):
+        self.argv = argv
+        self.executable = executable
+        self.cwd = cwd
+        self.env = env  # Overrides merged over os.environ at spawn time
+        self.interpreter = interpreter
+        self.shell_command = shell_command
+        self.open_path = open_path
+        self.target = target  # File whose mtime invalidates the plan
+        self.target_mtime = _mtime(target)
+
+    @property
+    def uses_shell(self) -> bool:
+        return self.shell_command is not None
+
+    def spawn(self, **popen_kwargs) -> Optional[subprocess.Popen]:
+        """Start the process described by this plan (None when opened through os.startfile)."""
+        if self.open_path is not None:
+            return open_with_default_app(self.open_path, cwd=self.cwd, **popen_kwargs)
+
+        env = None
+        if self.env:
+            env = dict(os.environ)
+            env.update(self.env)
+
+        if self.uses_shell:
+            return subprocess.Popen(self.shell_command, shell=True, cwd=self.cwd, env=env, **popen_kwargs)
+        return subprocess.Popen(self.argv, executable=self.executable, cwd=self.cwd, env=env, **popen_kwargs)
+
+    def is_stale(self) -> bool:
+        """Check whether the target file changed (or vanished) since the plan was made."""
+        return self.target is not None and _mtime(self.target) != self.target_mtime
+
+    def __repr__(self):
+        if self.open_path is not None:
+            return f"LaunchPlan(open={self.open_path!r})"
+        if self.uses_shell:
+            return f"LaunchPlan(shell={self.shell_command!r})"
+        return f"LaunchPlan(argv={self.argv!r}, cwd={self.cwd!r})"
+
+
+def open_with_default_app(path: str, **popen_kwargs) -> Optional[subprocess.Popen]:
+    """Open a file with its default application, passing the name as one argument.
+
+    Windows uses os.startfile, which leaves no child to track, so None is
+    returned there; elsewhere the opener (xdg-open, or open on macOS) is spawned.
+    """
+    if sys.platform == 'win32':
+        os.startfile(path)
+        return None
+    opener = 'open' if sys.platform == 'darwin' else 'xdg-open'
+    return subprocess.Popen([opener, path], **popen_kwargs)
+
+
+def _mtime(path: Optional[str]) -> Optional[int]:
+    if path is None:
+        return None
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _needs_shell(command: str) -> bool:
+    """Check for pipe, redirect or chaining operators (or command substitution on POSIX) outside quotes."""
+    posix = os.name != 'nt'
+    quote = None
+    escaped = False
+    for i, char in enumerate(command):
+        if escaped:
+            escaped = False
+        elif quote is not None:
+            if char == quote:
+                quote = None
+            elif char == '\\' and posix and quote == '"':
+                escaped = True
+        elif char == '"' or (char == "'" and posix):
+            quote = char
+        elif char == '\\' and posix:
+            escaped = True
+        elif char in SHELL_OPERATORS:
+            return True
+        elif posix and (char == '`' or command.startswith('$(', i)):
+            return True
+    return False
+
+
+def _is_direct_executable(path: str) -> bool:
+    """Check whether a file can be exec'd without a shell or file association."""
+    if os.name == 'nt':
+        return path.lower().endswith(WINDOWS_EXECUTABLE_SUFFIXES)
+    return os.path.isfile(path) and os.access(path, os.X_OK)
+
+
+def compile_plan(shortcut: Dict) -> LaunchPlan:
+    """Work out how to launch a shortcut.
+
+    Optional shortcut fields besides 'path': 'args' (list), 'cwd' and 'env' (dict),
+    and 'open' (true: path is a file to open with its default application).
+    """
+    path = shortcut.get('path')
+    if not path:
+        raise ValueError(f"No path for {shortcut.get('name')}")
+
+    args = [str(arg) for arg in shortcut.get('args') or []]
+    cwd = shortcut.get('cwd')
+    env = shortcut.get('env')
+
+    if shortcut.get('open'):
+        return LaunchPlan([], cwd=cwd, open_path=os.path.abspath(path), target=path)
+
+    # Check if it's a Python script
+    if path.endswith('.py'):
+        script = os.path.abspath(os.path.expandvars(os.path.expanduser(path)))
+        return LaunchPlan([sys.executable, script] + args, executable=sys.executable, cwd=cwd, env=env,
+                          interpreter=sys.executable, target=script)
+
+    # A whole path that exists is a single argument, even with spaces in it
+    expanded = os.path.expandvars(os.path.expanduser(path))
+    if os.path.isfile(expanded):
+        command, rest = expanded, []
+    elif _needs_shell(path):
+        return LaunchPlan([], cwd=cwd, env=env, shell_command=path)
+    else:
+        # Variables and ~ are expanded here, so only real shell syntax is left for the shell
+        try:
+            tokens = shlex.split(expanded, posix=(os.name != 'nt'))
+        except ValueError:
+            return LaunchPlan([], cwd=cwd, env=env, shell_command=path)
+        if not tokens:
+            raise ValueError(f"Empty path for {shortcut.get('name')}")
+        tokens = [os.path.expanduser(token.strip('"')) for token in tokens]
+        command, rest = tokens[0], tokens[1:]
+
+    resolved = command if os.path.isabs(command) else shutil.which(command)
+    if not resolved or not _is_direct_executable(resolved):
+        # Unresolvable names, documents and scripts that need an interpreter: let the shell decide
+        return LaunchPlan([], cwd=cwd, env=env, shell_command=path, target=resolved)
+
+    resolved = os.path.abspath(resolved)
+    return LaunchPlan([resolved] + rest + args, executable=resolved, cwd=cwd, env=env, target=resolved)
+
+
+class PlanCache:
+    """Launch plans by shortcut ID, invalidated only when PATH or the target file changes."""
+
+    def __init__(self):
+        self._plans = {}  # {shortcut_id: (signature, plan)}
+        self._path_env = os.environ.get('PATH', '')
+        self._lock = threading.Lock()
+
+    def get(self, shortcut: Dict) -> LaunchPlan:
+        """Get the plan for a shortcut, compiling it if missing or stale."""
+        self._check_path()
+        shortcut_id = shortcut.get('id') or shortcut.get('path')
+        signature = self._signature(shortcut)
+
+        with self._lock:
+            cached = self._plans.get(shortcut_id)
+        if cached is not None and cached[0] == signature and not cached[1].is_stale():
+            return cached[1]
+
+        plan = compile_plan(shortcut)
+        with self._lock:
+            self._plans[shortcut_id] = (signature, plan)
+        return plan
+
+    def compile_all(self, shortcuts: List[Dict]):
+        """Compile plans for app shortcuts that have none yet (call at config load, off the UI thread).
+
+        Existing plans with an unchanged signature are kept without touching the
+        disk; staleness is checked when a shortcut is actually launched.
+        """
+        self._check_path()
+        for shortcut in shortcuts:
+            if not shortcut.get('path') or shortcut.get('hotkey'):
+                continue
+            with self._lock:
+                cached = self._plans.get(shortcut.get('id') or shortcut.get('path'))
+            if cached is None or cached[0] != self._signature(shortcut):
+                try:
+                    self.get(shortcut)
+                except Exception as e:
+                    print(f"Could not prepare launch for {shortcut.get('name')}: {e}")
+
+    def invalidate(self, shortcut_id: str = None):
+        """Drop one plan, or all of them."""
+        with self._lock:
+            if shortcut_id is None:
+                self._plans.clear()
+            else:
+                self._plans.pop(shortcut_id, None)
+
+    def _check_path(self):
+        """Drop every plan if PATH changed, since names may now resolve elsewhere."""
+        path_env = os.environ.get('PATH', '')
+        if path_env != self._path_env:
+            self._path_env = path_env
+            self.invalidate()
+
+    @staticmethod
+    def _signature(shortcut: Dict) -> str:
+        fields = {key: shortcut.get(key) for key in ('path', 'args', 'cwd', 'env', 'open')}
+        return json.dumps(fields, sort_keys=True)
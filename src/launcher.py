@@ -5,6 +5,20 @@ import threading
 import sys
 from config_manager import ConfigManager
 from popup_window import PopupWindow
+from search_index import SearchIndex
+from usage_store import UsageStore
+from icon_cache import IconCache
+from launch_executor import LaunchExecutor
+from hotkey_replay import HotkeyReplayer
+from macro_runner import MacroRunner
+from snippet_expander import SnippetExpander
+from fork_server import ForkServer
+from process_index import ProcessIndex
+from prewarmer import Prewarmer
+from result_providers import (ProviderAggregator, RecentProvider, ScannedShortcutProvider, ProcessProvider,
+                              FileProvider, CollectionProvider)
+from file_index import FileIndex
+from metrics import Metrics
 from tray_icon import TrayIcon
 from hotkey_monitor import HotkeyMonitor
 
@@ -21,6 +35,49 @@ class OtterlyLauncher:
         self.key_press_count = 0
         self.key_is_down = False
         self.tray = None  # Store tray reference for cleanup
+        self.metrics = Metrics()
+        self.fork_server = self._start_fork_server()
+        self.processes = ProcessIndex()
+        self.executor = LaunchExecutor(metrics=self.metrics, on_error=self._on_launch_error,
+                                       fork_server=self.fork_server, process_index=self.processes)
+        self.executor.prepare(self.config.get_popup_shortcuts())
+        self.replayer = HotkeyReplayer(
+            metrics=self.metrics,
+            min_delay_ms=self.config.get('hotkey_replay', 'min_delay_ms', default=0),
+            fallback_ms=self.config.get('hotkey_replay', 'fallback_ms', default=150)
+        )
+        self.replayer.prepare(self.config.get_popup_shortcuts())
+        self.macros = MacroRunner(self.executor, metrics=self.metrics)
+        self.macros.prepare(self.config.get_popup_shortcuts())
+        self.snippets = SnippetExpander(metrics=self.metrics)
+        self.snippets.set_snippets(self.config.get('snippets', default=[]))
+        self.search_index = SearchIndex()  # Kept across shows, synced with config on each show
+        self.usage = UsageStore(
+            self.config.config_dir,
+            half_life_days=self.config.get('ranking', 'half_life_days')
+        )
+        self.prewarmer = None
+        if self.config.get('prewarm', 'enabled', default=True):
+            self.prewarmer = Prewarmer(
+                self.usage,
+                self.executor.plans,
+                metrics=self.metrics,
+                top_n=self.config.get('prewarm', 'top_n', default=10),
+                budget_bytes_per_s=int(self.config.get('prewarm', 'budget_mb_per_s', default=32) * 1024 * 1024),
+                interval_s=self.config.get('prewarm', 'interval_s', default=600),
+                max_load=self.config.get('prewarm', 'max_load', default=0.5)
+            )
+            self.prewarmer.set_shortcuts(self.config.get_popup_shortcuts())
+            self.prewarmer.start()
+        self.providers = self._build_providers()
+        if self.providers:
+            self.providers.start()
+        self.icon_cache = None
+        if self.config.get('window', 'show_icons', default=True):
+            self.icon_cache = IconCache(
+                self.config.config_dir,
+                size=self.config.get('window', 'icon_size', default=16)
+            )
 
         # Get trigger settings
         self.trigger_key = self.config.get('trigger', 'key', default='shift')
@@ -31,7 +88,11 @@ class OtterlyLauncher:
         print(f"Config location: {self.config.config_path}")
 
     def _on_key_event(self, event):
-        """Handle keyboard events for trigger detection."""
+        """Handle keyboard events for snippet expansion and trigger detection."""
+        # Typing in the popup filters it; everywhere else it may complete a snippet trigger
+        if not (self.popup and self.popup.is_visible):
+            self.snippets.feed(event)
+
         # Only respond to the trigger key
         if event.name.lower() != self.trigger_key.lower():
             return
@@ -77,14 +138,96 @@ class OtterlyLauncher:
 
         # Reload config before showing to pick up any changes
         self.config = ConfigManager()
+        self.executor.prepare(self.config.get_popup_shortcuts())
+        self.replayer.prepare(self.config.get_popup_shortcuts())
+        self.macros.prepare(self.config.get_popup_shortcuts())
+        self.snippets.set_snippets(self.config.get('snippets', default=[]))
+        if self.prewarmer:
+            self.prewarmer.set_shortcuts(self.config.get_popup_shortcuts())
 
         # Create and show popup in a separate thread
         def show_window():
-            self.popup = PopupWindow(self.config, on_close_callback=self._on_popup_closed)
+            self.popup = PopupWindow(
+                self.config,
+                on_close_callback=self._on_popup_closed,
+                search_index=self.search_index,
+                usage_store=self.usage,
+                icon_cache=self.icon_cache,
+                launch_executor=self.executor,
+                hotkey_replayer=self.replayer,
+                macro_runner=self.macros,
+                providers=self.providers
+            )
             self.popup.show()
 
         threading.Thread(target=show_window, daemon=True).start()
 
+    def _start_fork_server(self):
+        """Start the warm fork server for .py shortcuts if enabled (Linux only)."""
+        options = self.config.get('launch', 'fork_server', default={})
+        if not options.get('enabled') or not sys.platform.startswith('linux'):
+            return None
+
+        server = ForkServer(
+            preload=options.get('preload', []),
+            setsid=options.get('setsid', True),
+            close_fds=options.get('close_fds', True),
+            reset_env=options.get('reset_env', False)
+        )
+        try:
+            server.start()
+        except OSError as e:
+            print(f"Could not start fork server: {e}")
+            return None
+        return server
+
+    def _build_providers(self):
+        """Create the extra search sources listed in config (None if there are none)."""
+        factories = {
+            'recent': lambda: RecentProvider(self.config.config_dir),
+            'scanned': lambda: ScannedShortcutProvider(self.config.config_dir / 'scan_index.json',
+                                                       watch=self.config.get('search', 'watch_scanned', default=True)),
+            'processes': lambda: ProcessProvider(self.processes),
+            'files': self._file_provider,
+            'collections': lambda: CollectionProvider(lambda: self.config.collections),
+        }
+        providers = []
+        for name in self.config.get('search', 'providers', default=['recent', 'collections', 'scanned', 'processes']):
+            if name not in factories:
+                print(f"Unknown search provider: {name}")
+                continue
+            providers.append(factories[name]())
+        if not providers:
+            return None
+        return ProviderAggregator(providers, metrics=self.metrics,
+                                  deadline_ms=self.config.get('search', 'deadline_ms', default=50))
+
+    def _file_provider(self):
+        """Start the file index over search.files.roots and search it."""
+        options = self.config.get('search', 'files', default={})
+        index = FileIndex(
+            self.config.config_dir / 'files.idx',
+            roots=options.get('roots', ['~']),
+            exclude=options.get('exclude'),
+            include_hidden=options.get('include_hidden', False),
+            workers=options.get('workers', 4),
+            rescan_s=options.get('rescan_s', 300),
+            max_watches=options.get('max_watches', 8192)
+        )
+        index.start()
+        return FileProvider(index)
+
+    def _on_launch_error(self, shortcut, error):
+        """Report a failed launch (called from the launch worker thread)."""
+        if self.tray:
+            self.tray.notify(f"Could not launch {shortcut.get('name')}: {error}")
+
+    def _stop_macros(self):
+        """Cancel every running macro."""
+        runs = self.macros.running()
+        print(f"Stopping {len(runs)} running macro(s)")
+        self.macros.cancel_all()
+
     def _on_popup_closed(self):
         """Callback when popup window closes."""
         print("Popup closed callback - resetting popup to None")
@@ -127,6 +270,19 @@ class OtterlyLauncher:
         print("Quitting Otterly Launcher...")
         self.is_running = False
         keyboard.unhook_all()
+        self.usage.close()
+        self.executor.shutdown()
+        self.processes.stop()
+        if self.prewarmer:
+            self.prewarmer.stop()
+        self.replayer.shutdown()
+        self.macros.shutdown()
+        if self.providers:
+            self.providers.shutdown()
+        if self.fork_server:
+            self.fork_server.stop()
+        if self.icon_cache:
+            self.icon_cache.shutdown()
         
         # Stop tray icon if it exists
         if self.tray:
@@ -146,7 +302,8 @@ class OtterlyLauncher:
             on_quit=self._quit,
             on_settings=self._open_settings,
             on_setup_wizard=self._open_setup_wizard,
-            on_manage_shortcuts=self._open_manage_shortcuts
+            on_manage_shortcuts=self._open_manage_shortcuts,
+            on_stop_macros=self._stop_macros
         )
 
         print("Otterly Launcher is running. Check system tray.")
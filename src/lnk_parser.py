@@ -0,0 +1,203 @@
+"""Reads Windows shortcut (.lnk) files directly, following the MS-SHLLINK format."""
+import mmap
+import ntpath
+import struct
+import sys
+import uuid
+from pathlib import Path
+from typing import Dict, Optional
+
+LINK_CLSID = uuid.UUID('00021401-0000-0000-c000-000000000046').bytes_le
+HEADER = struct.Struct('<I16sIIQQQIiIHHII')  # 76 bytes
+
+# LinkFlags
+HAS_ID_LIST = 0x01
+HAS_LINK_INFO = 0x02
+HAS_NAME = 0x04
+HAS_RELATIVE_PATH = 0x08
+HAS_WORKING_DIR = 0x10
+HAS_ARGUMENTS = 0x20
+HAS_ICON_LOCATION = 0x40
+IS_UNICODE = 0x80
+FORCE_NO_LINK_INFO = 0x100
+
+# StringData fields, in file order
+STRING_FIELDS = ((HAS_NAME, 'description'), (HAS_RELATIVE_PATH, 'relative_path'),
+                 (HAS_WORKING_DIR, 'working_dir'), (HAS_ARGUMENTS, 'arguments'),
+                 (HAS_ICON_LOCATION, 'icon_location'))
+
+# ExtraData block signatures
+ENVIRONMENT_BLOCK = 0xA0000001
+SPECIAL_FOLDER_BLOCK = 0xA0000005
+KNOWN_FOLDER_BLOCK = 0xA000000B
+
+# HotKey: low byte is the key, high byte the modifiers
+HOTKEY_MODIFIERS = ((0x02, 'Ctrl'), (0x04, 'Alt'), (0x01, 'Shift'))
+HOTKEY_KEYS = {0x90: 'NumLock', 0x91: 'ScrollLock'}
+HOTKEY_KEYS.update({0x70 + i: f'F{i + 1}' for i in range(24)})
+
+ANSI = 'mbcs' if sys.platform == 'win32' else 'cp1252'
+
+
+class LnkError(ValueError):
+    """The data is not a readable shell link."""
+
+
+def format_hotkey(value: int) -> Optional[str]:
+    """Turn the header's HotKey field into 'Ctrl+Alt+K' form (None if unset)."""
+    key, modifiers = value & 0xFF, value >> 8
+    if not key:
+        return None
+    if 0x30 <= key <= 0x39 or 0x41 <= key <= 0x5A:
+        name = chr(key)
+    else:
+        name = HOTKEY_KEYS.get(key, f'0x{key:02X}')
+    return '+'.join([label for bit, label in HOTKEY_MODIFIERS if modifiers & bit] + [name])
+
+
+def _c_string(data: memoryview, offset: int, unicode: bool = False) -> str:
+    """Read a NUL-terminated string starting at offset."""
+    raw = bytes(data[offset:offset + 2048])  # Paths are far shorter; bounds a corrupt file
+    if unicode:
+        end = raw.find(b'\0\0')
+        while end >= 0 and end % 2:
+            end = raw.find(b'\0\0', end + 1)
+    else:
+        end = raw.find(b'\0')
+    if end < 0:
+        raise LnkError('unterminated string')
+    return raw[:end].decode('utf-16-le' if unicode else ANSI, 'replace')
+
+
+def _parse_link_info(data: memoryview) -> Optional[str]:
+    """Get the target path from a LinkInfo structure (local or network)."""
+    if len(data) < 28:
+        raise LnkError('LinkInfo too short')
+    (_size, header_size, flags, _volume_offset, base_offset, network_offset,
+     suffix_offset) = struct.unpack_from('<7I', data)
+
+    # Newer links add Unicode copies of the base path and suffix
+    base_offset_w = suffix_offset_w = 0
+    if header_size >= 0x24:
+        base_offset_w, suffix_offset_w = struct.unpack_from('<2I', data, 28)
+
+    if suffix_offset_w:
+        suffix = _c_string(data, suffix_offset_w, unicode=True)
+    else:
+        suffix = _c_string(data, suffix_offset) if suffix_offset else ''
+
+    if flags & 0x1:  # VolumeIDAndLocalBasePath
+        if base_offset_w:
+            return _c_string(data, base_offset_w, unicode=True) + suffix
+        return _c_string(data, base_offset) + suffix
+
+    if flags & 0x2:  # CommonNetworkRelativeLinkAndPathSuffix
+        network = data[network_offset:]
+        _size, _flags, name_offset = struct.unpack_from('<3I', network)
+        if name_offset > 0x14:
+            name = _c_string(network, struct.unpack_from('<I', network, 20)[0], unicode=True)
+        else:
+            name = _c_string(network, name_offset)
+        return ntpath.join(name, suffix) if suffix else name
+    return None
+
+
+def parse_lnk(data) -> Dict:
+    """Parse shell link bytes (any buffer; slices are not copied).
+
+    Returns:
+        {'target', 'arguments', 'working_dir', 'icon_location', 'icon_index',
+         'description', 'relative_path', 'hotkey', 'show_command',
+         'environment_target', 'known_folder', 'special_folder'}; missing parts are None
+
+    Raises:
+        LnkError: if the header is not a shell link or a structure runs past the end
+    """
+    data = memoryview(data)
+    if len(data) < HEADER.size:
+        raise LnkError('file too short')
+    (header_size, clsid, flags, _attributes, _created, _accessed, _written, _file_size, icon_index,
+     show_command, hotkey, _r1, _r2, _r3) = HEADER.unpack_from(data)
+    if header_size != HEADER.size or clsid != LINK_CLSID:
+        raise LnkError('not a shell link')
+
+    link = {'target': None, 'icon_index': icon_index, 'show_command': show_command,
+            'hotkey': format_hotkey(hotkey), 'environment_target': None, 'known_folder': None,
+            'special_folder': None}
+    offset = HEADER.size
+    try:
+        if flags & HAS_ID_LIST:
+            offset += 2 + struct.unpack_from('<H', data, offset)[0]  # Shell item IDs; the paths below suffice
+
+        if flags & HAS_LINK_INFO:
+            size = struct.unpack_from('<I', data, offset)[0]
+            if not flags & FORCE_NO_LINK_INFO:  # Present but to be ignored: still skipped over
+                link['target'] = _parse_link_info(data[offset:offset + size])
+            offset += size
+
+        unicode = bool(flags & IS_UNICODE)
+        for flag, field in STRING_FIELDS:
+            link[field] = None
+            if flags & flag:
+                count = struct.unpack_from('<H', data, offset)[0]
+                length = count * 2 if unicode else count
+                raw = bytes(data[offset + 2:offset + 2 + length])
+                if len(raw) != length:
+                    raise LnkError(f'{field} runs past the end')
+                link[field] = raw.decode('utf-16-le' if unicode else ANSI, 'replace')
+                offset += 2 + length
+
+        # ExtraData blocks, up to the terminal block (size < 4)
+        while offset + 8 <= len(data):
+            size, signature = struct.unpack_from('<II', data, offset)
+            if size < 8:
+                break
+            if offset + size > len(data):
+                raise LnkError('ExtraData block runs past the end')
+            block = data[offset:offset + size]
+            if signature == ENVIRONMENT_BLOCK and size >= 0x314:
+                target = _c_string(block, 268, unicode=True) or _c_string(block, 8)
+                link['environment_target'] = target or None
+            elif signature == KNOWN_FOLDER_BLOCK and size >= 0x1C:
+                link['known_folder'] = str(uuid.UUID(bytes_le=bytes(block[8:24])))
+            elif signature == SPECIAL_FOLDER_BLOCK and size >= 0x10:
+                link['special_folder'] = struct.unpack_from('<I', block, 8)[0]
+            offset += size
+    except struct.error as e:
+        raise LnkError(f'truncated: {e}')
+    return link
+
+
+def resolve_target(link: Dict, lnk_path: Path) -> Optional[str]:
+    """Best target path for a parsed link: LinkInfo, then the environment block, then the relative path."""
+    if link['target']:
+        return link['target']
+    if link['environment_target']:
+        return ntpath.expandvars(link['environment_target'])
+    if link['relative_path']:
+        return str((Path(lnk_path).parent / link['relative_path'].replace('\\', '/')).resolve())
+    return None
+
+
+def read_lnk(path: Path) -> Dict:
+    """Parse a .lnk file through a read-only memory map.
+
+    Raises:
+        LnkError: for malformed files
+        OSError: if the file can't be read
+    """
+    with open(path, 'rb') as f:
+        try:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            raise LnkError('empty file')
+    error = None
+    try:
+        link = parse_lnk(mapping)
+    except LnkError as e:
+        error = str(e)  # Raised after closing: the traceback's frames still hold views of the map
+    mapping.close()
+    if error:
+        raise LnkError(error)
+    link['path'] = resolve_target(link, path)
+    return link
@@ -0,0 +1,198 @@
+"""Runs multi-step macro shortcuts on a timer queue."""
+import json
+import threading
+import time
+from typing import Dict, List, Optional
+import keyboard
+from hotkeys import keyboard_hotkey
+from metrics import Metrics
+from timer_queue import TimerQueue
+
+STEP_KINDS = ('keys', 'text', 'launch', 'wait_ms')
+
+
+def compile_steps(shortcut: Dict) -> List[tuple]:
+    """Turn a shortcut's 'steps' list into (kind, value) pairs ready to run.
+
+    Step forms:
+        {"keys": "ctrl+a, ctrl+c"}   key chords, comma-separated for a sequence
+        {"text": "Hello"}            typed text
+        {"launch": "code"}           a path, or {"path": ..., "args": [...], "cwd": ...}
+        {"wait_ms": 200}             pause before the next step
+    """
+    compiled = []
+    for index, step in enumerate(shortcut.get('steps') or []):
+        kinds = [kind for kind in STEP_KINDS if kind in step] if isinstance(step, dict) else []
+        if len(kinds) != 1:
+            raise ValueError(f"Step {index + 1} of {shortcut.get('name')} needs exactly one of {', '.join(STEP_KINDS)}")
+        kind = kinds[0]
+        value = step[kind]
+
+        if kind == 'keys':
+            # The keyboard library has its own names, e.g. "ctrl+shift+page up"
+            value = keyboard.parse_hotkey(keyboard_hotkey(value))
+        elif kind == 'text':
+            value = str(value)
+        elif kind == 'launch':
+            target = dict(value) if isinstance(value, dict) else {'path': value}
+            target['id'] = f"{shortcut.get('id')}#{index}"
+            target.setdefault('name', f"{shortcut.get('name')} (step {index + 1})")
+            value = target
+        else:
+            value = max(0.0, float(value)) / 1000.0
+        compiled.append((kind, value))
+    return compiled
+
+
+class MacroRun:
+    """One running macro: its position, deadline and per-step timings."""
+
+    def __init__(self, shortcut: Dict, steps: List[tuple]):
+        self.shortcut_id = shortcut.get('id')
+        self.name = shortcut.get('name')
+        self.steps = steps
+        self.index = 0
+        self.started = time.monotonic()
+        self.deadline = self.started  # When the current step was due
+        self.cancelled = False
+        self.timings = []  # [{'step', 'kind', 'lag_ms', 'ms'}]
+        self.finished = threading.Event()
+
+    def cancel(self):
+        """Stop before the next step (a step already running completes)."""
+        self.cancelled = True
+
+    def __repr__(self):
+        return f"MacroRun({self.name!r}, step {self.index + 1}/{len(self.steps)})"
+
+
+class MacroRunner:
+    """Runs 'steps' shortcuts from a single timer queue thread.
+
+    Consecutive key and text steps are injected back to back in one timer
+    callback, so long sequences run at full speed; only waits go back to
+    the queue. Wait deadlines are chained from the previous deadline rather
+    than from when the queue got around to the step, so lateness does not
+    accumulate over a long macro. Launch steps are handed to the
+    LaunchExecutor and never block the queue.
+
+    Per-step durations are recorded as 'macro_step_ms' (key: "<id>#<step>")
+    and whole runs as 'macro_ms'.
+    """
+
+    def __init__(self, launch_executor, metrics: Metrics = None, timers: TimerQueue = None):
+        """Initialize the runner.
+
+        Args:
+            launch_executor: LaunchExecutor used for launch steps
+            metrics: Metrics instance to record step timings into
+            timers: TimerQueue to schedule on (one is created if omitted)
+        """
+        self.executor = launch_executor
+        self.metrics = metrics if metrics is not None else Metrics()
+        self._owns_timers = timers is None
+        self.timers = timers if timers is not None else TimerQueue(name='macro-timers')
+        self._compiled = {}  # {shortcut id: (signature, steps)}
+        self._runs = []
+        self._lock = threading.Lock()
+
+    def prepare(self, shortcuts: List[Dict]):
+        """Compile the steps of macro shortcuts on the timer thread (call after loading config)."""
+        macros = [dict(s) for s in shortcuts if s.get('steps')]
+        if macros:
+            self.timers.call_soon(lambda: [self._steps_for(s, report=True) for s in macros])
+
+    def run(self, shortcut: Dict) -> Optional[MacroRun]:
+        """Start a macro shortcut and return its run (None if its steps are invalid)."""
+        steps = self._steps_for(shortcut, report=True)
+        if steps is None:
+            return None
+
+        run = MacroRun(shortcut, steps)
+        with self._lock:
+            self._runs.append(run)
+        print(f"Running macro {run.name} ({len(steps)} steps)")
+        self.timers.call_soon(lambda: self._advance(run))
+        return run
+
+    def running(self) -> List[MacroRun]:
+        """Get the macros still running."""
+        with self._lock:
+            return list(self._runs)
+
+    def cancel_all(self):
+        """Cancel every running macro."""
+        for run in self.running():
+            run.cancel()
+
+    def shutdown(self):
+        """Cancel running macros and stop the timer queue if this runner created it."""
+        self.cancel_all()
+        if self._owns_timers:
+            self.timers.shutdown()
+
+    def _steps_for(self, shortcut: Dict, report: bool = False) -> Optional[List[tuple]]:
+        """Get compiled steps for a shortcut, compiling when missing or changed."""
+        signature = json.dumps(shortcut.get('steps'), sort_keys=True)
+        cached = self._compiled.get(shortcut.get('id'))
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        try:
+            steps = compile_steps(shortcut)
+        except (ValueError, TypeError, AttributeError) as e:
+            if report:
+                print(f"Invalid steps for {shortcut.get('name')}: {e}")
+            return None
+        self._compiled[shortcut.get('id')] = (signature, steps)
+        return steps
+
+    def _advance(self, run: MacroRun):
+        """Wheel callback: run steps until a wait (rescheduled) or the end."""
+        lag_ms = (time.monotonic() - run.deadline) * 1000
+        while not run.cancelled and run.index < len(run.steps):
+            kind, value = run.steps[run.index]
+            started = time.monotonic()
+
+            if kind == 'wait_ms':
+                run.deadline = max(run.deadline, started) + value
+                self._record(run, kind, lag_ms, started)
+                run.index += 1
+                self.timers.call_at(run.deadline, lambda: self._advance(run))
+                return
+
+            try:
+                if kind == 'keys':
+                    keyboard.send(value)
+                elif kind == 'text':
+                    keyboard.write(value, delay=0)
+                else:
+                    self.executor.submit(value)
+            except Exception as e:
+                print(f"Macro {run.name} failed at step {run.index + 1}: {e}")
+                run.cancel()
+                break
+
+            self._record(run, kind, lag_ms, started)
+            lag_ms = 0.0
+            run.index += 1
+
+        self._finish(run)
+
+    def _record(self, run: MacroRun, kind: str, lag_ms: float, started: float):
+        """Store one step's timing on the run and in the metrics."""
+        ms = (time.monotonic() - started) * 1000
+        run.timings.append({'step': run.index, 'kind': kind, 'lag_ms': lag_ms, 'ms': ms})
+        self.metrics.record('macro_step_ms', f"{run.shortcut_id}#{run.index}", ms)
+
+    def _finish(self, run: MacroRun):
+        """Drop a run that completed or was cancelled."""
+        with self._lock:
+            if run in self._runs:
+                self._runs.remove(run)
+        total_ms = (time.monotonic() - run.started) * 1000
+        if run.cancelled:
+            print(f"Macro {run.name} cancelled after {run.index} of {len(run.steps)} steps")
+        else:
+            self.metrics.record('macro_ms', run.shortcut_id, total_ms)
+            print(f"Macro {run.name} finished in {total_ms:.0f}ms")
+        run.finished.set()
@@ -0,0 +1,62 @@
+"""Lightweight in-process timing metrics for Otterly Launcher."""
+import threading
+from collections import deque
+from typing import Dict, Any, Optional
+
+
+class Metrics:
+    """Thread-safe latency samples grouped by metric name and key.
+
+    Example:
+        metrics.record('spawn_ms', shortcut_id, 12.5)
+        metrics.summary('spawn_ms', shortcut_id)  # {'count': 1, 'mean': 12.5, ...}
+    """
+
+    RECENT_SAMPLES = 100
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._series = {}  # {(metric, key): {'count', 'total', 'min', 'max', 'last', 'recent'}}
+
+    def record(self, metric: str, key: str, value: float):
+        """Record one sample for (metric, key)."""
+        with self._lock:
+            series = self._series.get((metric, key))
+            if series is None:
+                series = {'count': 0, 'total': 0.0, 'min': value, 'max': value, 'last': value,
+                          'recent': deque(maxlen=self.RECENT_SAMPLES)}
+                self._series[(metric, key)] = series
+            series['count'] += 1
+            series['total'] += value
+            series['min'] = min(series['min'], value)
+            series['max'] = max(series['max'], value)
+            series['last'] = value
+            series['recent'].append(value)
+
+    def summary(self, metric: str, key: str) -> Optional[Dict[str, Any]]:
+        """Get count, mean, min, max, last and median (of recent samples) for (metric, key)."""
+        with self._lock:
+            series = self._series.get((metric, key))
+            if series is None:
+                return None
+            recent = sorted(series['recent'])
+            return {
+                'count': series['count'],
+                'mean': series['total'] / series['count'],
+                'min': series['min'],
+                'max': series['max'],
+                'last': series['last'],
+                'median': recent[len(recent) // 2],
+            }
+
+    def report(self, metric: str) -> Dict[str, Dict[str, Any]]:
+        """Get summaries for every key recorded under a metric."""
+        with self._lock:
+            keys = [key for (name, key) in self._series if name == metric]
+        return {key: self.summary(metric, key) for key in keys}
+
+    def print_report(self, metric: str):
+        """Print a metric's summaries to the console."""
+        for key, summary in sorted(self.report(metric).items()):
+            print(f"  {metric} [{key}]: n={summary['count']} mean={summary['mean']:.1f} "
+                  f"median={summary['median']:.1f} max={summary['max']:.1f}")
@@ -1,24 +1,60 @@
 """Popup launcher window for Otterly Launcher."""
+import time
 import tkinter as tk
-import subprocess
-import sys
-import keyboard
 from typing import List, Dict, Callable
+from hotkeys import hotkey_key
+from shortcut_list import VirtualShortcutList
+from search_index import SearchIndex
+from usage_store import UsageStore, rank_by_frecency
+from icon_cache import IconCache
+from launch_executor import LaunchExecutor
+from hotkey_replay import HotkeyReplayer
+from macro_runner import MacroRunner
+from workspace import resolve_members
+from result_providers import ProviderAggregator
+from single_instance import focus_process
 
 
 class PopupWindow:
     """Borderless popup window that shows app shortcuts."""
 
-    def __init__(self, config_manager, on_close_callback: Callable = None):
+    POLL_MS = 50
+
+    def __init__(self, config_manager, on_close_callback: Callable = None, search_index: SearchIndex = None,
+                 usage_store: UsageStore = None, icon_cache: IconCache = None,
+                 launch_executor: LaunchExecutor = None, hotkey_replayer: HotkeyReplayer = None,
+                 macro_runner: MacroRunner = None, providers: ProviderAggregator = None):
         """Initialize popup window.
 
         Args:
             config_manager: ConfigManager instance
             on_close_callback: Optional callback when window closes
+            search_index: Optional SearchIndex kept between shows (synced on show)
+            usage_store: Optional UsageStore for frecency ranking (opened from the config dir if omitted)
+            icon_cache: Optional IconCache; without one the list shows names only
+            launch_executor: Optional LaunchExecutor shared across shows (one is created if omitted)
+            hotkey_replayer: Optional HotkeyReplayer shared across shows (one is created if omitted)
+            macro_runner: Optional MacroRunner shared across shows (one is created if omitted)
+            providers: Optional ProviderAggregator adding results from other sources while typing
         """
         self.config = config_manager
         self.on_close = on_close_callback
+        self.search_index = search_index if search_index is not None else SearchIndex()
+        self._owns_usage = usage_store is None  # Closed with the window
+        self.usage = usage_store if usage_store is not None else UsageStore(
+            self.config.config_dir,
+            half_life_days=self.config.get('ranking', 'half_life_days')
+        )
+        self.icon_cache = icon_cache
+        self.executor = launch_executor if launch_executor is not None else LaunchExecutor()
+        self.replayer = hotkey_replayer if hotkey_replayer is not None else HotkeyReplayer()
+        self.macros = macro_runner if macro_runner is not None else MacroRunner(self.executor)
+        self.providers = providers
         self.root = None
+        self.shortcut_list = None
+        self.query_label = None
+        self.query = ''
+        self.primary_items = []  # Configured shortcuts matching the query; provider results follow them
         self.is_visible = False
 
     def show(self):
@@ -28,13 +64,22 @@ class PopupWindow:
 
         self.is_visible = True
         self.root = tk.Tk()
+        if self.icon_cache:
+            self.icon_cache.attach(self.root)
         self._setup_window()
         self._create_ui()
         self._position_at_cursor()
 
+        # Swap icons in as they finish decoding and merge provider results as they arrive
+        if (self.icon_cache or self.providers) and self.shortcut_list:
+            self.root.after(self.POLL_MS, self._poll)
+
         # Bind focus loss to close (double-tap Shift also closes via toggle)
         self.root.bind('<FocusOut>', lambda e: self.hide())
 
+        # Typing filters the list
+        self.root.bind('<Key>', self._on_key)
+
         # Force focus and grab keyboard
         self.root.focus_set()
         self.root.focus_force()
@@ -57,7 +102,7 @@ class PopupWindow:
 
     def _create_ui(self):
         """Create the UI elements."""
-        shortcuts = self.config.get_shortcuts()
+        shortcuts = self.config.get_popup_shortcuts()
 
         # Filter to only enabled shortcuts
         enabled_shortcuts = [s for s in shortcuts if s.get('enabled', True)]
@@ -77,46 +122,37 @@ class PopupWindow:
             label.pack()
             return
 
-        # Create a button for each enabled shortcut
-        for shortcut in enabled_shortcuts:
-            self._create_shortcut_button(shortcut)
+        # Only changed entries are re-indexed
+        self.search_index.sync(enabled_shortcuts)
 
-    def _create_shortcut_button(self, shortcut: Dict):
-        """Create a button for a single shortcut."""
-        button = tk.Button(
+        # Shows the current filter text; packed only while there is a query
+        self.query_label = tk.Label(
             self.root,
-            text=shortcut['name'],
-            command=lambda s=shortcut: self._launch_app(s),
-            bg=self.config.get('window', 'button_color', default='#E8E8D8'),
+            anchor='w',
+            bg=self.config.get('window', 'background_color', default='#F5F5F0'),
             fg=self.config.get('window', 'text_color', default='#2C2C2C'),
-            activebackground=self.config.get('window', 'button_hover_color', default='#D8D8C8'),
             font=(self.config.get('window', 'font_family', default='Segoe UI'),
-                  self.config.get('window', 'font_size', default=9)),
-            relief=tk.FLAT,
-            cursor='hand2',
-            anchor='w',
-            padx=5,
-            pady=2
+                  self.config.get('window', 'font_size', default=9), 'italic'),
+            padx=5
         )
-        button.pack(fill=tk.X, padx=2, pady=1)
 
-        # Hover effects
-        def on_enter(e):
-            button['background'] = self.config.get('window', 'button_hover_color', default='#D8D8C8')
-
-        def on_leave(e):
-            button['background'] = self.config.get('window', 'button_color', default='#E8E8D8')
+        # One canvas draws only the visible rows, however many shortcuts there are
+        self.shortcut_list = VirtualShortcutList(
+            self.root,
+            self.config,
+            on_click=self._launch_app,
+            on_right_click=self._show_edit_menu,
+            icon_cache=self.icon_cache
+        )
+        self.shortcut_list.pack(fill=tk.BOTH, expand=True, padx=2, pady=1)
 
-        button.bind('<Enter>', on_enter)
-        button.bind('<Leave>', on_leave)
-        
-        # Right-click to edit name
-        def on_right_click(e):
-            self._show_edit_menu(e, shortcut, button)
-        
-        button.bind('<Button-3>', on_right_click)
+        # Most-used shortcuts fill the first page; the rest stay in config order
+        self.primary_items = rank_by_frecency(enabled_shortcuts, self.usage, self.shortcut_list.max_rows)
+        self.shortcut_list.set_items(self.primary_items)
+        if self.providers:
+            self.providers.query('')  # Drop results still arriving for the previous show
 
-    def _show_edit_menu(self, event, shortcut: Dict, button):
+    def _show_edit_menu(self, event, shortcut: Dict):
         """Show context menu to edit the shortcut name."""
         import tkinter.simpledialog as simpledialog
         
@@ -128,64 +164,155 @@ class PopupWindow:
         )
         
         if new_name and new_name != shortcut['name']:
-            # Update the shortcut name
-            shortcut['name'] = new_name
-            button.config(text=new_name)
-            
-            # Save to config
-            shortcuts = self.config.get_shortcuts()
-            for s in shortcuts:
-                if s.get('hotkey') == shortcut.get('hotkey') or s.get('path') == shortcut.get('path'):
-                    s['name'] = new_name
-                    break
-            
-            self.config.config['shortcuts'] = shortcuts
-            self.config.save_config()
+            # Update the shortcut by its ID and save the file it lives in
+            self.config.update_shortcut(shortcut['id'], name=new_name)
+            self.search_index.update(shortcut)
+            self.shortcut_list.refresh()
             print(f"Shortcut renamed to: {new_name}")
 
+    def _poll(self):
+        """Merge provider results that arrived and redraw rows whose icons finished loading."""
+        if not self.root:
+            return
+        extra = self.providers.poll() if self.providers else None
+        icons_loaded = self.icon_cache.poll() if self.icon_cache else False
+        if extra is not None:
+            # Configured shortcuts stay first; providers only add what isn't already listed,
+            # by ID or by hotkey in any spelling
+            shown = {item.get('id') for item in self.primary_items}
+            hotkeys = {hotkey_key(item['hotkey']) for item in self.primary_items if item.get('hotkey')}
+            items = self.primary_items + [r for r in extra if r['id'] not in shown
+                                          and not (r.get('hotkey') and hotkey_key(r['hotkey']) in hotkeys)]
+            self.shortcut_list.set_items(items, keep_position=True)
+        elif icons_loaded:
+            self.shortcut_list.refresh()
+        self.root.after(self.POLL_MS, self._poll)
+
+    def _on_key(self, event):
+        """Handle typing in the popup: filter, edit the query, launch or dismiss."""
+        if self.shortcut_list is None:
+            if event.keysym == 'Escape':
+                self.hide()
+            return
+
+        if event.keysym == 'Escape':
+            if not self.query:
+                self.hide()
+                return
+            self.query = ''
+        elif event.keysym == 'BackSpace':
+            if not self.query:
+                return
+            self.query = self.query[:-1]
+        elif event.keysym in ('Return', 'KP_Enter'):
+            if self.shortcut_list.items:
+                self._launch_app(self.shortcut_list.items[0])
+            return
+        elif event.char and event.char.isprintable() and not (event.state & 0x4):  # No Ctrl combos
+            self.query += event.char
+        else:
+            return
+
+        self._apply_filter()
+
+    def _apply_filter(self):
+        """Show the shortcuts matching the current query."""
+        if self.query:
+            self.query_label.config(text=f"🔍 {self.query}")
+            if not self.query_label.winfo_ismapped():
+                self.query_label.pack(fill=tk.X, before=self.shortcut_list.frame)
+        else:
+            self.query_label.pack_forget()
+
+        results = self.search_index.search_with_tiers(self.query)
+        shortcuts = [shortcut for shortcut, _tier in results]
+        tiers = [tier for _shortcut, tier in results] if self.query else None
+        self.primary_items = rank_by_frecency(shortcuts, self.usage, self.shortcut_list.max_rows, tiers)
+        self.shortcut_list.set_items(self.primary_items)
+
+        # Other sources answer in the background; _poll merges them without blocking typing
+        if self.providers:
+            self.providers.query(self.query)
+
     def _launch_app(self, shortcut: Dict):
         """Launch the application or trigger hotkey specified in the shortcut."""
         try:
+            # Running processes (from the process provider) are focused, not launched
+            if shortcut.get('pid'):
+                if not focus_process(shortcut['pid']):
+                    print(f"No window to focus for {shortcut['name']}")
+                self.hide()
+                return
+
+            # The recent provider keeps launched provider results so they come back quickly
+            if shortcut.get('provider'):
+                self.providers.record_launch(shortcut)
+                shortcut = dict(shortcut)
+                shortcut.pop('provider')
+
+            # Scanned apps carry the hotkey that opens them; start them directly instead
+            if self._launches_by_path(shortcut):
+                self.executor.submit(shortcut)
+                self.usage.record_launch(shortcut['id'])
+                self.hide()
+                return
+
             # Check if this is a hotkey shortcut
             if 'hotkey' in shortcut and shortcut['hotkey']:
                 print(f"Triggering hotkey: {shortcut['hotkey']}")
-                # Convert hotkey to lowercase format that keyboard library expects
-                # e.g., "Ctrl+Shift+R" -> "ctrl+shift+r"
-                hotkey = shortcut['hotkey'].lower()
-                print(f"Converted to: {hotkey}")
+                self.usage.record_launch(shortcut['id'])
 
-                # Hide window first to restore focus
+                # Sent by the replayer once the window is destroyed and focus is back
+                self.replayer.schedule(shortcut, clicked_at=time.perf_counter())
                 self.hide()
+                return
 
-                # Wait briefly for focus to restore, then trigger hotkey
-                import threading
-                def trigger_delayed():
-                    import time
-                    time.sleep(0.15)  # 150ms delay
-                    keyboard.press_and_release(hotkey)
-                    print("Hotkey triggered after delay")
+            # Macros start once focus is back, like hotkeys, so their keystrokes reach the right window
+            if shortcut.get('steps'):
+                print(f"Starting macro: {shortcut['name']}")
+                self.usage.record_launch(shortcut['id'])
+                self.replayer.schedule(shortcut, clicked_at=time.perf_counter(),
+                                       action=lambda: self.macros.run(shortcut))
+                self.hide()
+                return
 
-                threading.Thread(target=trigger_delayed, daemon=True).start()
+            # Workspaces launch their members from the executor with bounded concurrency
+            if shortcut.get('workspace'):
+                members = resolve_members(shortcut, self.config.get_popup_shortcuts())
+                self.executor.submit_workspace(shortcut, members)
+                self.usage.record_launch(shortcut['id'])
+                self.hide()
                 return
 
             # Otherwise, launch as an application
             path = shortcut.get('path')
             if not path:
-                print(f"Error: No path or hotkey for {shortcut['name']}")
+                print(f"Error: No path, hotkey, steps or workspace for {shortcut['name']}")
                 return
 
-            # Check if it's a Python script
-            if path.endswith('.py'):
-                subprocess.Popen([sys.executable, path])
-            else:
-                # Try to launch as executable or command
-                subprocess.Popen(path, shell=True)
+            # Spawning happens on the executor's worker thread; failures are reported from there
+            self.executor.submit(shortcut)
 
+            self.usage.record_launch(shortcut['id'])
             self.hide()
         except Exception as e:
             print(f"Error launching {shortcut['name']}: {e}")
             # Don't hide on error so user can see something is wrong
 
+    @staticmethod
+    def _launches_by_path(shortcut: Dict) -> bool:
+        """Whether a scanned result starts its path rather than sending its hotkey.
+
+        .lnk and .desktop entries point at the app. Registry entries point at
+        their ShellExecute target if they have one, else at the registry key.
+        AutoHotkey, ShareX and built-in entries only do something through
+        their hotkey.
+        """
+        kind = shortcut.get('type')
+        if kind in ('shortcut', 'desktop_entry'):
+            return bool(shortcut.get('path'))
+        return kind == 'registry' and not (shortcut.get('path') or 'HKEY_').upper().startswith('HKEY_')
+
     def _position_at_cursor(self):
         """Position window at current cursor location."""
         self.root.update_idletasks()  # Update to get accurate size
@@ -221,12 +348,35 @@ class PopupWindow:
 
         self.root.geometry(f"+{x}+{y}")
 
+    def _window_handle(self):
+        """Get the popup's top-level Windows handle, or None off Windows."""
+        try:
+            import ctypes
+            return ctypes.windll.user32.GetParent(self.root.winfo_id())
+        except (ImportError, AttributeError, tk.TclError):
+            return None
+
+    @staticmethod
+    def _focus_check(popup_hwnd):
+        """Build a check for focus having left the destroyed popup (None if unavailable)."""
+        if not popup_hwnd:
+            return None
+        import ctypes
+        user32 = ctypes.windll.user32
+        return lambda: user32.GetForegroundWindow() not in (0, popup_hwnd)
+
+    def _close_usage(self):
+        """Close the UsageStore if this window opened its own."""
+        if self._owns_usage:
+            self.usage.close()
+
     def hide(self):
         """Hide and destroy the window (thread-safe)."""
         print(f"hide() called. root={self.root}, is_visible={self.is_visible}")
 
         if not self.root:
             self.is_visible = False
+            self._close_usage()
             if self.on_close:
                 self.on_close()
             return
@@ -235,10 +385,13 @@ class PopupWindow:
         def destroy_window():
             print("Destroying window in tkinter thread...")
             if self.root:
+                popup_hwnd = self._window_handle()
                 self.root.quit()
                 self.root.destroy()
                 self.root = None
+                self.replayer.window_gone(self._focus_check(popup_hwnd))
             self.is_visible = False
+            self._close_usage()
 
             print(f"About to call on_close callback: {self.on_close}")
             if self.on_close:
@@ -0,0 +1,223 @@
+"""Background page-cache prewarming for frequently launched targets."""
+import ctypes
+import mmap
+import os
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+from metrics import Metrics
+
+PAGE = mmap.PAGESIZE
+
+
+def _load_libc():
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        libc.mincore.argtypes = [ctypes.c_void_p, ctypes.c_size_t, ctypes.c_char_p]
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+_libc = _load_libc()
+
+
+def resident_pages(fd: int, size: int) -> Optional[bytearray]:
+    """Get one byte per page of a file, bit 0 set if the page is in the page cache.
+
+    Uses mincore() on a private mapping of the file; returns None where that
+    is unavailable (the file is then treated as not resident).
+    """
+    if _libc is None or size == 0:
+        return None
+    pages = (size + PAGE - 1) // PAGE
+    vec = ctypes.create_string_buffer(pages)
+    try:
+        mapping = mmap.mmap(fd, size, access=mmap.ACCESS_COPY)  # Writable view so ctypes can take its address
+    except (OSError, ValueError):
+        return None
+    try:
+        view = ctypes.c_char.from_buffer(mapping)
+        try:
+            if _libc.mincore(ctypes.addressof(view), size, vec) != 0:
+                return None
+        finally:
+            del view
+    finally:
+        mapping.close()
+    return bytearray(vec.raw)
+
+
+def cold_ranges(vec: Optional[bytearray], size: int) -> List[tuple]:
+    """Turn a residency vector into (offset, length) byte ranges that are not cached."""
+    if vec is None:
+        return [(0, size)] if size else []
+    ranges = []
+    start = None
+    for page, flags in enumerate(vec):
+        if not flags & 1:
+            if start is None:
+                start = page
+        elif start is not None:
+            ranges.append((start * PAGE, (page - start) * PAGE))
+            start = None
+    if start is not None:
+        ranges.append((start * PAGE, size - start * PAGE))
+    return ranges
+
+
+def system_is_idle(max_load: float) -> bool:
+    """Check CPU load (per core) and, on Linux, I/O pressure against a threshold."""
+    try:
+        load = os.getloadavg()[0] / (os.cpu_count() or 1)
+    except (AttributeError, OSError):
+        return True  # No load average (Windows): rely on the I/O budget alone
+    if load > max_load:
+        return False
+    try:
+        with open('/proc/pressure/io') as f:
+            some = f.readline().split()  # "some avg10=0.00 avg60=..."
+        return float(some[1].split('=')[1]) < max_load * 100
+    except (OSError, IndexError, ValueError):
+        return True
+
+
+class Prewarmer:
+    """Pulls the most-used shortcuts' files into the page cache while the system is idle.
+
+    Every interval it takes the top-N app shortcuts by frecency, resolves
+    their executables through the launch plan cache and adds their
+    'prewarm_files'. For each file, pages already cached are skipped (mincore
+    on Linux) and the rest are requested with posix_fadvise(WILLNEED), in
+    chunks paced to budget_bytes_per_s. Without fadvise (Windows) the cold
+    ranges are read instead. A pass stops early if the system stops being
+    idle.
+    """
+
+    CHUNK = 1024 * 1024
+    STARTUP_DELAY = 30.0  # Let login-time I/O settle first
+
+    def __init__(self, usage_store, plan_cache, metrics: Metrics = None, top_n: int = 10,
+                 budget_bytes_per_s: int = 32 * 1024 * 1024, interval_s: float = 600, max_load: float = 0.5):
+        """Initialize the prewarmer.
+
+        Args:
+            usage_store: UsageStore used to pick the top shortcuts
+            plan_cache: PlanCache resolving shortcuts to executables
+            metrics: Metrics instance to record pass results into
+            top_n: How many shortcuts to warm
+            budget_bytes_per_s: I/O budget for warming
+            interval_s: Seconds between passes
+            max_load: Per-core load (and I/O pressure fraction) above which the system is busy
+        """
+        self.usage = usage_store
+        self.plans = plan_cache
+        self.metrics = metrics if metrics is not None else Metrics()
+        self.top_n = top_n
+        self.budget = max(1, budget_bytes_per_s)
+        self.interval = interval_s
+        self.max_load = max_load
+
+        self.bytes_warmed = 0
+        self.last_pass = None  # {'files', 'bytes', 'resident', 'warmed', 'ms', 'complete'}
+        self._shortcuts = []
+        self._stopping = threading.Event()
+        self._thread = None
+
+    def set_shortcuts(self, shortcuts: List[Dict]):
+        """Replace the shortcuts to choose from (call after loading config)."""
+        self._shortcuts = [s for s in shortcuts if s.get('path')]
+
+    def start(self):
+        """Start the background thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='prewarm', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stopping.set()
+
+    def targets(self) -> List[str]:
+        """Files to warm for the current top shortcuts, most used first."""
+        paths = []
+        for shortcut in self.usage.top(self._shortcuts, self.top_n):
+            try:
+                plan = self.plans.get(shortcut)
+            except ValueError:
+                continue
+            for path in (plan.interpreter, plan.executable, plan.target):
+                if path and path not in paths:
+                    paths.append(path)
+            for path in shortcut.get('prewarm_files') or []:
+                path = os.path.expandvars(os.path.expanduser(path))
+                if path not in paths:
+                    paths.append(path)
+        return [path for path in paths if os.path.isfile(path)]
+
+    def warm_once(self) -> Dict:
+        """Run one pass over the current targets and return its statistics."""
+        started = time.perf_counter()
+        stats = {'files': 0, 'bytes': 0, 'resident': 0, 'warmed': 0, 'ms': 0.0, 'complete': True}
+        for path in self.targets():
+            if self._stopping.is_set() or not system_is_idle(self.max_load):
+                stats['complete'] = False
+                break
+            try:
+                size, warmed = self._warm_file(path)
+            except OSError as e:
+                print(f"Could not prewarm {path}: {e}")
+                continue
+            stats['files'] += 1
+            stats['bytes'] += size
+            stats['resident'] += size - warmed
+            stats['warmed'] += warmed
+
+        stats['ms'] = (time.perf_counter() - started) * 1000
+        self.bytes_warmed += stats['warmed']
+        self.last_pass = stats
+        self.metrics.record('prewarm_bytes', 'pass', stats['warmed'])
+        self.metrics.record('prewarm_ms', 'pass', stats['ms'])
+        print(f"Prewarm: {stats['files']} files, {stats['warmed'] / 1e6:.1f} MB warmed, "
+              f"{stats['resident'] / 1e6:.1f} MB already cached ({stats['ms']:.0f}ms)")
+        return stats
+
+    def _warm_file(self, path: str) -> tuple:
+        """Warm a file's uncached pages within the I/O budget. Returns (size, bytes warmed)."""
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            size = os.fstat(fd).st_size
+            warmed = 0
+            for offset, length in cold_ranges(resident_pages(fd, size), size):
+                end = offset + length
+                while offset < end:
+                    if self._stopping.is_set():
+                        return size, warmed
+                    chunk = min(self.CHUNK, end - offset)
+                    chunk_started = time.perf_counter()
+                    if hasattr(os, 'posix_fadvise'):
+                        os.posix_fadvise(fd, offset, chunk, os.POSIX_FADV_WILLNEED)
+                    else:
+                        os.lseek(fd, offset, os.SEEK_SET)
+                        os.read(fd, chunk)
+                    warmed += chunk
+                    offset += chunk
+                    # Pace to the budget: each chunk "costs" chunk / budget seconds
+                    self._stopping.wait(max(0.0, chunk / self.budget - (time.perf_counter() - chunk_started)))
+            return size, warmed
+        finally:
+            os.close(fd)
+
+    def _run(self):
+        """Prewarm thread: a pass every interval, skipped while the system is busy."""
+        if self._stopping.wait(self.STARTUP_DELAY):
+            return
+        while not self._stopping.is_set():
+            if system_is_idle(self.max_load):
+                try:
+                    self.warm_once()
+                except Exception as e:
+                    print(f"Prewarm pass failed: {e}")
+            self._stopping.wait(self.interval)
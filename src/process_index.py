@@ -0,0 +1,207 @@
+"""Incrementally maintained index of running processes by executable."""
+import os
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+PROC = '/proc'
+
+
+def _proc_pids() -> set:
+    """PIDs from /proc (one directory listing)."""
+    return {int(name) for name in os.listdir(PROC) if name.isdigit()}
+
+
+def _proc_read(pid: int) -> Optional[Tuple[str, tuple, str]]:
+    """Read (resolved exe, argv, start time) for a PID from /proc, or None if unreadable."""
+    base = f'{PROC}/{pid}'
+    try:
+        exe = os.readlink(f'{base}/exe')
+        with open(f'{base}/cmdline', 'rb') as f:
+            argv = tuple(arg.decode('utf-8', 'replace') for arg in f.read().split(b'\0')[:-1])
+        start = _proc_start_time(pid)
+    except OSError:
+        return None  # Exited, a kernel thread, or another user's process
+    if exe.endswith(' (deleted)'):
+        exe = exe[:-len(' (deleted)')]
+    return exe, argv, start
+
+
+def _proc_start_time(pid: int) -> Optional[str]:
+    """Start time field of /proc/<pid>/stat, which tells a reused PID apart."""
+    try:
+        with open(f'{PROC}/{pid}/stat', 'rb') as f:
+            stat = f.read()
+    except OSError:
+        return None
+    # comm (field 2) may contain spaces and parentheses; fields after it are plain
+    return stat[stat.rfind(b')') + 2:].split()[19].decode()
+
+
+def _psutil_pids() -> set:
+    import psutil
+    return set(psutil.pids())
+
+
+def _psutil_read(pid: int) -> Optional[Tuple[str, tuple, str]]:
+    import psutil
+    try:
+        process = psutil.Process(pid)
+        return os.path.realpath(process.exe()), tuple(process.cmdline()), str(process.create_time())
+    except (psutil.Error, OSError):
+        return None
+
+
+def _psutil_start_time(pid: int) -> Optional[str]:
+    import psutil
+    try:
+        return str(psutil.Process(pid).create_time())
+    except psutil.Error:
+        return None
+
+
+class ProcessIndex:
+    """Running processes indexed by resolved executable path.
+
+    Each refresh lists the current PIDs and only reads /proc entries for PIDs
+    that appeared since the last one; PIDs that disappeared are dropped. A
+    background thread builds the index once (find() waits for that instead
+    of walking all processes itself) and then refreshes every
+    REFRESH_SECONDS, so find() is a
+    dictionary lookup plus a start-time check on the few candidates (which
+    also catches a PID reused between refreshes).
+
+    Linux reads /proc directly; elsewhere psutil is used if installed. Without
+    either, the index stays empty (available is False).
+    """
+
+    REFRESH_SECONDS = 1.0
+
+    def __init__(self):
+        if sys.platform.startswith('linux') and os.path.isdir(PROC):
+            self._list_pids, self._read, self._start_time = _proc_pids, _proc_read, _proc_start_time
+        else:
+            try:
+                import psutil  # noqa: F401
+                self._list_pids, self._read, self._start_time = _psutil_pids, _psutil_read, _psutil_start_time
+            except ImportError:
+                self._list_pids = None
+
+        self._pids = set()  # Every PID seen, including unreadable ones (so they are not retried)
+        self._processes = {}  # {pid: (exe, argv, start time)}
+        self._by_exe = {}  # {exe: set of pids}
+        self._lock = threading.Lock()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._ready = threading.Event()  # Set once the first refresh is done
+        self._stopping = threading.Event()
+        self.last_refresh_ms = 0.0
+
+    @property
+    def available(self) -> bool:
+        return self._list_pids is not None
+
+    def start(self):
+        """Build the index and keep it fresh from a background thread (idempotent)."""
+        with self._start_lock:
+            if self._thread is not None or not self.available:
+                return
+            self._thread = threading.Thread(target=self._run, name='process-index', daemon=True)
+            self._thread.start()
+
+    def wait_ready(self):
+        """Start the index if needed and wait until it has been built once."""
+        if self.available:
+            self.start()
+            self._ready.wait()
+
+    def stop(self):
+        self._stopping.set()
+
+    def refresh(self):
+        """Apply the PID-set delta since the last refresh."""
+        if not self.available:
+            return
+        started = time.perf_counter()
+        current = self._list_pids()
+        with self._lock:
+            gone = self._pids - current
+            new = current - self._pids
+
+        added = {}
+        for pid in new:
+            info = self._read(pid)
+            if info is not None:
+                added[pid] = info
+
+        with self._lock:
+            for pid in gone:
+                self._drop(pid)
+            self._pids = current
+            for pid, info in added.items():
+                self._processes[pid] = info
+                self._by_exe.setdefault(info[0], set()).add(pid)
+        self.last_refresh_ms = (time.perf_counter() - started) * 1000
+
+    def add(self, pid: int):
+        """Index a process right away (e.g. one the launcher just spawned)."""
+        info = self._read(pid) if self.available else None
+        if info is not None:
+            with self._lock:
+                self._drop(pid)
+                self._pids.add(pid)
+                self._processes[pid] = info
+                self._by_exe.setdefault(info[0], set()).add(pid)
+
+    def find(self, executable: str, args: List[str] = None) -> List[int]:
+        """Get live PIDs running an executable, optionally with exactly these arguments.
+
+        Args:
+            executable: Path to the executable (symlinks are resolved)
+            args: Arguments after argv[0] that must match, or None to match any
+        """
+        self.wait_ready()
+
+        exe = os.path.realpath(executable)
+        with self._lock:
+            candidates = [(pid, self._processes[pid]) for pid in self._by_exe.get(exe, ())]
+
+        found = []
+        for pid, (_exe, argv, start) in candidates:
+            if args is not None and list(argv[1:]) != list(args):
+                continue
+            if self._start_time(pid) != start:
+                continue  # Exited (or PID reused) since the last refresh
+            found.append(pid)
+        return sorted(found)
+
+    def snapshot(self) -> List[Tuple[int, str, tuple]]:
+        """Get (pid, exe, argv) for every indexed process, as of the last refresh."""
+        self.wait_ready()
+        with self._lock:
+            return [(pid, exe, argv) for pid, (exe, argv, _start) in self._processes.items()]
+
+    def __len__(self):
+        return len(self._processes)
+
+    def _drop(self, pid: int):
+        """Remove a PID from the index (lock held)."""
+        self._pids.discard(pid)
+        info = self._processes.pop(pid, None)
+        if info is not None:
+            pids = self._by_exe.get(info[0])
+            if pids is not None:
+                pids.discard(pid)
+                if not pids:
+                    del self._by_exe[info[0]]
+
+    def _run(self):
+        """Refresh thread."""
+        while not self._stopping.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"Process index refresh failed: {e}")
+            self._ready.set()  # Even after a failure, so find() never hangs
+            self._stopping.wait(self.REFRESH_SECONDS)
@@ -0,0 +1,234 @@
+"""Registry trees for the shortcut scanner: the live registry, or exported .reg files."""
+import codecs
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+HIVES = {
+    'HKCU': 'HKEY_CURRENT_USER', 'HKLM': 'HKEY_LOCAL_MACHINE', 'HKCR': 'HKEY_CLASSES_ROOT',
+    'HKU': 'HKEY_USERS', 'HKCC': 'HKEY_CURRENT_CONFIG',
+}
+
+# Value types, as in winreg
+REG_NONE, REG_SZ, REG_EXPAND_SZ, REG_BINARY, REG_DWORD, REG_MULTI_SZ, REG_QWORD = 0, 1, 2, 3, 4, 7, 11
+
+# REGEDIT4 exports are ANSI, strings in their hex() data too (version 5 uses UTF-16)
+ANSI = 'mbcs' if hasattr(codecs, 'mbcs_encode') else 'cp1252'
+
+
+def full_path(path: str) -> str:
+    """Spell out an abbreviated hive: 'HKCU\\Software' -> 'HKEY_CURRENT_USER\\Software'."""
+    hive, _, rest = path.partition('\\')
+    hive = HIVES.get(hive.upper(), hive.upper())
+    return f'{hive}\\{rest}' if rest else hive
+
+
+def _decode_value(kind: int, data: bytes, encoding: str = 'utf-16-le'):
+    """Turn raw value bytes into what winreg would return for the type (strings in encoding)."""
+    if kind in (REG_SZ, REG_EXPAND_SZ):
+        return data.decode(encoding, 'replace').split('\0', 1)[0]
+    if kind == REG_MULTI_SZ:
+        return [item for item in data.decode(encoding, 'replace').split('\0') if item]
+    if kind == REG_DWORD and len(data) >= 4:
+        return int.from_bytes(data[:4], 'little')
+    if kind == REG_QWORD and len(data) >= 8:
+        return int.from_bytes(data[:8], 'little')
+    return data
+
+
+class RegistrySource(ABC):
+    """A registry tree that can be walked one key at a time.
+
+    walk() yields (key path, {value name: value}) depth first, starting at
+    root, so a caller can stop (or check its budget) between keys. Paths use
+    full hive names ('HKEY_CURRENT_USER\\...'); the default value is named
+    ''. descend(path, depth) is asked before entering each subkey (depth 1
+    for root's children); returning False skips the whole subtree.
+    """
+
+    name = 'registry'
+
+    @abstractmethod
+    def walk(self, root: str, descend: Callable[[str, int], bool] = None) -> Iterator[Tuple[str, Dict]]:
+        """Yield (key path, values) for root and the subkeys descend() lets through."""
+
+
+class NativeRegistry(RegistrySource):
+    """The live registry, read in-process through winreg (Windows only).
+
+    Raises:
+        ImportError: from the constructor, where winreg doesn't exist
+    """
+
+    name = 'native'
+
+    def __init__(self):
+        import winreg
+        self._winreg = winreg
+
+    def walk(self, root: str, descend: Callable[[str, int], bool] = None) -> Iterator[Tuple[str, Dict]]:
+        winreg = self._winreg
+        root = full_path(root)
+        hive_name, _, subkey = root.partition('\\')
+        hive = getattr(winreg, hive_name, None)
+        if hive is None:
+            return
+        pending = [(subkey, root, 0)]
+        while pending:
+            subkey, path, depth = pending.pop()
+            try:
+                key = winreg.OpenKey(hive, subkey)
+            except OSError:
+                continue
+            values = {}
+            children = []
+            with key:
+                index = 0
+                while True:
+                    try:
+                        name, data, _kind = winreg.EnumValue(key, index)
+                    except OSError:
+                        break
+                    values[name] = data
+                    index += 1
+                index = 0
+                while True:
+                    try:
+                        children.append(winreg.EnumKey(key, index))
+                    except OSError:
+                        break
+                    index += 1
+            yield path, values
+            # Reversed onto the stack, so children are visited in order
+            for child in reversed(children):
+                child_path = f'{path}\\{child}'
+                if descend is None or descend(child_path, depth + 1):
+                    pending.append((f'{subkey}\\{child}' if subkey else child, child_path, depth + 1))
+
+
+class RegFileRegistry(RegistrySource):
+    """Registry keys from exported .reg files (regedit's REGEDIT4 and version 5 formats).
+
+    Files are read line by line, so a large export costs memory for one key
+    at a time. Keys are yielded in file order, which for regedit exports is
+    depth first. This works anywhere, so the registry source can be tried
+    and measured on exports from another machine.
+    """
+
+    name = 'reg-file'
+
+    def __init__(self, paths: List[Path]):
+        self.paths = [Path(p) for p in paths]
+
+    def walk(self, root: str, descend: Callable[[str, int], bool] = None) -> Iterator[Tuple[str, Dict]]:
+        root = full_path(root)
+        for path in self.paths:
+            yield from self._walk_file(path, root, descend)
+
+    def _walk_file(self, path: Path, root: str, descend: Optional[Callable[[str, int], bool]]):
+        folded_root = root.lower()
+        root_depth = root.count('\\')
+        pruned = None  # Folded path of the subtree being skipped (exports list subtrees contiguously)
+        current = None  # Path of the key being read, None while skipping
+        values = {}
+        pending_line = ''
+        encoding = 'utf-16-le'  # Of strings in hex() data: ANSI once the header says REGEDIT4
+
+        with open(path, 'r', encoding=self._encoding(path), errors='replace') as f:
+            for line in f:
+                line = line.rstrip('\r\n')
+                if line.strip() == 'REGEDIT4':
+                    encoding = ANSI
+                if pending_line:
+                    line = pending_line + line.lstrip()
+                    pending_line = ''
+                if line.endswith('\\') and current is not None and not line.startswith('['):
+                    pending_line = line[:-1]  # Hex data continues on the next line
+                    continue
+
+                if line.startswith('['):
+                    if current is not None:
+                        yield current, values
+                    current, values = None, {}
+                    if line.startswith('[-'):
+                        continue  # A deletion
+                    key_path = full_path(line[1:line.rfind(']')])
+                    folded = key_path.lower()
+                    if folded != folded_root and not folded.startswith(folded_root + '\\'):
+                        continue
+                    if pruned is not None and folded.startswith(pruned):
+                        continue
+                    depth = key_path.count('\\') - root_depth
+                    if depth and descend is not None and not descend(key_path, depth):
+                        pruned = folded + '\\'
+                        continue
+                    current = key_path
+                elif current is not None and line[:1] in ('"', '@'):
+                    parsed = self._parse_value(line, encoding)
+                    if parsed is not None:
+                        values[parsed[0]] = parsed[1]
+            if current is not None:
+                yield current, values
+
+    @staticmethod
+    def _encoding(path: Path) -> str:
+        with open(path, 'rb') as f:
+            start = f.read(4)
+        if start.startswith(codecs.BOM_UTF16_LE):
+            return 'utf-16'
+        if start.startswith(codecs.BOM_UTF8):
+            return 'utf-8-sig'
+        return ANSI
+
+    @staticmethod
+    def _parse_value(line: str, encoding: str = 'utf-16-le') -> Optional[Tuple[str, object]]:
+        """Parse '"Name"=data' or '@=data'. Returns (name, value), or None for deletions and junk.
+
+        Args:
+            line: The value line, continuations joined
+            encoding: Of strings in hex(2) and hex(7) data (ANSI in REGEDIT4 files)
+        """
+        if line.startswith('@='):
+            name, data = '', line[2:]
+        else:
+            end = 1
+            while end < len(line) and line[end] != '"':
+                end += 2 if line[end] == '\\' else 1
+            if line[end + 1:end + 2] != '=':
+                return None
+            name, data = _unescape(line[1:end]), line[end + 2:]
+
+        if data.startswith('"'):
+            return name, _unescape(data[1:data.rfind('"')])
+        if data.startswith('dword:'):
+            try:
+                return name, int(data[6:], 16)
+            except ValueError:
+                return None
+        if data.startswith('hex'):
+            kind = REG_BINARY
+            if data.startswith('hex('):
+                try:
+                    kind = int(data[4:data.index(')')], 16)
+                except ValueError:
+                    return None
+            try:
+                raw = bytes.fromhex(data[data.index(':') + 1:].replace(',', ' '))
+            except ValueError:
+                return None
+            return name, _decode_value(kind, raw, encoding)
+        return None
+
+
+def _unescape(text: str) -> str:
+    """Undo .reg string escaping (backslash-escaped backslashes and quotes)."""
+    if '\\' not in text:
+        return text
+    out = []
+    i = 0
+    while i < len(text):
+        if text[i] == '\\' and i + 1 < len(text):
+            i += 1
+        out.append(text[i])
+        i += 1
+    return ''.join(out)
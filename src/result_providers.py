@@ -0,0 +1,405 @@
+"""Pluggable result providers for the popup search, aggregated under a deadline."""
+import hashlib
+import json
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from hotkeys import dedupe_key
+from metrics import Metrics
+from search_index import SearchIndex, normalize
+from shortcut_collections import CollectionManager
+
+
+class ResultProvider:
+    """A source of extra popup entries for a query.
+
+    search() runs on a worker thread and returns shortcut-like dicts (at
+    least 'id' and 'name', plus 'path', 'hotkey' or 'pid' to act on). It may
+    be slow; the aggregator never waits for it. Background work (scanning,
+    indexing) starts in start(), when the launcher starts, not in a search.
+    """
+
+    name = 'provider'
+
+    def start(self):
+        """Begin background work (called once, when the launcher starts)."""
+
+    def search(self, query: str, limit: int) -> List[Dict]:
+        raise NotImplementedError
+
+    def close(self):
+        """Release resources when the launcher quits."""
+
+
+def _scan_id(item: Dict) -> str:
+    key = '|'.join(str(item.get(field)) for field in ('source', 'name', 'path', 'hotkey', 'context', 'release'))
+    return 'scan:' + hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+
+
+class ScannedShortcutProvider(ResultProvider):
+    """Shortcuts found by ShortcutScanner (Start Menu, desktop, AHK, ShareX, ...).
+
+    The scan runs once, in the background, from start(); each source's
+    shortcuts become searchable as soon as that source finishes. With
+    index_path, the scanner keeps its scan index there, so later launches
+    only re-parse changed files. With watch, a ScanWatcher then follows the
+    source folders and adds, updates and removes shortcuts as files change.
+    """
+
+    name = 'scanned'
+
+    def __init__(self, index_path: Optional[Path] = None, watch: bool = True):
+        self.index_path = index_path
+        self.watch = watch
+        self._index = None
+        self._watcher = None
+        self._closed = False
+        self._owners = {}  # {dedupe_key: scan ID of the one record listed for that hotkey and target}
+        self._lock = threading.Lock()
+
+    def start(self):
+        threading.Thread(target=self._scan, name='scan-provider', daemon=True).start()
+
+    def search(self, query: str, limit: int) -> List[Dict]:
+        with self._lock:
+            if self._index is None:
+                return []
+            return self._index.search(query, limit)
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            watcher = self._watcher
+        if watcher is not None:
+            watcher.stop()
+
+    def _scan(self):
+        try:
+            from shortcut_scanner import ShortcutScanner
+            from scan_watcher import ScanWatcher
+        except ImportError as e:
+            print(f"Scanned shortcuts unavailable: {e}")
+            return
+
+        # Searchable as each source finishes, rather than after the slowest one
+        scanner = ShortcutScanner(index_path=self.index_path)
+        results = []
+        pending = {}  # {source: records streamed so far}
+        for event in scanner.iter_scan():
+            if event['event'] == 'records':
+                pending.setdefault(event['source'], []).extend(event['records'])
+            elif event['event'] == 'done':
+                items = pending.pop(event['source'], [])
+                if event['report']['status'] != 'ok':
+                    continue
+                items = self._dedupe(items)
+                if not items:
+                    continue
+                results.extend(items)
+                index = SearchIndex(results)
+                with self._lock:
+                    self._index = index
+        print(f"Scanned {len(results)} shortcuts for search")
+
+        if self.watch:
+            watcher = ScanWatcher(scanner)
+            watcher.subscribe(self._on_changes)
+            with self._lock:
+                if self._closed:
+                    return
+                self._watcher = watcher
+            watcher.start()
+
+    def _on_changes(self, events: List[Dict]):
+        """Apply a ScanWatcher batch to the search index."""
+        with self._lock:
+            if self._index is None:
+                self._index = SearchIndex()
+            for event in events:
+                for item in event['previous']:
+                    scan_id = _scan_id(item)
+                    self._index.remove(scan_id)
+                    key = dedupe_key(item)
+                    if key is not None and self._owners.get(key) == scan_id:
+                        del self._owners[key]  # Only the listed record frees its key, not a dropped duplicate
+                for item in self._dedupe(event['records']):
+                    self._index.add(item)
+
+    def _dedupe(self, records: List[Dict]) -> List[Dict]:
+        """Records (with their scan IDs) whose hotkey and target no other listed record holds."""
+        unique = []
+        for record in records:
+            scan_id = _scan_id(record)
+            key = dedupe_key(record)
+            if key is not None:
+                if self._owners.setdefault(key, scan_id) != scan_id:
+                    continue
+            unique.append(dict(record, id=scan_id))
+        return unique
+
+
+class ProcessProvider(ResultProvider):
+    """Running processes by executable name; choosing one focuses its window."""
+
+    name = 'processes'
+
+    def __init__(self, process_index):
+        self.processes = process_index
+
+    def search(self, query: str, limit: int) -> List[Dict]:
+        query = normalize(query)
+        results = []
+        for pid, exe, _argv in sorted(self.processes.snapshot()):
+            name = os.path.basename(exe)
+            if query in normalize(name):
+                results.append({'id': f'proc:{pid}', 'name': f"{name} (running, pid {pid})", 'pid': pid,
+                                'source': 'Running'})
+                if len(results) >= limit:
+                    break
+        return results
+
+
+class FileProvider(ResultProvider):
+    """Files from a FileIndex, matched by name."""
+
+    name = 'files'
+
+    def __init__(self, file_index):
+        self.index = file_index
+
+    def search(self, query: str, limit: int) -> List[Dict]:
+        home = os.path.expanduser('~')
+        results = []
+        for path in self.index.search(query, limit):
+            folder = os.path.dirname(path)
+            if folder.startswith(home):
+                folder = '~' + folder[len(home):]
+            # 'open': handed to the default application, so the name never reaches a shell
+            results.append({'id': 'file:' + path, 'name': f"{os.path.basename(path)} ({folder})", 'path': path,
+                            'open': True, 'source': 'Files'})
+        return results
+
+    def close(self):
+        self.index.close()
+
+
+class CollectionProvider(ResultProvider):
+    """Shortcuts in collections that aren't pinned to the popup, matched by name.
+
+    A collection is loaded the first time a search needs it. Every
+    EVICT_INTERVAL_S a background thread drops collections idle for longer
+    than CollectionManager.IDLE_EVICT_SECONDS.
+    """
+
+    name = 'collections'
+    EVICT_INTERVAL_S = 60
+
+    def __init__(self, collections: Callable[[], CollectionManager]):
+        """Args:
+            collections: Returns the current CollectionManager (the launcher builds a new
+                ConfigManager, and with it a new manager, every time the popup opens)
+        """
+        self.collections = collections
+        self._stopping = threading.Event()
+
+    def start(self):
+        threading.Thread(target=self._evict_loop, name='collection-evictor', daemon=True).start()
+
+    def search(self, query: str, limit: int) -> List[Dict]:
+        query = normalize(query)
+        if not query:
+            return []
+        collections = self.collections()
+        results = []
+        for name in collections.unpinned_names():
+            store = collections.get(name)
+            for shortcut in store or []:
+                if query in normalize(shortcut.get('name', '')):
+                    results.append(dict(shortcut, source=name))
+                    if len(results) >= limit:
+                        return results
+        return results
+
+    def close(self):
+        self._stopping.set()
+
+    def _evict_loop(self):
+        while not self._stopping.wait(self.EVICT_INTERVAL_S):
+            evicted = self.collections().evict_idle()
+            if evicted:
+                print(f"Unloaded idle collections: {', '.join(evicted)}")
+
+
+class RecentProvider(ResultProvider):
+    """Entries from other providers that were launched recently (kept in recent.json)."""
+
+    name = 'recent'
+    FILENAME = 'recent.json'
+    MAX_ENTRIES = 50
+
+    def __init__(self, config_dir: Path):
+        self.path = Path(config_dir) / self.FILENAME
+        self._lock = threading.Lock()
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self._entries = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self._entries = []
+
+    def record(self, result: Dict):
+        """Remember a launched result (most recent first) and save."""
+        entry = {key: value for key, value in result.items() if key not in ('provider', 'pid')}
+        with self._lock:
+            self._entries = [e for e in self._entries if e.get('id') != entry.get('id')]
+            self._entries.insert(0, entry)
+            del self._entries[self.MAX_ENTRIES:]
+            tmp_path = self.path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f, indent=2)
+            tmp_path.replace(self.path)
+
+    def search(self, query: str, limit: int) -> List[Dict]:
+        query = normalize(query)
+        with self._lock:
+            entries = list(self._entries)
+        return [e for e in entries if query in normalize(e.get('name', ''))][:limit]
+
+
+class ProviderAggregator:
+    """Runs providers concurrently for each keystroke and merges what comes back.
+
+    query() hands the text to every provider on a thread pool and returns at
+    once. Each provider has at most one search in flight: if it is still busy
+    when the next keystroke arrives, only the newest query is queued for it,
+    so a slow provider costs one thread, not one per keystroke.
+
+    poll() (from the UI thread) collects finished searches. Results that
+    arrive within deadline_ms of the keystroke are merged in provider order;
+    later ones are appended at the end so rows don't move under the cursor.
+    Results for an older query are dropped. Per-provider latency is recorded
+    as 'provider_ms', late arrivals as 'provider_late_ms'.
+    """
+
+    def __init__(self, providers: List[ResultProvider], metrics: Metrics = None, deadline_ms: float = 50,
+                 limit: int = 50):
+        """Initialize the aggregator.
+
+        Args:
+            providers: Providers in merge order
+            metrics: Metrics instance to record latencies into
+            deadline_ms: How long after a keystroke results are still merged in order
+            limit: Most results asked from each provider
+        """
+        self.providers = providers
+        self.metrics = metrics if metrics is not None else Metrics()
+        self.deadline = deadline_ms / 1000.0
+        self.limit = limit
+
+        self._pool = ThreadPoolExecutor(max_workers=max(1, len(providers)), thread_name_prefix='provider')
+        self._done = queue.Queue()  # (generation, provider name, results, finished at)
+        self._lock = threading.Lock()
+        self._busy = {}  # {provider name: True while a search runs}
+        self._next = {}  # {provider name: (generation, query) waiting for the busy search}
+        self._generation = 0
+        self._started = 0.0
+        self._on_time = {}  # {provider name: results}
+        self._late = []
+        self._futures = set()  # Queued and running searches, cancelled on shutdown
+
+    def start(self):
+        """Start the providers' background work."""
+        for provider in self.providers:
+            provider.start()
+
+    def query(self, text: str):
+        """Start searching all providers for text (results come from poll())."""
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+        self._started = time.perf_counter()
+        self._on_time = {}
+        self._late = []
+        if not text:
+            return
+        for provider in self.providers:
+            self._dispatch(provider, generation, text)
+
+    def poll(self) -> Optional[List[Dict]]:
+        """Collect finished searches. Returns the merged results if they changed, else None."""
+        changed = False
+        while True:
+            try:
+                generation, name, results, finished = self._done.get_nowait()
+            except queue.Empty:
+                break
+            if generation != self._generation or not results:
+                continue
+            for result in results:
+                result['provider'] = name
+            if finished - self._started <= self.deadline:
+                self._on_time[name] = results
+            else:
+                self.metrics.record('provider_late_ms', name, (finished - self._started) * 1000)
+                self._late.extend(results)
+            changed = True
+        return self.results() if changed else None
+
+    def results(self) -> List[Dict]:
+        """Current merged results: on-time ones in provider order, then late ones."""
+        merged = []
+        seen = set()
+        on_time = [self._on_time.get(p.name, []) for p in self.providers]
+        for result in [r for results in on_time for r in results] + self._late:
+            if result['id'] not in seen:
+                seen.add(result['id'])
+                merged.append(result)
+        return merged
+
+    def record_launch(self, result: Dict):
+        """Tell the recent-launches provider (if any) that a provider result was launched."""
+        for provider in self.providers:
+            if isinstance(provider, RecentProvider) and result.get('provider') != 'processes':
+                provider.record(result)
+
+    def shutdown(self):
+        """Stop the worker pool and close the providers."""
+        for future in list(self._futures):
+            future.cancel()  # shutdown(cancel_futures=True) needs Python 3.9
+        self._pool.shutdown(wait=False)
+        for provider in self.providers:
+            provider.close()
+
+    def _dispatch(self, provider: ResultProvider, generation: int, text: str):
+        """Start a search, or queue it behind the provider's running one."""
+        with self._lock:
+            if self._busy.get(provider.name):
+                self._next[provider.name] = (generation, text)
+                return
+            self._busy[provider.name] = True
+        future = self._pool.submit(self._run, provider, generation, text)
+        self._futures.add(future)
+        future.add_done_callback(self._futures.discard)
+
+    def _run(self, provider: ResultProvider, generation: int, text: str):
+        """Worker: run searches for a provider until no newer query is waiting."""
+        while True:
+            started = time.perf_counter()
+            try:
+                results = provider.search(text, self.limit)
+            except Exception as e:
+                print(f"Provider {provider.name} failed: {e}")
+                results = []
+            finished = time.perf_counter()
+            self.metrics.record('provider_ms', provider.name, (finished - started) * 1000)
+            self._done.put((generation, provider.name, [dict(r) for r in results], finished))
+
+            with self._lock:
+                waiting = self._next.pop(provider.name, None)
+                if waiting is None:
+                    self._busy[provider.name] = False
+                    return
+            generation, text = waiting
@@ -0,0 +1,140 @@
+"""Persistent cache of scanner directory listings and parsed files."""
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+VERSION = 4  # Bump when parsers change what they return, so cached records are re-parsed
+
+
+class ScanIndex:
+    """Remembers what the shortcut scanner saw, so a rescan only parses what changed.
+
+    For each directory it keeps the mtime and listing: while the mtime is
+    unchanged, the listing is reused without reading the directory. For each
+    parsed file it keeps size, mtime and inode with the parsed records: while
+    those match a fresh stat, the records are reused without opening the
+    file (this also catches files edited in place, which leave their
+    directory's mtime alone). Files and directories not seen by a complete
+    scan are dropped.
+
+    With path None the index lives only as long as the scanner.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else None
+        self._lock = threading.Lock()
+        self._dirs = {}  # {directory: {'mtime_ns', 'files', 'subdirs'}}
+        self._files = {}  # {path: {'size', 'mtime_ns', 'inode', 'records'}}
+        self._seen_dirs = set()
+        self._seen_files = set()
+        self._changed = False
+        if self.path:
+            self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Ignoring scan index {self.path}: {e}")
+            return
+        if data.get('version') == VERSION:
+            self._dirs = data.get('dirs', {})
+            self._files = data.get('files', {})
+
+    def begin(self):
+        """Start a scan: forget which entries were seen by the previous one."""
+        with self._lock:
+            self._seen_dirs = set()
+            self._seen_files = set()
+
+    def list_dir(self, directory: str) -> Optional[Tuple[List[str], List[str]]]:
+        """Get (file names, subdirectory paths) of a directory, or None if it is gone.
+
+        The cached listing is used while the directory's mtime is unchanged.
+        """
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+        except OSError:
+            return None
+        with self._lock:
+            self._seen_dirs.add(directory)
+            cached = self._dirs.get(directory)
+            if cached and cached['mtime_ns'] == mtime:
+                return cached['files'], cached['subdirs']
+
+        files, subdirs = [], []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                        else:
+                            files.append(entry.name)
+                    except OSError:
+                        continue
+        except OSError:
+            return None
+        with self._lock:
+            self._dirs[directory] = {'mtime_ns': mtime, 'files': files, 'subdirs': subdirs}
+            self._changed = True
+        return files, subdirs
+
+    def lookup(self, path: str, stat: os.stat_result) -> Optional[List[Dict]]:
+        """Get the records parsed from path if it is unchanged since, else None.
+
+        The records are the index's own; copy them before making changes.
+        """
+        with self._lock:
+            self._seen_files.add(path)
+            cached = self._files.get(path)
+            if (cached and cached['size'] == stat.st_size and cached['mtime_ns'] == stat.st_mtime_ns
+                    and cached['inode'] == stat.st_ino):
+                return cached['records']
+        return None
+
+    def store(self, path: str, stat: os.stat_result, records: List[Dict]):
+        """Remember the records parsed from path."""
+        with self._lock:
+            self._seen_files.add(path)
+            self._files[path] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'inode': stat.st_ino,
+                                 'records': [dict(record) for record in records]}
+            self._changed = True
+
+    def forget(self, path: str):
+        """Drop a file (e.g. one that was deleted or could not be parsed)."""
+        with self._lock:
+            if self._files.pop(path, None) is not None:
+                self._changed = True
+
+    def finish(self, complete: bool):
+        """End a scan: drop what it didn't see (only if every source finished) and save."""
+        with self._lock:
+            if complete:
+                for path in [p for p in self._files if p not in self._seen_files]:
+                    del self._files[path]
+                    self._changed = True
+                for directory in [d for d in self._dirs if d not in self._seen_dirs]:
+                    del self._dirs[directory]
+                    self._changed = True
+            if not self._changed or not self.path:
+                return
+            # Entries are replaced, never mutated, so shallow copies can be written outside the lock
+            data = {'version': VERSION, 'dirs': dict(self._dirs), 'files': dict(self._files)}
+            self._changed = False
+
+        tmp_path = self.path.with_suffix('.tmp')
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            tmp_path.replace(self.path)
+        except OSError as e:
+            print(f"Could not save scan index: {e}")
+
+    def __len__(self):
+        return len(self._files)
@@ -0,0 +1,250 @@
+"""Keeps scanned shortcuts current by watching the scanner's source folders."""
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from file_index import Inotify
+
+
+class ScanWatcher:
+    """Follows the folders of a ShortcutScanner's file sources and reports changed shortcuts.
+
+    start() takes a silent baseline of every source folder (cheap right after
+    a scan: unchanged files come from the scan index), then watches them. On
+    Linux each folder is watched with inotify, including files written in
+    place; elsewhere, or if inotify is unavailable, all folders are checked
+    every poll_s. A burst of changes (an installer dropping twenty shortcuts)
+    is collected until the folders are quiet for DEBOUNCE seconds, at most
+    MAX_DELAY, then only the changed folders are re-listed and only files
+    whose size, mtime or inode changed are parsed again.
+
+    Subscribers are called on the watcher thread with a list of events:
+    {'event': 'added' | 'changed' | 'removed', 'source', 'path', 'records',
+    'previous'}; records are the file's shortcuts now, previous what they
+    were (empty for added and removed files respectively).
+    """
+
+    DEBOUNCE = 0.5
+    MAX_DELAY = 5.0
+
+    def __init__(self, scanner, poll_s: float = 30.0):
+        """Initialize the watcher.
+
+        Args:
+            scanner: ShortcutScanner whose roots(), parsers and scan index are used
+            poll_s: Seconds between sweeps of all folders (with inotify, only of folders not watched yet)
+        """
+        self.scanner = scanner
+        self.poll_s = poll_s
+        self._roots = []  # (source, root, suffix, recursive, parser)
+        self._known = {}  # {path: (source, (size, mtime_ns, inode), records)}
+        self._dirs = set()  # Folders listed so far (and watched, with inotify)
+        self._subscribers = []
+        self._lock = threading.Lock()  # Subscribers
+        self._state_lock = threading.RLock()  # Known files and folders
+        self._inotify = None
+        self._thread = None
+        self._stopping = threading.Event()
+
+    def subscribe(self, callback: Callable[[List[Dict]], None]):
+        """Call callback(events) for every batch of changes."""
+        with self._lock:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[List[Dict]], None]):
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def start(self):
+        """Take the baseline and start watching, in the background."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='scan-watcher', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+    def check(self, directories: Optional[List[str]] = None) -> List[Dict]:
+        """Re-read folders now (all of them if None), notify subscribers and return the events."""
+        if directories is None:
+            directories = [str(root) for _source, root, _suffix, _recursive, _parser in self._roots]
+            directories += sorted(self._dirs)
+        events = []
+        done = set()
+        with self._state_lock:
+            for directory in directories:
+                self._refresh(directory, events, done)
+        if events:
+            self.scanner.index.finish(complete=False)  # Saves the re-parsed files
+            self._notify(events)
+        return events
+
+    def _run(self):
+        sources = self.scanner.sources()
+        for source, specs in self.scanner.roots().items():
+            parser = sources[source][1]
+            for root, suffix, recursive in specs:
+                self._roots.append((source, os.path.abspath(str(root)), suffix, recursive, parser))
+
+        if sys.platform.startswith('linux'):
+            try:
+                self._inotify = Inotify(Inotify.MASK | Inotify.CLOSE_WRITE)
+            except (OSError, AttributeError) as e:
+                print(f"Scan watcher: no inotify ({e}); checking every {self.poll_s:g}s")
+
+        started = time.perf_counter()
+        done = set()
+        with self._state_lock:
+            for _source, root, _suffix, _recursive, _parser in self._roots:
+                self._refresh(root, None, done)
+        print(f"Scan watcher: following {len(self._known)} files in {len(self._dirs)} folders "
+              f"({(time.perf_counter() - started) * 1000:.0f}ms)")
+
+        next_sweep = time.monotonic() + self.poll_s
+        while not self._stopping.is_set():
+            try:
+                timeout = max(0.0, next_sweep - time.monotonic())
+                if self._inotify is not None:
+                    changed = self._inotify.read(min(timeout, 1.0))  # Short, so stop() is noticed
+                    if changed:
+                        changed |= self._collect_burst()
+                        self.check(sorted(changed))
+                else:
+                    self._stopping.wait(timeout)
+
+                if time.monotonic() >= next_sweep:
+                    if self._inotify is not None:
+                        # Watched folders report their own changes; look for roots that appeared since
+                        self.check([root for _source, root, _suffix, _recursive, _parser in self._roots
+                                    if root not in self._dirs])
+                    else:
+                        self.check()
+                    next_sweep = time.monotonic() + self.poll_s
+            except Exception as e:
+                print(f"Scan watcher failed: {e}")
+                self._stopping.wait(self.poll_s)
+
+    def _collect_burst(self) -> set:
+        """Keep reading events until the folders are quiet for DEBOUNCE (at most MAX_DELAY)."""
+        changed = set()
+        deadline = time.monotonic() + self.MAX_DELAY
+        while not self._stopping.is_set() and time.monotonic() < deadline:
+            more = self._inotify.read(min(self.DEBOUNCE, max(0.0, deadline - time.monotonic())))
+            if not more:
+                break
+            changed |= more
+        return changed
+
+    def _specs(self, directory: str) -> List[Tuple]:
+        """Sources looking in directory: (source, suffix, recursive, parser)."""
+        specs = []
+        for source, root, suffix, recursive, parser in self._roots:
+            if directory == root or (recursive and directory.startswith(root + os.sep)):
+                specs.append((source, suffix, recursive, parser))
+        return specs
+
+    def _refresh(self, directory: str, events: Optional[List[Dict]], done: set):
+        """Bring one folder (and new subfolders) up to date; events None means baseline, no events."""
+        if directory in done:
+            return
+        done.add(directory)
+        specs = self._specs(directory)
+        listing = self.scanner.index.list_dir(directory) if specs else None
+        if listing is None:
+            self._drop_folder(directory, events)
+            return
+
+        files, subdirs = listing
+        if directory not in self._dirs:
+            self._dirs.add(directory)
+            if self._inotify is not None:
+                self._inotify.add(directory)
+
+        present = set()
+        for source, suffix, recursive, parser in specs:
+            for name in files:
+                if name.lower().endswith(suffix):
+                    path = os.path.join(directory, name)
+                    present.add(path)
+                    self._refresh_file(source, parser, path, events)
+            if recursive:
+                for subdir in subdirs:
+                    if events is None or subdir not in self._dirs:
+                        self._refresh(subdir, events, done)
+
+        for path in [p for p in self._known if os.path.dirname(p) == directory and p not in present]:
+            self._forget(path, events)
+        if events is not None:
+            # Subfolders that are gone (inotify only reports the parent)
+            gone = set(subdirs)
+            for subdir in [d for d in self._dirs if os.path.dirname(d) == directory and d not in gone]:
+                self._drop_folder(subdir, events)
+
+    def _refresh_file(self, source: str, parser: Callable, path: str, events: Optional[List[Dict]]):
+        """Re-parse a file if it changed since last seen."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            self._forget(path, events)
+            return
+        signature = (stat.st_size, stat.st_mtime_ns, stat.st_ino)
+        known = self._known.get(path)
+        if known is not None and known[1] == signature:
+            return
+
+        records = self.scanner.index.lookup(path, stat)
+        if records is None:
+            try:
+                records = parser(Path(path))
+            except Exception as e:
+                print(f"Scan watcher: could not parse {path}: {e}")
+                self.scanner.index.forget(path)
+                self._forget(path, events)
+                return
+            self.scanner.index.store(path, stat, records)
+
+        self._known[path] = (source, signature, records)
+        if events is None:
+            return
+        previous = known[2] if known is not None else []
+        if known is None:
+            events.append({'event': 'added', 'source': source, 'path': path, 'records': records, 'previous': []})
+        elif records != previous:
+            events.append({'event': 'changed', 'source': source, 'path': path, 'records': records,
+                           'previous': previous})
+
+    def _forget(self, path: str, events: Optional[List[Dict]]):
+        known = self._known.pop(path, None)
+        if known is not None and events is not None:
+            self.scanner.index.forget(path)
+            events.append({'event': 'removed', 'source': known[0], 'path': path, 'records': [],
+                           'previous': known[2]})
+
+    def _drop_folder(self, directory: str, events: Optional[List[Dict]]):
+        """A folder is gone: remove everything known under it."""
+        prefix = directory + os.sep
+        for path in [p for p in self._known if p.startswith(prefix)]:
+            self._forget(path, events)
+        dropped = {d for d in self._dirs if d == directory or d.startswith(prefix)}
+        if self._inotify is not None:
+            for folder in dropped:
+                self._inotify.remove(folder)
+        self._dirs -= dropped
+
+    def _notify(self, events: List[Dict]):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(events)
+            except Exception as e:
+                print(f"Scan watcher subscriber failed: {e}")
@@ -0,0 +1,233 @@
+"""Incremental fuzzy search index for launcher shortcuts."""
+import re
+import unicodedata
+from typing import Dict, List, Tuple, Iterable
+
+SEARCH_FIELDS = ('name', 'hotkey', 'path')
+
+# Match tiers, best first
+TIER_NAME_PREFIX = 3
+TIER_WORD_PREFIX = 2
+TIER_SUBSTRING = 1
+TIER_SUBSEQUENCE = 0
+
+
+def normalize(text: str) -> str:
+    """Lowercase text and strip accents so 'Café' matches 'cafe'."""
+    if not text:
+        return ''
+    decomposed = unicodedata.normalize('NFKD', text)
+    if decomposed.isascii():
+        return decomposed.lower()
+    return ''.join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+def _subsequence_pattern(query: str):
+    """Compile a regex matching query as a subsequence within one NUL-separated field.
+
+    'abc' becomes a[^\0b]*b[^\0c]*c: each gap stops at the next wanted char, so
+    the match is found left to right without backtracking, and the regex engine
+    does the per-character work in C.
+    """
+    parts = [re.escape(query[0])]
+    for char in query[1:]:
+        escaped = re.escape(char)
+        parts.append(f'[^\\0{escaped}]*{escaped}')
+    return re.compile(''.join(parts))
+
+
+def _tokens_prefix_words(tokens: List[str], name: str) -> bool:
+    """Check that each query token prefixes a distinct word of name, in order."""
+    position = 0
+    for token in tokens:
+        position = name.find(' ' + token, position)
+        if position < 0:
+            return False
+        position += len(token) + 1
+    return True
+
+
+def _word_starts(text: str) -> str:
+    """Get the first letter of each word ('vs code' -> 'vc')."""
+    return ''.join(word[0] for word in text.replace('\\', ' ').replace('/', ' ').replace('+', ' ').split())
+
+
+class SearchIndex:
+    """Fuzzy subsequence / word-prefix search over shortcut name, hotkey and path.
+
+    Each entry keeps its normalized fields. Character postings ({char: set of
+    ids}) prune candidates for a fresh query; when a query only extends the
+    previous one, the previous matches are re-checked instead of the whole
+    index. Entries are added, updated and removed one at a time, so a config
+    change never rebuilds the index.
+
+    Recent queries and their matches are kept as a stack, so backspacing
+    back to an earlier query reuses its matches as well.
+    """
+
+    HISTORY_DEPTH = 32
+
+    def __init__(self, shortcuts: Iterable[Dict] = None):
+        self._entries = {}  # {id: shortcut}, in insertion (config) order
+        self._fields = {}  # {id: normalized fields}
+        self._names = {}  # {id: ' ' + normalized name}, the space makes word starts searchable
+        self._initials = {}  # {id: first letter of each name word}
+        self._haystacks = {}  # {id: fields joined by NUL}, searched for substrings and subsequences
+        self._seq = {}  # {id: insertion number}
+        self._next_seq = 0
+        self._postings = {}  # {char: set of ids}
+
+        # Narrowing cache: [(query, matching ids in order)], each query extending the one below
+        self._history = []
+
+        for shortcut in shortcuts or []:
+            self.add(shortcut)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, shortcut: Dict):
+        """Add or replace a shortcut in the index."""
+        shortcut_id = shortcut['id']
+        if shortcut_id in self._entries:
+            self._unpost(shortcut_id)
+        else:
+            self._seq[shortcut_id] = self._next_seq
+            self._next_seq += 1
+
+        fields = tuple(normalize(shortcut.get(field) or '') for field in SEARCH_FIELDS)
+        self._entries[shortcut_id] = shortcut
+        self._fields[shortcut_id] = fields
+        self._names[shortcut_id] = ' ' + ' '.join(fields[0].split())
+        self._initials[shortcut_id] = _word_starts(fields[0])
+        self._haystacks[shortcut_id] = '\0'.join(fields)
+        for char in set(''.join(fields)):
+            self._postings.setdefault(char, set()).add(shortcut_id)
+        self._invalidate()
+
+    update = add
+
+    def remove(self, shortcut_id: str):
+        """Remove a shortcut from the index."""
+        if shortcut_id not in self._entries:
+            return
+        self._unpost(shortcut_id)
+        for table in (self._entries, self._fields, self._names, self._initials, self._haystacks, self._seq):
+            del table[shortcut_id]
+        self._invalidate()
+
+    def sync(self, shortcuts: Iterable[Dict]):
+        """Bring the index in line with a fresh shortcut list, touching only what changed."""
+        seen = set()
+        for shortcut in shortcuts:
+            shortcut_id = shortcut['id']
+            seen.add(shortcut_id)
+            current = self._entries.get(shortcut_id)
+            if current is None or self._signature(current) != self._signature(shortcut):
+                self.add(shortcut)
+            else:
+                # Same content; keep the newest dict so callers get live objects
+                self._entries[shortcut_id] = shortcut
+
+        for shortcut_id in [sid for sid in self._entries if sid not in seen]:
+            self.remove(shortcut_id)
+
+    def search(self, query: str, limit: int = None) -> List[Dict]:
+        """Get shortcuts matching query, best tier first and config order within a tier."""
+        return [shortcut for shortcut, _tier in self.search_with_tiers(query, limit)]
+
+    def search_with_tiers(self, query: str, limit: int = None) -> List[Tuple[Dict, int]]:
+        """Like search(), but returns (shortcut, tier) pairs."""
+        query = ' '.join(normalize(query).split())
+        compact = query.replace(' ', '')
+        entries = self._entries
+
+        if not compact:
+            return [(shortcut, TIER_SUBSEQUENCE) for shortcut in list(entries.values())[:limit]]
+
+        matches = self._match_ids(compact)
+
+        # Bucket by tier in one pass instead of sorting; matches are already in config order
+        names, initials, haystacks = self._names, self._initials, self._haystacks
+        name_prefix = ' ' + query
+        word_prefix = ' ' + compact if ' ' not in query else None
+        tokens = query.split()
+        buckets = ([], [], [], [])
+        for shortcut_id in matches:
+            name = names[shortcut_id]
+            if name.startswith(name_prefix):
+                tier = TIER_NAME_PREFIX
+            elif initials[shortcut_id].startswith(compact) or (
+                    word_prefix in name if word_prefix else _tokens_prefix_words(tokens, name)):
+                tier = TIER_WORD_PREFIX
+            elif compact in haystacks[shortcut_id]:
+                tier = TIER_SUBSTRING
+            else:
+                tier = TIER_SUBSEQUENCE
+            buckets[tier].append(shortcut_id)
+
+        results = []
+        for tier in (TIER_NAME_PREFIX, TIER_WORD_PREFIX, TIER_SUBSTRING, TIER_SUBSEQUENCE):
+            for shortcut_id in buckets[tier]:
+                results.append((entries[shortcut_id], tier))
+                if limit is not None and len(results) >= limit:
+                    return results
+        return results
+
+    def _match_ids(self, compact: str) -> List[str]:
+        """Get ids of entries where compact is a subsequence of some field, in order."""
+        # Forget cached queries this one does not extend (e.g. after a backspace)
+        history = self._history
+        while history and not compact.startswith(history[-1][0]):
+            history.pop()
+
+        if history and history[-1][0] == compact:
+            return history[-1][1]
+
+        if history:
+            # Extended query: matches can only shrink
+            candidates = history[-1][1]
+        else:
+            postings = []
+            for char in set(compact):
+                posting = self._postings.get(char)
+                if not posting:
+                    return []
+                postings.append(posting)
+            postings.sort(key=len)
+            candidate_set = postings[0].intersection(*postings[1:])
+            if len(candidate_set) * 8 > len(self._entries):
+                # Large sets: filtering the ordered entries beats sorting
+                candidates = [sid for sid in self._entries if sid in candidate_set]
+            else:
+                candidates = sorted(candidate_set, key=self._seq.__getitem__)
+
+        if len(compact) == 1:
+            # Character postings already guarantee a one-char subsequence
+            matches = list(candidates)
+        else:
+            haystacks = self._haystacks
+            search = _subsequence_pattern(compact).search
+            matches = [sid for sid in candidates if search(haystacks[sid])]
+
+        history.append((compact, matches))
+        if len(history) > self.HISTORY_DEPTH:
+            del history[0]
+        return matches
+
+    @staticmethod
+    def _signature(shortcut: Dict) -> Tuple:
+        return tuple(shortcut.get(field) for field in SEARCH_FIELDS)
+
+    def _unpost(self, shortcut_id: str):
+        """Remove an entry from the character postings."""
+        for char in set(''.join(self._fields[shortcut_id])):
+            posting = self._postings.get(char)
+            if posting is not None:
+                posting.discard(shortcut_id)
+                if not posting:
+                    del self._postings[char]
+
+    def _invalidate(self):
+        """Drop the narrowing cache after the index changes."""
+        self._history.clear()
@@ -292,20 +292,20 @@ class SetupWizard:
             return
 
         # Add to config
-        current_shortcuts = self.config.get_shortcuts()
+        existing_names = {s.get('name') for s in self.config.get_shortcuts()}
 
         for item in selected_items:
             # Check if already exists
-            if not any(s.get('name') == item['name'] for s in current_shortcuts):
-                current_shortcuts.append({
+            if item['name'] not in existing_names:
+                self.config.store.add({
                     'name': item['name'],
                     'hotkey': item['hotkey'],
                     'path': None,  # No path for hotkey shortcuts
                     'icon': None
                 })
+                existing_names.add(item['name'])
 
         # Save config
-        self.config.config['shortcuts'] = current_shortcuts
         self.config.save_config()
 
         messagebox.showinfo(
@@ -0,0 +1,201 @@
+"""Named shortcut collections stored one file per collection."""
+import json
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+from shortcut_store import ShortcutStore
+
+
+class CollectionManager:
+    """Loads shortcut collections on first access and evicts idle ones.
+
+    The manifest is the small 'collections' list kept in config.json:
+        [{"name": "ShareX", "file": "sharex.json", "pinned": false, "count": 12}]
+
+    Each collection's shortcuts live in <config_dir>/collections/<file>. Pinned
+    collections are loaded up front because the popup shows them; the rest are
+    parsed only when asked for (by the 'collections' search provider) and
+    dropped again by evict_idle(), which that provider calls periodically.
+    """
+
+    DIRNAME = "collections"
+    IDLE_EVICT_SECONDS = 300
+
+    def __init__(self, config_dir: Path, manifest: List[Dict[str, Any]]):
+        """Initialize the collection manager.
+
+        Args:
+            config_dir: Configuration directory
+            manifest: The 'collections' list from config.json (edited in place)
+        """
+        self.collections_dir = config_dir / self.DIRNAME
+        self.manifest = manifest
+        self._entries = {entry['name']: entry for entry in manifest}
+        self._loaded = {}  # {name: ShortcutStore}
+        self._last_access = {}  # {name: monotonic time}
+        self._dirty = set()  # Names with changes not yet written
+        self._lock = threading.Lock()
+
+        for entry in manifest:
+            if entry.get('pinned'):
+                self.get(entry['name'])
+
+    def names(self) -> List[str]:
+        """Get all collection names in manifest order."""
+        return [entry['name'] for entry in self.manifest]
+
+    def pinned_names(self) -> List[str]:
+        """Get the names of collections pinned to the popup."""
+        return [entry['name'] for entry in self.manifest if entry.get('pinned')]
+
+    def unpinned_names(self) -> List[str]:
+        """Get the names of collections loaded only on demand."""
+        return [entry['name'] for entry in self.manifest if not entry.get('pinned')]
+
+    def is_loaded(self, name: str) -> bool:
+        """Check whether a collection is currently in memory."""
+        return name in self._loaded
+
+    def get(self, name: str) -> Optional[ShortcutStore]:
+        """Get a collection's store, loading it from disk on first access."""
+        entry = self._entries.get(name)
+        if entry is None:
+            return None
+
+        with self._lock:
+            store = self._loaded.get(name)
+            if store is None:
+                store = self._read(entry)
+                self._loaded[name] = store
+                if store.assigned_ids:
+                    self._dirty.add(name)
+            self._last_access[name] = time.monotonic()
+
+        if name in self._dirty:
+            self.save(name)
+        return store
+
+    def create(self, name: str, shortcuts: List[Dict] = None, pinned: bool = False) -> ShortcutStore:
+        """Create (or replace) a collection and write it to disk.
+
+        The manifest entry changes too, so call ConfigManager.save_config() afterwards.
+        """
+        entry = self._entries.get(name)
+        if entry is None:
+            entry = {'name': name, 'file': self._filename_for(name), 'pinned': pinned, 'count': 0}
+            self.manifest.append(entry)
+            self._entries[name] = entry
+        else:
+            entry['pinned'] = pinned
+
+        store = ShortcutStore(shortcuts)
+        with self._lock:
+            self._loaded[name] = store
+            self._last_access[name] = time.monotonic()
+        self.save(name)
+        return store
+
+    def delete(self, name: str):
+        """Delete a collection and its file. Call ConfigManager.save_config() afterwards."""
+        entry = self._entries.pop(name, None)
+        if entry is None:
+            return
+
+        self.manifest.remove(entry)
+        with self._lock:
+            self._loaded.pop(name, None)
+            self._last_access.pop(name, None)
+            self._dirty.discard(name)
+
+        try:
+            (self.collections_dir / entry['file']).unlink()
+        except FileNotFoundError:
+            pass
+
+    def set_pinned(self, name: str, pinned: bool):
+        """Pin or unpin a collection. Call ConfigManager.save_config() afterwards."""
+        entry = self._entries.get(name)
+        if entry is not None:
+            entry['pinned'] = pinned
+
+    def save(self, name: str):
+        """Write a loaded collection to its file."""
+        entry = self._entries.get(name)
+        store = self._loaded.get(name)
+        if entry is None or store is None:
+            return
+
+        shortcuts = store.to_list()
+        self.collections_dir.mkdir(parents=True, exist_ok=True)
+        path = self.collections_dir / entry['file']
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'name': name, 'shortcuts': shortcuts}, f, indent=2, ensure_ascii=False)
+        tmp_path.replace(path)
+
+        entry['count'] = len(shortcuts)
+        self._dirty.discard(name)
+
+    def flush(self):
+        """Write every loaded collection with unsaved changes."""
+        for name in list(self._dirty):
+            try:
+                self.save(name)
+            except OSError as e:
+                print(f"Error saving collection '{name}': {e}")
+
+    def find(self, shortcut_id: str) -> Optional[str]:
+        """Get the name of the loaded collection holding a shortcut, if any."""
+        with self._lock:
+            for name, store in self._loaded.items():
+                if shortcut_id in store:
+                    return name
+        return None
+
+    def evict_idle(self, max_idle: float = None) -> List[str]:
+        """Drop unpinned, unchanged collections not accessed for max_idle seconds.
+
+        Returns the names that were evicted.
+        """
+        if max_idle is None:
+            max_idle = self.IDLE_EVICT_SECONDS
+
+        now = time.monotonic()
+        evicted = []
+        with self._lock:
+            for name in list(self._loaded):
+                entry = self._entries.get(name, {})
+                if entry.get('pinned') or name in self._dirty:
+                    continue
+                if now - self._last_access.get(name, 0) >= max_idle:
+                    del self._loaded[name]
+                    self._last_access.pop(name, None)
+                    evicted.append(name)
+        return evicted
+
+    def _filename_for(self, name: str) -> str:
+        """Build a unique, filesystem-safe file name for a collection."""
+        slug = re.sub(r'[^a-z0-9]+', '_', name.lower()).strip('_') or 'collection'
+        taken = {entry['file'] for entry in self.manifest}
+        filename = f"{slug}.json"
+        suffix = 2
+        while filename in taken:
+            filename = f"{slug}_{suffix}.json"
+            suffix += 1
+        return filename
+
+    def _read(self, entry: Dict[str, Any]) -> ShortcutStore:
+        """Parse a collection file into a store."""
+        path = self.collections_dir / entry['file']
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            shortcuts = data.get('shortcuts', [])
+        except FileNotFoundError:
+            shortcuts = []
+        except (json.JSONDecodeError, IOError) as e:
+            print(f"Error loading collection '{entry['name']}': {e}")
+            shortcuts = []
+        return ShortcutStore(shortcuts)
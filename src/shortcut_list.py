@@ -0,0 +1,225 @@
+"""Virtualized shortcut list drawn on a single canvas."""
+import tkinter as tk
+import tkinter.font as tkfont
+from typing import List, Dict, Callable
+
+
+class VirtualShortcutList:
+    """Scrollable list of shortcuts that only draws the rows on screen.
+
+    A fixed pool of canvas items (a background rectangle, a text item and an
+    optional icon per visible row) is created once and re-labelled on scroll, so showing the
+    popup costs the same for 20 shortcuts as for 20,000. Hover, click and
+    right-click are handled by one set of bindings on the canvas.
+    """
+
+    ROW_PADX = 5
+    ROW_PADY = 2
+    ROW_GAP = 1
+    WHEEL_ROWS = 3
+
+    def __init__(self, parent, config_manager, on_click: Callable, on_right_click: Callable = None,
+                 icon_cache=None):
+        """Initialize the list.
+
+        Args:
+            parent: Parent widget
+            config_manager: ConfigManager instance (for colors, fonts and sizes)
+            on_click: Called with the shortcut dict when a row is clicked
+            on_right_click: Called with (event, shortcut) when a row is right-clicked
+            icon_cache: Optional IconCache; rows then show an icon (placeholder until loaded)
+        """
+        self.config = config_manager
+        self.on_click = on_click
+        self.on_right_click = on_right_click
+        self.icon_cache = icon_cache
+
+        self.items = []
+        self.first_row = 0
+        self.hover_row = None
+        self._wheel_rows = 0.0  # Wheel movement not scrolled yet (touchpads send fractions of a notch)
+
+        self.bg_color = self.config.get('window', 'background_color', default='#F5F5F0')
+        self.button_color = self.config.get('window', 'button_color', default='#E8E8D8')
+        self.hover_color = self.config.get('window', 'button_hover_color', default='#D8D8C8')
+        self.text_color = self.config.get('window', 'text_color', default='#2C2C2C')
+        self.width = self.config.get('window', 'width', default=200)
+        self.font = tkfont.Font(
+            family=self.config.get('window', 'font_family', default='Segoe UI'),
+            size=self.config.get('window', 'font_size', default=9)
+        )
+        self.icon_size = icon_cache.size if icon_cache else 0
+        content_height = max(self.font.metrics('linespace'), self.icon_size)
+        self.row_height = content_height + 2 * self.ROW_PADY + self.ROW_GAP
+
+        # Never grow past the screen; the rest is reached by scrolling
+        screen_rows = int(parent.winfo_screenheight() * 0.6) // self.row_height
+        self.max_rows = max(1, min(self.config.get('window', 'max_rows', default=20), screen_rows))
+
+        self.frame = tk.Frame(parent, bg=self.bg_color)
+        self.canvas = tk.Canvas(
+            self.frame,
+            width=self.width,
+            height=self.row_height,
+            bg=self.bg_color,
+            highlightthickness=0,
+            cursor='hand2'
+        )
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar = tk.Scrollbar(self.frame, orient='vertical', command=self._on_scrollbar)
+
+        self.row_pool = []  # [(rect_id, text_id, image_id or None)] one per visible row
+
+        self.canvas.bind('<Motion>', self._on_motion)
+        self.canvas.bind('<Leave>', self._on_leave)
+        self.canvas.bind('<Button-1>', self._on_button1)
+        self.canvas.bind('<Button-3>', self._on_button3)
+        self.canvas.bind('<MouseWheel>', self._on_mousewheel)
+        self.canvas.bind('<Button-4>', lambda e: self.scroll_by(-self.WHEEL_ROWS))
+        self.canvas.bind('<Button-5>', lambda e: self.scroll_by(self.WHEEL_ROWS))
+
+    def pack(self, **kwargs):
+        """Pack the list's container frame."""
+        self.frame.pack(**kwargs)
+
+    def set_items(self, items: List[Dict], keep_position: bool = False):
+        """Replace the shortcuts shown and scroll back to the top.
+
+        Args:
+            items: Shortcuts to show
+            keep_position: Keep the scroll position and hover (for rows appended to the same query)
+        """
+        self.items = items
+        if keep_position:
+            self.first_row = max(0, min(self.first_row, len(items) - 1))
+        else:
+            self.first_row = 0
+            self.hover_row = None
+        self._resize_pool()
+        self.refresh()
+
+    def refresh(self):
+        """Redraw the visible rows from the current items."""
+        for slot, (rect_id, text_id, image_id) in enumerate(self.row_pool):
+            row = self.first_row + slot
+            if row < len(self.items):
+                item = self.items[row]
+                fill = self.hover_color if row == self.hover_row else self.button_color
+                self.canvas.itemconfigure(rect_id, fill=fill, state='normal')
+                self.canvas.itemconfigure(text_id, text=item.get('name', ''), state='normal')
+                if image_id is not None:
+                    # Never blocks: unloaded icons show the placeholder and load in the background
+                    image = self.icon_cache.get(item) or self.icon_cache.placeholder()
+                    self.canvas.itemconfigure(image_id, image=image, state='normal')
+            else:
+                self.canvas.itemconfigure(rect_id, state='hidden')
+                self.canvas.itemconfigure(text_id, state='hidden')
+                if image_id is not None:
+                    self.canvas.itemconfigure(image_id, state='hidden')
+
+        self._update_scrollbar()
+
+    def scroll_by(self, rows: int):
+        """Scroll by a number of rows."""
+        self.scroll_to(self.first_row + rows)
+
+    def scroll_to(self, row: int):
+        """Scroll so that row is the first one visible."""
+        max_first = max(0, len(self.items) - len(self.row_pool))
+        row = max(0, min(row, max_first))
+        if row != self.first_row:
+            self.first_row = row
+            self.hover_row = None
+            self.refresh()
+
+    def row_at(self, y: int):
+        """Get the item index under a canvas y coordinate, or None."""
+        row = self.first_row + int(y) // self.row_height
+        if 0 <= row < len(self.items) and int(y) // self.row_height < len(self.row_pool):
+            return row
+        return None
+
+    def _resize_pool(self):
+        """Create or drop pooled row items so there is one per visible row."""
+        visible = max(1, min(len(self.items), self.max_rows))
+
+        while len(self.row_pool) < visible:
+            slot = len(self.row_pool)
+            y = slot * self.row_height
+            rect_id = self.canvas.create_rectangle(
+                2, y, self.width - 2, y + self.row_height - self.ROW_GAP,
+                fill=self.button_color, width=0
+            )
+            middle = y + (self.row_height - self.ROW_GAP) // 2
+            text_x = 2 + self.ROW_PADX
+            image_id = None
+            if self.icon_cache:
+                image_id = self.canvas.create_image(text_x, middle, anchor='w')
+                text_x += self.icon_size + self.ROW_PADX
+            text_id = self.canvas.create_text(
+                text_x, middle,
+                anchor='w', font=self.font, fill=self.text_color
+            )
+            self.row_pool.append((rect_id, text_id, image_id))
+
+        while len(self.row_pool) > visible:
+            for item_id in self.row_pool.pop():
+                if item_id is not None:
+                    self.canvas.delete(item_id)
+
+        self.canvas.configure(height=visible * self.row_height)
+
+        if len(self.items) > visible:
+            self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        else:
+            self.scrollbar.pack_forget()
+
+    def _update_scrollbar(self):
+        """Sync the scrollbar thumb with the visible window."""
+        if not self.items:
+            self.scrollbar.set(0, 1)
+            return
+        total = len(self.items)
+        self.scrollbar.set(self.first_row / total, min(1.0, (self.first_row + len(self.row_pool)) / total))
+
+    def _set_hover(self, row):
+        """Move the hover highlight to row (or clear it with None)."""
+        if row == self.hover_row:
+            return
+        for old in (self.hover_row, row):
+            if old is not None and 0 <= old - self.first_row < len(self.row_pool):
+                rect_id = self.row_pool[old - self.first_row][0]
+                self.canvas.itemconfigure(rect_id, fill=self.hover_color if old == row else self.button_color)
+        self.hover_row = row
+
+    def _on_motion(self, event):
+        self._set_hover(self.row_at(event.y))
+
+    def _on_leave(self, event):
+        self._set_hover(None)
+
+    def _on_button1(self, event):
+        row = self.row_at(event.y)
+        if row is not None:
+            self.on_click(self.items[row])
+
+    def _on_button3(self, event):
+        row = self.row_at(event.y)
+        if row is not None and self.on_right_click:
+            self.on_right_click(event, self.items[row])
+
+    def _on_mousewheel(self, event):
+        # Windows reports 120 per notch; touchpads and high-resolution wheels send smaller steps
+        self._wheel_rows -= event.delta / 120 * self.WHEEL_ROWS
+        rows = int(self._wheel_rows)
+        if rows:
+            self._wheel_rows -= rows
+            self.scroll_by(rows)
+
+    def _on_scrollbar(self, action, value, unit=None):
+        """Handle scrollbar drags ('moveto') and arrow/page clicks ('scroll')."""
+        if action == 'moveto':
+            self.scroll_to(int(float(value) * len(self.items)))
+        elif action == 'scroll':
+            step = len(self.row_pool) if unit == 'pages' else 1
+            self.scroll_by(int(value) * step)
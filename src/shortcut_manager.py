@@ -2,6 +2,7 @@
 import tkinter as tk
 from tkinter import messagebox, ttk
 from config_manager import ConfigManager
+from hotkeys import hotkey_from_keys, hotkey_key
 import subprocess
 import sys
 import os
@@ -16,7 +17,7 @@ class ShortcutManager:
 
     def __init__(self):
         self.config = ConfigManager()
-        self.shortcut_widgets = {}  # {index: {checkbox_var, name_label, delete_btn, frame}}
+        self.shortcut_widgets = {}  # {shortcut_id: {checkbox_var, name_label, frame, shortcut}}
         
         # Hotkey monitoring state
         self.detected_hotkeys = {}
@@ -27,7 +28,7 @@ class ShortcutManager:
         self.hotkey_widgets = {}
         self.monitor_thread = None
         self.monitoring_lock = threading.Lock()
-        self.original_shortcuts = None  # Store original state to detect changes
+        self.original_shortcuts = None  # {shortcut_id: shortcut} snapshot to detect changes
 
         self.root = tk.Tk()
         self.root.title("Otterly Launcher - Manage Shortcuts")
@@ -65,20 +66,15 @@ class ShortcutManager:
             return True
         
         # Check if any names or enabled status changed
-        for idx, widget_data in self.shortcut_widgets.items():
+        for shortcut_id, widget_data in self.shortcut_widgets.items():
             shortcut = widget_data['shortcut']
             enabled = widget_data['checkbox_var'].get()
-            
-            # Find the original shortcut
-            original = None
-            if self.original_shortcuts:
-                for s in self.original_shortcuts:
-                    if s.get('name') == shortcut.get('name'):
-                        original = s
-                        break
-            
-            # Check if enabled status changed
-            if original and original.get('enabled', True) != enabled:
+
+            original = self.original_shortcuts.get(shortcut_id) if self.original_shortcuts else None
+            if original is None:
+                continue
+
+            if original.get('enabled', True) != enabled or original.get('name') != shortcut.get('name'):
                 return True
         
         # Check if any hotkeys were added
@@ -174,6 +170,17 @@ class ShortcutManager:
         )
         instructions.pack()
 
+        self.import_btn = tk.Button(
+            self.shortcuts_tab,
+            text="Import Scanned Shortcuts",
+            command=self._import_scanned,
+            font=('Segoe UI', 10),
+            padx=15,
+            pady=5,
+            cursor='hand2'
+        )
+        self.import_btn.pack()
+
         # Scrollable frame for shortcuts
         list_container = tk.Frame(self.shortcuts_tab)
         list_container.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
@@ -310,7 +317,7 @@ class ShortcutManager:
         
         # Store original state to detect changes
         import copy
-        self.original_shortcuts = copy.deepcopy(shortcuts)
+        self.original_shortcuts = {s['id']: copy.deepcopy(s) for s in shortcuts}
 
         if not shortcuts:
             no_shortcuts_label = tk.Label(
@@ -324,11 +331,12 @@ class ShortcutManager:
             no_shortcuts_label.pack()
             return
 
-        for idx, shortcut in enumerate(shortcuts):
-            self._add_shortcut_row(idx, shortcut)
+        for shortcut in shortcuts:
+            self._add_shortcut_row(shortcut)
 
-    def _add_shortcut_row(self, index: int, shortcut: dict):
+    def _add_shortcut_row(self, shortcut: dict):
         """Add a row for a shortcut."""
+        shortcut_id = shortcut['id']
         row_frame = tk.Frame(self.scrollable_frame, bg='white', relief=tk.SOLID, borderwidth=1)
         row_frame.pack(fill=tk.X, padx=2, pady=1)
 
@@ -349,8 +357,15 @@ class ShortcutManager:
         )
         name_label.pack(side=tk.LEFT, padx=5)
 
-        # Type (Application or Hotkey)
-        shortcut_type = "Hotkey" if shortcut.get('hotkey') else "Application"
+        # Type (Application, Hotkey, Macro or Workspace)
+        if shortcut.get('hotkey'):
+            shortcut_type = "Hotkey"
+        elif shortcut.get('steps'):
+            shortcut_type = "Macro"
+        elif shortcut.get('workspace'):
+            shortcut_type = "Workspace"
+        else:
+            shortcut_type = "Application"
         type_label = tk.Label(
             row_frame,
             text=shortcut_type,
@@ -362,8 +377,13 @@ class ShortcutManager:
         )
         type_label.pack(side=tk.LEFT, padx=5)
 
-        # Target (path or hotkey)
-        target = shortcut.get('hotkey') or shortcut.get('path') or 'N/A'
+        # Target (path, hotkey, step or member count)
+        if shortcut_type == "Macro":
+            target = f"{len(shortcut['steps'])} steps"
+        elif shortcut_type == "Workspace":
+            target = f"{len(shortcut['workspace'].get('members', []))} apps"
+        else:
+            target = shortcut.get('hotkey') or shortcut.get('path') or 'N/A'
         target_label = tk.Label(
             row_frame,
             text=target,
@@ -379,7 +399,7 @@ class ShortcutManager:
         edit_btn = tk.Button(
             row_frame,
             text="Edit",
-            command=lambda i=index: self._edit_shortcut_name(i),
+            command=lambda i=shortcut_id: self._edit_shortcut_name(i),
             font=('Segoe UI', 9),
             bg='#2196F3',
             fg='white',
@@ -393,7 +413,7 @@ class ShortcutManager:
         delete_btn = tk.Button(
             row_frame,
             text="Delete",
-            command=lambda i=index: self._delete_shortcut(i),
+            command=lambda i=shortcut_id: self._delete_shortcut(i),
             font=('Segoe UI', 9),
             bg='#F44336',
             fg='white',
@@ -404,19 +424,19 @@ class ShortcutManager:
         delete_btn.pack(side=tk.LEFT, padx=2)
 
         # Store references
-        self.shortcut_widgets[index] = {
+        self.shortcut_widgets[shortcut_id] = {
             'checkbox_var': check_var,
             'name_label': name_label,
             'frame': row_frame,
             'shortcut': shortcut
         }
 
-    def _edit_shortcut_name(self, index: int):
+    def _edit_shortcut_name(self, shortcut_id: str):
         """Edit the name of a shortcut."""
-        if index not in self.shortcut_widgets:
+        if shortcut_id not in self.shortcut_widgets:
             return
 
-        widget_data = self.shortcut_widgets[index]
+        widget_data = self.shortcut_widgets[shortcut_id]
         shortcut = widget_data['shortcut']
         old_name = shortcut['name']
 
@@ -466,16 +486,16 @@ class ShortcutManager:
         new_name = result_var.get().strip()
         if new_name and new_name != old_name:
             # Update the shortcut
-            shortcut['name'] = new_name
+            self.config.store.update(shortcut_id, name=new_name)
             widget_data['name_label'].config(text=new_name)
             print(f"Shortcut renamed from '{old_name}' to '{new_name}'")
 
-    def _delete_shortcut(self, index: int):
+    def _delete_shortcut(self, shortcut_id: str):
         """Delete a shortcut."""
-        if index not in self.shortcut_widgets:
+        if shortcut_id not in self.shortcut_widgets:
             return
 
-        shortcut = self.shortcut_widgets[index]['shortcut']
+        shortcut = self.shortcut_widgets[shortcut_id]['shortcut']
 
         confirm = messagebox.askyesno(
             "Delete Shortcut",
@@ -484,19 +504,55 @@ class ShortcutManager:
 
         if confirm:
             # Remove from display
-            self.shortcut_widgets[index]['frame'].destroy()
-            del self.shortcut_widgets[index]
+            self.shortcut_widgets[shortcut_id]['frame'].destroy()
+            del self.shortcut_widgets[shortcut_id]
+
+    def _import_scanned(self):
+        """Scan for shortcuts in the background and store each source as a collection."""
+        self.import_btn.config(state=tk.DISABLED, text="Scanning...")
+
+        def scan():
+            from shortcut_scanner import ShortcutScanner
+            try:
+                results = ShortcutScanner(index_path=self.config.config_dir / 'scan_index.json').scan_all()
+            except Exception as e:
+                results = e
+            self.root.after(0, lambda: self._on_scanned(results))
+
+        threading.Thread(target=scan, daemon=True).start()
+
+    def _on_scanned(self, results):
+        """Write scan results to one collection per source (replacing earlier imports)."""
+        self.import_btn.config(state=tk.NORMAL, text="Import Scanned Shortcuts")
+        if isinstance(results, Exception):
+            messagebox.showerror("Import Failed", f"Error scanning shortcuts: {results}")
+            return
+
+        groups = {}
+        for shortcut in results:
+            groups.setdefault(shortcut.get('source') or 'Scanned', []).append(shortcut)
+        for name, shortcuts in groups.items():
+            self.config.import_collection(name, shortcuts)
+
+        summary = "\n".join(f"{name}: {len(shortcuts)}" for name, shortcuts in sorted(groups.items()))
+        messagebox.showinfo(
+            "Shortcuts Imported",
+            f"Imported {len(results)} shortcuts into collections:\n\n{summary}\n\n"
+            "They are searchable from the launcher popup.",
+            icon='info'
+        )
 
     def _save_changes(self):
         """Save changes to config."""
         # Collect remaining shortcuts with their enabled status
         updated_shortcuts = []
 
-        for idx in sorted(self.shortcut_widgets.keys()):
-            widget_data = self.shortcut_widgets[idx]
+        # Rows are kept in config order, keyed by shortcut ID
+        for widget_data in self.shortcut_widgets.values():
             shortcut = widget_data['shortcut'].copy()
             shortcut['enabled'] = widget_data['checkbox_var'].get()
             updated_shortcuts.append(shortcut)
+        existing_hotkeys = {hotkey_key(s.get('hotkey')) for s in updated_shortcuts if s.get('hotkey')}
 
         # Add selected hotkeys from the Add Hotkeys tab
         for hotkey, widgets in self.hotkey_widgets.items():
@@ -504,16 +560,17 @@ class ShortcutManager:
                 name = widgets['name_entry'].get().strip()
                 if name:
                     # Check if this hotkey already exists
-                    if not any(s.get('hotkey') == hotkey for s in updated_shortcuts):
+                    if hotkey_key(hotkey) not in existing_hotkeys:
                         updated_shortcuts.append({
                             'name': name,
                             'hotkey': hotkey,
                             'path': None,
                             'icon': None
                         })
+                        existing_hotkeys.add(hotkey_key(hotkey))
 
         # Save to config
-        self.config.config['shortcuts'] = updated_shortcuts
+        self.config.set_shortcuts(updated_shortcuts)
         self.config.save_config()
 
         # Notify user
@@ -601,32 +658,7 @@ class ShortcutManager:
 
     def _build_hotkey_string(self, keys: Set[str]) -> str:
         """Build a normalized hotkey string from a set of keys."""
-        modifiers = []
-        regular_keys = []
-
-        for key in keys:
-            key_lower = key.lower()
-            if key_lower in ['ctrl', 'left ctrl', 'right ctrl']:
-                if 'Ctrl' not in modifiers:
-                    modifiers.append('Ctrl')
-            elif key_lower in ['alt', 'left alt', 'right alt']:
-                if 'Alt' not in modifiers:
-                    modifiers.append('Alt')
-            elif key_lower in ['shift', 'left shift', 'right shift']:
-                if 'Shift' not in modifiers:
-                    modifiers.append('Shift')
-            elif key_lower in ['win', 'left windows', 'right windows']:
-                if 'Win' not in modifiers:
-                    modifiers.append('Win')
-            else:
-                normalized = key.upper() if len(key) == 1 else key.title()
-                regular_keys.append(normalized)
-
-        modifiers.sort()
-        regular_keys.sort()
-
-        parts = modifiers + regular_keys
-        return '+'.join(parts)
+        return str(hotkey_from_keys(keys))
 
     def _register_hotkey(self, hotkey: str):
         """Register a detected hotkey."""
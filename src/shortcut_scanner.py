@@ -1,175 +1,545 @@
 """Scans system for keyboard shortcuts and hotkeys."""
-import winreg
 import os
+import re
+import threading
+import time
+import queue
+from concurrent.futures import ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import List, Dict, Optional
-import subprocess
+from typing import List, Dict, Optional, Callable, Iterable, Iterator
+from ahk_parser import read_ahk
+from hotkeys import dedupe, normalize_hotkey
+from lnk_parser import read_lnk
+from registry_source import NativeRegistry, RegistrySource
+from scan_index import ScanIndex
+
+DEFAULT_BUDGET_S = 10.0  # Wall-clock budget per source
+PARSE_WORKERS = 8
+MAX_REPORTED_ERRORS = 20
+
+# Registry keys holding hotkeys, with how many levels below them to read
+REGISTRY_ROOTS = [
+    (r'HKCU\Software\Microsoft\Windows\CurrentVersion\Explorer\AppKey', 1),
+    (r'HKCU\Software\Classes\Applications', 1),  # Skips each application's shell\open\command subtree
+]
+# AppKey subkeys are APPCOMMAND numbers; named like AutoHotkey's keys
+APP_KEYS = {1: 'Browser_Back', 2: 'Browser_Forward', 3: 'Browser_Refresh', 4: 'Browser_Stop', 5: 'Browser_Search',
+            6: 'Browser_Favorites', 7: 'Browser_Home', 8: 'Volume_Mute', 9: 'Volume_Down', 10: 'Volume_Up',
+            11: 'Media_Next', 12: 'Media_Prev', 13: 'Media_Stop', 14: 'Media_Play_Pause', 15: 'Launch_Mail',
+            16: 'Launch_Media', 17: 'Launch_App1', 18: 'Launch_App2'}
+STREAM_BUFFER = 256  # Events iter_scan() queues ahead of its consumer
+PROGRESS_INTERVAL_S = 0.1
+
+# Desktop Entry spec: escapes in string values
+DESKTOP_ESCAPES = {'s': ' ', 'n': '\n', 't': '\t', 'r': '\r', '\\': '\\'}
+
+
+class ScanCancelled(Exception):
+    """A source ran out of budget or its scan was cancelled."""
+
+
+def split_exec(value: str, name: str = '', icon: str = '', location: str = '') -> List[str]:
+    r"""Split a .desktop Exec value into argv, as the Desktop Entry spec describes.
+
+    String escapes (\s, \n, \\, ...) are undone first. Arguments are then
+    split at unquoted whitespace; inside double quotes a backslash escapes
+    ", `, $ and itself. Field codes outside quotes are expanded: %i to
+    --icon <icon>, %c to name, %k to location and %% to %. File and URL codes
+    (%f, %U, ...) are dropped with the argument holding them, since the
+    launcher never passes files.
+
+    Args:
+        value: The Exec value as written in the file
+        name: The entry's Name (for %c)
+        icon: The entry's Icon (for %i)
+        location: Path of the .desktop file (for %k)
+    """
+    text = re.sub(r'\\(.)', lambda m: DESKTOP_ESCAPES.get(m.group(1), m.group(0)), value)
+    argv = []
+    current = None  # The argument being read, None between arguments
+    drop = False  # It held %i or a file/URL code, so it isn't passed
+    quoted = False
+    i = 0
+    while i < len(text):
+        char = text[i]
+        if quoted:
+            if char == '\\' and text[i + 1:i + 2] in ('"', '`', '$', '\\'):
+                current += text[i + 1]
+                i += 1
+            elif char == '"':
+                quoted = False
+            else:
+                current += char
+        elif char.isspace():
+            if current is not None and not drop:
+                argv.append(current)
+            current, drop = None, False
+        elif char == '%' and i + 1 < len(text):
+            code = text[i + 1]
+            i += 1
+            if current is None:
+                current = ''
+            if code == 'c':
+                current += name
+            elif code == 'k':
+                current += location
+            elif code == '%':
+                current += '%'
+            else:
+                if code == 'i' and icon and not current:
+                    argv.extend(['--icon', icon])
+                drop = True
+        else:
+            if current is None:
+                current = ''
+            if char == '"':
+                quoted = True
+            else:
+                current += char
+        i += 1
+    if current is not None and not drop:
+        argv.append(current)
+    return argv
+
+
+class SourceRun:
+    """Budget, cancellation and cost accounting for one source during a scan.
+
+    report: {'source', 'status', 'files', 'cached', 'bytes', 'parse_ms',
+    'errors', 'elapsed_ms', 'results'}; files counts every file visited,
+    cached those whose records came from the scan index, status is 'ok',
+    'timeout', 'error' or 'cancelled', errors a list of "path: message" strings (at most
+    MAX_REPORTED_ERRORS).
+    """
+
+    def __init__(self, name: str, budget_s: float):
+        self.name = name
+        self.started = time.monotonic()
+        self.deadline = self.started + budget_s
+        self.cancelled = threading.Event()
+        self.listed = None  # Files listed, once the listing is complete
+        self.futures = []  # Parses submitted for this source
+        self._lock = threading.Lock()
+        self.report = {'source': name, 'status': 'running', 'files': 0, 'cached': 0, 'bytes': 0, 'parse_ms': 0.0,
+                       'errors': [], 'elapsed_ms': 0.0, 'results': 0}
+
+    def remaining(self) -> float:
+        return max(0.0, self.deadline - time.monotonic())
+
+    def check(self):
+        """Raise ScanCancelled if the source should stop."""
+        if self.cancelled.is_set() or time.monotonic() >= self.deadline:
+            raise ScanCancelled(self.name)
+
+    def visited(self, size: int, parse_ms: float, cached: bool = False):
+        with self._lock:
+            self.report['files'] += 1
+            if cached:
+                self.report['cached'] += 1
+            else:
+                self.report['bytes'] += size
+                self.report['parse_ms'] += parse_ms
+
+    def error(self, where, error: Exception):
+        with self._lock:
+            if len(self.report['errors']) < MAX_REPORTED_ERRORS:
+                self.report['errors'].append(f"{where}: {error}")
+
+    def found(self, count: int):
+        with self._lock:
+            self.report['results'] += count
+
+    def finish(self, status: str) -> bool:
+        """Set the final status, unless one is set already. Returns whether this call set it."""
+        with self._lock:
+            if self.report['status'] != 'running':
+                return False
+            self.report['status'] = status
+            self.report['elapsed_ms'] = (time.monotonic() - self.started) * 1000
+            return True
 
 
 class ShortcutScanner:
-    """Discovers keyboard shortcuts from various sources on Windows."""
-
-    def __init__(self):
+    """Discovers keyboard shortcuts from various sources on Windows (and XDG application entries).
+
+    Sources run concurrently, each within its own wall-clock budget; file
+    sources list their files and parse them on a shared thread pool. A
+    source that overruns its budget is cancelled (its remaining parses are
+    dropped) without affecting the others. iter_scan() streams records as
+    files are parsed; scan_all() collects them, discarding the partial results
+    of sources that didn't finish, and leaves one SourceRun report per source
+    in self.report.
+
+    Directory listings and parsed files are kept in a ScanIndex; with an
+    index_path it persists, and a rescan only reads directories whose mtime
+    changed and parses files whose size, mtime or inode changed.
+    """
+
+    def __init__(self, budgets: Dict[str, float] = None, workers: int = PARSE_WORKERS,
+                 index_path: Optional[Path] = None, registry: Optional[RegistrySource] = None):
+        """Initialize the scanner.
+
+        Args:
+            budgets: Optional {source name: seconds} overriding DEFAULT_BUDGET_S
+            workers: Threads parsing files
+            index_path: Optional file to keep the scan index in between runs
+            registry: Registry to read (default: the live one, where there is one; e.g.
+                RegFileRegistry to read exported .reg files instead)
+        """
         self.shortcuts = []
+        self.report = []
+        self.budgets = budgets or {}
+        self.workers = max(1, workers)
+        self.index = ScanIndex(index_path)
+        if registry is None:
+            try:
+                registry = NativeRegistry()
+            except ImportError:
+                pass
+        self.registry = registry
+
+    def sources(self) -> Dict[str, tuple]:
+        """Sources in result order: {name: (file lister or None, parser)}.
+
+        File sources list paths and parse each into a list of shortcuts;
+        the others are called once with their SourceRun.
+        """
+        return {
+            'Start Menu': (self._lister('Start Menu'), self._parse_lnk_file),
+            'Desktop': (self._lister('Desktop'), self._parse_lnk_file),
+            'Taskbar': (self._lister('Taskbar'), self._parse_taskbar_lnk),
+            'AutoHotkey': (self._lister('AutoHotkey'), self._parse_ahk_file),
+            'Registry': (None, self._scan_registry_hotkeys),
+            'ShareX': (self._lister('ShareX'), self._parse_sharex_file),
+            'Applications': (self._lister('Applications'), self._parse_desktop_entry),
+            'Windows Built-in': (None, lambda run: self._get_windows_builtin_shortcuts()),
+        }
 
     def scan_all(self) -> List[Dict]:
         """Scan all sources for shortcuts."""
-        self.shortcuts = []
-
-        # Scan different sources
-        self.shortcuts.extend(self._scan_start_menu())
-        self.shortcuts.extend(self._scan_desktop())
-        self.shortcuts.extend(self._scan_taskbar())
-        self.shortcuts.extend(self._scan_autohotkey())
-        self.shortcuts.extend(self._scan_registry_hotkeys())
-        self.shortcuts.extend(self._scan_sharex())
-        self.shortcuts.extend(self._get_windows_builtin_shortcuts())
-
+        self.shortcuts, self.report = self.scan_with_report()
         return self.shortcuts
 
-    def _scan_start_menu(self) -> List[Dict]:
-        """Scan Start Menu for .lnk files with hotkeys."""
-        shortcuts = []
-
-        # Common Start Menu locations
-        start_menu_paths = [
-            Path(os.environ.get('APPDATA', '')) / 'Microsoft' / 'Windows' / 'Start Menu',
-            Path(os.environ.get('PROGRAMDATA', '')) / 'Microsoft' / 'Windows' / 'Start Menu',
-        ]
-
-        for start_path in start_menu_paths:
-            if start_path.exists():
-                # Find all .lnk files
-                for lnk_file in start_path.rglob('*.lnk'):
-                    shortcut_info = self._parse_lnk_file(lnk_file)
-                    if shortcut_info:
-                        shortcuts.append(shortcut_info)
-
-        return shortcuts
-
-    def _scan_desktop(self) -> List[Dict]:
-        """Scan Desktop for shortcuts."""
-        shortcuts = []
-        desktop = Path.home() / 'Desktop'
-
-        if desktop.exists():
-            for lnk_file in desktop.glob('*.lnk'):
-                shortcut_info = self._parse_lnk_file(lnk_file)
-                if shortcut_info:
-                    shortcuts.append(shortcut_info)
+    def scan_with_report(self) -> tuple:
+        """Scan all sources and collect the stream from iter_scan().
+
+        Returns:
+            (shortcuts, report): shortcuts in source and listing order (sources
+            that didn't finish 'ok' contribute none, and a hotkey seen again for
+            the same path is dropped), and one report dict per source
+        """
+        sources = list(self.sources())
+        parts = {name: [] for name in sources}  # {source: [(listing position, records)]}
+        reports = {}
+        for event in self.iter_scan():
+            if event['event'] == 'records':
+                parts[event['source']].append((event['position'], event['records']))
+            elif event['event'] == 'done':
+                reports[event['source']] = event['report']
 
-        return shortcuts
-
-    def _scan_taskbar(self) -> List[Dict]:
-        """Scan taskbar pinned items."""
         shortcuts = []
-
-        # Taskbar shortcuts location
-        taskbar_path = Path(os.environ.get('APPDATA', '')) / 'Microsoft' / 'Internet Explorer' / 'Quick Launch' / 'User Pinned' / 'TaskBar'
-
-        if taskbar_path.exists():
-            for lnk_file in taskbar_path.glob('*.lnk'):
-                shortcut_info = self._parse_lnk_file(lnk_file)
-                if shortcut_info:
-                    shortcut_info['source'] = 'Taskbar'
-                    shortcuts.append(shortcut_info)
-
-        return shortcuts
-
-    def _scan_autohotkey(self) -> List[Dict]:
-        """Scan for AutoHotkey scripts."""
-        shortcuts = []
-
-        # Common AutoHotkey locations
-        ahk_paths = [
-            Path.home() / 'Documents' / 'AutoHotkey',
-            Path(os.environ.get('APPDATA', '')) / 'Microsoft' / 'Windows' / 'Start Menu' / 'Programs' / 'Startup',
-        ]
-
-        for ahk_path in ahk_paths:
-            if ahk_path.exists():
-                for ahk_file in ahk_path.rglob('*.ahk'):
-                    # Parse AHK file for hotkeys
-                    ahk_shortcuts = self._parse_ahk_file(ahk_file)
-                    shortcuts.extend(ahk_shortcuts)
-
-        return shortcuts
-
-    def _parse_lnk_file(self, lnk_path: Path) -> Optional[Dict]:
-        """Parse a .lnk file to extract target and hotkey."""
+        for name in sources:
+            if reports[name]['status'] == 'ok':
+                for _position, records in sorted(parts[name], key=lambda part: part[0]):
+                    shortcuts.extend(records)
+        return dedupe(shortcuts), [reports[name] for name in sources]
+
+    def iter_scan(self, cancel: threading.Event = None, buffer: int = STREAM_BUFFER) -> Iterator[Dict]:
+        """Scan all sources concurrently, yielding results as each file is parsed.
+
+        Events (dicts):
+            {'event': 'records', 'source', 'path', 'position', 'records'}: one
+                parsed (or cached) file; position is its place in the source's
+                listing, path is None for sources that aren't files
+            {'event': 'progress', 'source', 'listed', 'files', 'results'}: at most
+                every PROGRESS_INTERVAL_S per source; listed is None until the
+                source has listed all its files
+            {'event': 'done', 'source', 'report'}: the source finished, timed out
+                or failed (see SourceRun); nothing more comes from it
+
+        Sources and parses put events into a queue of at most buffer events
+        and wait while it is full, so a slow consumer slows the scan instead
+        of piling up results. The wait counts against each source's budget.
+        Setting cancel, or closing the generator, stops all sources; the scan
+        index then keeps what was parsed but prunes nothing.
+
+        Args:
+            cancel: Optional event that stops the scan when set
+            buffer: Most events waiting for the consumer
+        """
+        sources = self.sources()
+        runs = {name: SourceRun(name, self.budgets.get(name, DEFAULT_BUDGET_S)) for name in sources}
+        events = queue.Queue(maxsize=max(1, buffer))
+        done = set()
+        last_progress = {}
+        self.index.begin()
+
+        # Not context managers: leaving a with-block would wait for a hung source
+        source_pool = ThreadPoolExecutor(max_workers=len(sources), thread_name_prefix='scan-source')
+        parse_pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='scan-parse')
+        source_futures = []
+        try:
+            for name, (lister, parser) in sources.items():
+                source_futures.append(source_pool.submit(self._run_source, runs[name], lister, parser, parse_pool,
+                                                         events))
+
+            while len(done) < len(runs):
+                if cancel is not None and cancel.is_set():
+                    break
+                now = time.monotonic()
+                for name, run in runs.items():
+                    if name not in done and now >= run.deadline and run.finish('timeout'):
+                        run.cancelled.set()
+                        done.add(name)
+                        yield {'event': 'done', 'source': name, 'report': run.report}
+
+                timeout = min([run.deadline for name, run in runs.items() if name not in done] or [now])
+                try:
+                    event = events.get_nowait()
+                except queue.Empty:
+                    try:
+                        # Wake up regularly to notice cancel being set
+                        event = events.get(timeout=min(max(0.0, timeout - now), 0.1))
+                    except queue.Empty:
+                        continue
+                name = event['source']
+                if name in done:
+                    continue  # Left over from a source that timed out
+                if event['event'] == 'done':
+                    done.add(name)
+                    yield event
+                    continue
+
+                yield event
+                run = runs[name]
+                now = time.monotonic()
+                if now - last_progress.get(name, 0.0) >= PROGRESS_INTERVAL_S:
+                    last_progress[name] = now
+                    yield {'event': 'progress', 'source': name, 'listed': run.listed,
+                           'files': run.report['files'], 'results': run.report['results']}
+        finally:
+            for run in runs.values():
+                run.cancelled.set()
+                run.finish('cancelled')
+            # shutdown(cancel_futures=True) needs Python 3.9
+            for future in source_futures + [f for run in runs.values() for f in list(run.futures)]:
+                future.cancel()
+            source_pool.shutdown(wait=False)
+            parse_pool.shutdown(wait=False)
+            self.index.finish(complete=all(run.report['status'] == 'ok' for run in runs.values()))
+
+    def _emit(self, run: SourceRun, events: queue.Queue, event: Dict) -> bool:
+        """Queue an event, waiting while the buffer is full. False if the source was cancelled meanwhile."""
+        while not run.cancelled.is_set():
+            try:
+                events.put(event, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run_source(self, run: SourceRun, lister: Optional[Callable], parser: Callable,
+                    parse_pool: ThreadPoolExecutor, events: queue.Queue):
+        """Source thread: list and parse one source's files (or call it), within its budget."""
+        futures = run.futures
         try:
-            # Use PowerShell to read .lnk file properties
-            # Output format: TARGET|HOTKEY
-            ps_script = f"""
-            $sh = New-Object -ComObject WScript.Shell
-            $lnk = $sh.CreateShortcut('{lnk_path}')
-            $target = $lnk.TargetPath
-            $hotkey = $lnk.Hotkey
-            Write-Output "$target|$hotkey"
-            """
-
-            result = subprocess.run(
-                ['powershell', '-WindowStyle', 'Hidden', '-Command', ps_script],
-                capture_output=True,
-                text=True,
-                timeout=5,
-                creationflags=subprocess.CREATE_NO_WINDOW
-            )
-
-            if result.returncode != 0:
-                return None
-
-            output = result.stdout.strip()
-            if '|' in output:
-                parts = output.split('|', 1)
-                target = parts[0].strip()
-                hotkey = parts[1].strip() if len(parts) > 1 else ''
-
-                if target and os.path.exists(target):
-                    return {
-                        'name': lnk_path.stem,
-                        'path': target,
-                        'hotkey': hotkey if hotkey else None,
-                        'source': 'Start Menu' if 'Start Menu' in str(lnk_path) else 'Desktop',
-                        'type': 'shortcut'
-                    }
+            if lister is None:
+                records = parser(run)
+                run.found(len(records))
+                self._emit(run, events, {'event': 'records', 'source': run.name, 'path': None, 'position': 0,
+                                         'records': records})
+            else:
+                position = 0
+                for path in lister(run):
+                    run.check()
+                    cached = self._cached(run, path)
+                    if cached is not None:
+                        run.found(len(cached))
+                        if not self._emit(run, events, {'event': 'records', 'source': run.name, 'path': path,
+                                                        'position': position, 'records': cached}):
+                            raise ScanCancelled(run.name)
+                    else:
+                        futures.append(parse_pool.submit(self._parse_counted, run, parser, path, position, events))
+                    position += 1
+                run.listed = position
+                for future in futures:
+                    finished, _ = wait([future], timeout=run.remaining())
+                    if not finished:
+                        raise ScanCancelled(run.name)
+            status = 'ok'
+        except ScanCancelled:
+            status = 'timeout'
         except Exception as e:
-            pass
-
-        return None
+            run.error(run.name, e)
+            status = 'error'
+        if status != 'ok':
+            for future in futures:
+                future.cancel()
+        if run.finish(status):
+            self._emit(run, events, {'event': 'done', 'source': run.name, 'report': run.report})
+
+    def _cached(self, run: SourceRun, path: str) -> Optional[List[Dict]]:
+        """Records of an unchanged file from the index (None if it needs parsing)."""
+        try:
+            cached = self.index.lookup(path, os.stat(path))
+        except OSError:
+            return None  # Let the parse report it
+        if cached is not None:
+            run.visited(0, 0.0, cached=True)
+        return cached
+
+    def _parse_counted(self, run: SourceRun, parser: Callable, path: str, position: int, events: queue.Queue):
+        """Parse one file, index and queue its records, and record its size, parse time and any error."""
+        if run.cancelled.is_set():
+            return
+        started = time.perf_counter()
+        size = 0
+        records = []
+        try:
+            stat = os.stat(path)
+            size = stat.st_size
+            records = parser(Path(path))
+            self.index.store(path, stat, records)
+        except Exception as e:
+            self.index.forget(path)
+            run.error(path, e)
+        finally:
+            run.visited(size, (time.perf_counter() - started) * 1000)
+        if records:
+            run.found(len(records))
+            self._emit(run, events, {'event': 'records', 'source': run.name, 'path': path, 'position': position,
+                                     'records': records})
+
+    def _find(self, run: SourceRun, root: Path, suffix: str, recursive: bool = True) -> Iterable[str]:
+        """Files under root ending in suffix (case-insensitive), using the index's directory listings."""
+        pending = [str(root)]
+        while pending:
+            run.check()
+            directory = pending.pop()
+            listing = self.index.list_dir(directory)
+            if listing is None:
+                continue
+            files, subdirs = listing
+            for name in files:
+                if name.lower().endswith(suffix):
+                    yield os.path.join(directory, name)
+            if recursive:
+                pending.extend(subdirs)
+
+    def roots(self) -> Dict[str, List[tuple]]:
+        """Where file sources look: {source name: [(folder, file name suffix, recursive)]}."""
+        appdata = Path(os.environ.get('APPDATA', ''))
+        data_dirs = [os.environ.get('XDG_DATA_HOME') or str(Path.home() / '.local' / 'share')]
+        data_dirs += (os.environ.get('XDG_DATA_DIRS') or '/usr/local/share:/usr/share').split(os.pathsep)
+        return {
+            'Start Menu': [
+                (appdata / 'Microsoft' / 'Windows' / 'Start Menu', '.lnk', True),
+                (Path(os.environ.get('PROGRAMDATA', '')) / 'Microsoft' / 'Windows' / 'Start Menu', '.lnk', True),
+            ],
+            'Desktop': [(Path.home() / 'Desktop', '.lnk', False)],
+            'Taskbar': [
+                (appdata / 'Microsoft' / 'Internet Explorer' / 'Quick Launch' / 'User Pinned' / 'TaskBar', '.lnk', False),
+            ],
+            'AutoHotkey': [
+                (Path.home() / 'Documents' / 'AutoHotkey', '.ahk', True),
+                (appdata / 'Microsoft' / 'Windows' / 'Start Menu' / 'Programs' / 'Startup', '.ahk', True),
+            ],
+            'ShareX': [
+                (Path(os.environ.get('USERPROFILE', '')) / 'Documents' / 'ShareX', 'hotkeysconfig.json', False),
+                (appdata / 'ShareX', 'hotkeysconfig.json', False),
+            ],
+            'Applications': [(Path(data_dir) / 'applications', '.desktop', True) for data_dir in data_dirs if data_dir],
+        }
+
+    def _lister(self, name: str) -> Callable:
+        """File lister for a source in roots()."""
+        def files(run: SourceRun) -> Iterable[str]:
+            for root, suffix, recursive in self.roots()[name]:
+                yield from self._find(run, root, suffix, recursive)
+        return files
+
+    def _parse_lnk_file(self, lnk_path: Path) -> List[Dict]:
+        """Parse a .lnk file to extract target and hotkey.
+
+        Raises:
+            LnkError: for malformed files
+        """
+        link = read_lnk(lnk_path)
+        target = link['path']
+        if target and os.path.exists(target):
+            return [{
+                'name': lnk_path.stem,
+                'path': target,
+                'hotkey': link['hotkey'],
+                'source': 'Start Menu' if 'Start Menu' in str(lnk_path) else 'Desktop',
+                'type': 'shortcut'
+            }]
+        return []
+
+    def _parse_taskbar_lnk(self, lnk_path: Path) -> List[Dict]:
+        """Parse a pinned taskbar .lnk file."""
+        shortcuts = self._parse_lnk_file(lnk_path)
+        for shortcut in shortcuts:
+            shortcut['source'] = 'Taskbar'
+        return shortcuts
 
     def _parse_ahk_file(self, ahk_path: Path) -> List[Dict]:
-        """Parse AutoHotkey file for hotkey definitions."""
+        """Parse AutoHotkey file for hotkey and hotstring definitions."""
         shortcuts = []
+        for token in read_ahk(ahk_path):
+            if token['kind'] == 'hotkey':
+                shortcuts.append({
+                    'name': f"AHK: {token['hotkey']}" + (' (release)' if token['release'] else ''),
+                    'path': str(ahk_path),
+                    'hotkey': token['hotkey'],
+                    'source': 'AutoHotkey',
+                    'type': 'ahk_script',
+                    'action': token['action'] or 'Custom Action',
+                    'ahk_hotkey': token['raw'],
+                    'release': token['release'],
+                    'context': token['context'],
+                })
+            else:
+                shortcuts.append({
+                    'name': f"AHK: {token['trigger']}",
+                    'path': str(ahk_path),
+                    'hotkey': None,
+                    'source': 'AutoHotkey',
+                    'type': 'ahk_hotstring',
+                    'action': token['action'] or 'Custom Action',
+                    'trigger': token['trigger'],
+                    'context': token['context'],
+                })
+        return shortcuts
 
-        try:
-            with open(ahk_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            # Simple regex to find hotkey patterns like "^!s::" (Ctrl+Alt+S)
-            import re
-            hotkey_pattern = r'^([^\s:]+)::\s*(.*)$'
-
-            for line in content.split('\n'):
+    def _parse_desktop_entry(self, entry_path: Path) -> List[Dict]:
+        """Parse an XDG .desktop file into an application shortcut (hidden entries are skipped)."""
+        fields = {}
+        in_entry = False
+        with open(entry_path, 'r', encoding='utf-8') as f:
+            for line in f:
                 line = line.strip()
-                if '::' in line and not line.startswith(';'):
-                    match = re.match(hotkey_pattern, line)
-                    if match:
-                        hotkey_combo = match.group(1)
-                        action = match.group(2) or 'Custom Action'
-
-                        shortcuts.append({
-                            'name': f"AHK: {hotkey_combo}",
-                            'path': str(ahk_path),
-                            'hotkey': hotkey_combo,
-                            'source': 'AutoHotkey',
-                            'type': 'ahk_script',
-                            'action': action
-                        })
-        except Exception as e:
-            print(f"Error parsing AHK file {ahk_path}: {e}")
-
-        return shortcuts
+                if line.startswith('['):
+                    in_entry = line == '[Desktop Entry]'
+                elif in_entry and '=' in line and not line.startswith('#'):
+                    key, value = line.split('=', 1)
+                    fields.setdefault(key.strip(), value.strip())
+
+        if (fields.get('Type') != 'Application' or not fields.get('Exec') or not fields.get('Name')
+                or fields.get('NoDisplay') == 'true' or fields.get('Hidden') == 'true'):
+            return []
+        # Executable plus argument list, so the launch never goes through a shell
+        argv = split_exec(fields['Exec'], fields['Name'], fields.get('Icon', ''), str(entry_path))
+        if not argv:
+            return []
+        return [{
+            'name': fields['Name'],
+            'path': argv[0],
+            'args': argv[1:],
+            'hotkey': None,
+            'source': 'Applications',
+            'type': 'desktop_entry'
+        }]
 
     def get_shortcuts_with_hotkeys(self) -> List[Dict]:
         """Return only shortcuts that have hotkeys defined."""
@@ -179,108 +549,65 @@ class ShortcutScanner:
         """Return all discovered applications, with or without hotkeys."""
         return self.shortcuts
 
-    def _scan_registry_hotkeys(self) -> List[Dict]:
-        """Scan Windows Registry for hotkey definitions."""
+    def _scan_registry_hotkeys(self, run: SourceRun) -> List[Dict]:
+        """Scan the registry for hotkey definitions (keyboard app keys, per-application hotkeys)."""
+        if self.registry is None:
+            return []
         shortcuts = []
-
-        try:
-            # Common registry paths for hotkeys
-            registry_paths = [
-                r'HKCU\Software\Microsoft\Windows\CurrentVersion\Explorer\AppKey',
-                r'HKCU\Software\Classes\Applications',
-            ]
-
-            for reg_path in registry_paths:
-                try:
-                    result = subprocess.run(
-                        ['reg', 'query', reg_path, '/s'],
-                        capture_output=True,
-                        text=True,
-                        timeout=5,
-                        creationflags=subprocess.CREATE_NO_WINDOW
-                    )
-
-                    if result.returncode == 0:
-                        # Parse registry output for hotkey entries
-                        lines = result.stdout.split('\n')
-                        current_key = None
-                        for line in lines:
-                            if line.startswith('HKEY'):
-                                current_key = line.strip()
-                            elif 'ShellExecute' in line or 'Hotkey' in line:
-                                parts = line.split('REG_SZ')
-                                if len(parts) >= 2:
-                                    value = parts[1].strip()
-                                    if value:
-                                        shortcuts.append({
-                                            'name': f'Registry: {Path(current_key).name}',
-                                            'path': value,
-                                            'hotkey': 'Registry defined',
-                                            'source': 'Registry',
-                                            'type': 'registry'
-                                        })
-                except Exception:
-                    pass
-
-        except Exception as e:
-            print(f"Error scanning registry: {e}")
-
+        for root, max_depth in REGISTRY_ROOTS:
+            app_keys = root.endswith('\\AppKey')
+            for key_path, values in self.registry.walk(root, descend=lambda path, depth: depth <= max_depth):
+                run.check()
+                key_name = key_path.rsplit('\\', 1)[-1]
+                target = hotkey = None
+                for value_name, value in values.items():
+                    if isinstance(value, str) and value:
+                        folded = value_name.lower()
+                        if 'shellexecute' in folded:
+                            target = value
+                        elif 'hotkey' in folded:
+                            hotkey = value
+                if app_keys and key_name.isdigit():
+                    hotkey = APP_KEYS.get(int(key_name), hotkey)
+                if target or hotkey:
+                    shortcuts.append({
+                        'name': f'Registry: {key_name}',
+                        'path': target or key_path,
+                        'hotkey': normalize_hotkey(hotkey) if hotkey else 'Registry defined',
+                        'source': 'Registry',
+                        'type': 'registry'
+                    })
         return shortcuts
 
-    def _scan_sharex(self) -> List[Dict]:
-        """Scan ShareX configuration for hotkeys."""
+    def _parse_sharex_file(self, hotkey_file: Path) -> List[Dict]:
+        """Parse a ShareX HotkeysConfig.json for hotkeys."""
         shortcuts = []
 
-        try:
-            # ShareX settings locations
-            sharex_paths = [
-                Path(os.environ.get('USERPROFILE', '')) / 'Documents' / 'ShareX',
-                Path(os.environ.get('APPDATA', '')) / 'ShareX',
-            ]
-
-            for sharex_path in sharex_paths:
-                if sharex_path.exists():
-                    # Look for HotkeysConfig.json
-                    hotkey_file = sharex_path / 'HotkeysConfig.json'
-                    if hotkey_file.exists():
-                        try:
-                            import json
-                            with open(hotkey_file, 'r', encoding='utf-8') as f:
-                                config = json.load(f)
-
-                            # Parse ShareX hotkeys
-                            if 'Hotkeys' in config:
-                                for hotkey in config['Hotkeys']:
-                                    # Get task name from Job field or Description
-                                    task_settings = hotkey.get('TaskSettings', {})
-                                    task_name = task_settings.get('Description', '')
-                                    if not task_name:
-                                        # Use Job field and make it more readable
-                                        job = task_settings.get('Job', 'Unknown')
-                                        task_name = job.replace('_', ' ')
-
-                                    hotkey_str = hotkey.get('HotkeyInfo', {}).get('Hotkey', '')
-
-                                    if hotkey_str:
-                                        # Clean up hotkey string: "PrintScreen, Control" -> "Ctrl+PrintScreen"
-                                        parts = [p.strip() for p in hotkey_str.split(',')]
-                                        # Remap common key names
-                                        key_map = {'Control': 'Ctrl', 'PrintScreen': 'PrtScn'}
-                                        mapped_parts = [key_map.get(p, p) for p in parts]
-                                        hotkey_display = '+'.join(mapped_parts)
-
-                                        shortcuts.append({
-                                            'name': f'ShareX: {task_name}',
-                                            'path': 'ShareX',
-                                            'hotkey': hotkey_display,
-                                            'source': 'ShareX',
-                                            'type': 'app_hotkey'
-                                        })
-                        except Exception as e:
-                            print(f"Error parsing ShareX config: {e}")
-
-        except Exception as e:
-            print(f"Error scanning ShareX: {e}")
+        import json
+        with open(hotkey_file, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+
+        # Parse ShareX hotkeys
+        if 'Hotkeys' in config:
+            for hotkey in config['Hotkeys']:
+                # Get task name from Job field or Description
+                task_settings = hotkey.get('TaskSettings', {})
+                task_name = task_settings.get('Description', '')
+                if not task_name:
+                    # Use Job field and make it more readable
+                    job = task_settings.get('Job', 'Unknown')
+                    task_name = job.replace('_', ' ')
+
+                hotkey_str = hotkey.get('HotkeyInfo', {}).get('Hotkey', '')
+
+                if hotkey_str and hotkey_str != 'None':
+                    shortcuts.append({
+                        'name': f'ShareX: {task_name}',
+                        'path': 'ShareX',
+                        'hotkey': normalize_hotkey(hotkey_str),  # "PrintScreen, Control" -> "Ctrl+PrintScreen"
+                        'source': 'ShareX',
+                        'type': 'app_hotkey'
+                    })
 
         return shortcuts
 
@@ -320,7 +647,7 @@ class ShortcutScanner:
             shortcuts.append({
                 'name': name,
                 'path': 'windows_builtin',
-                'hotkey': hotkey,
+                'hotkey': normalize_hotkey(hotkey),
                 'source': 'Windows Built-in',
                 'type': 'system_shortcut'
             })
@@ -0,0 +1,122 @@
+"""Indexed shortcut store for Otterly Launcher."""
+import uuid
+from typing import Dict, List, Optional, Iterator
+from hotkeys import hotkey_key
+
+
+def new_shortcut_id() -> str:
+    """Return a new persistent shortcut ID."""
+    return uuid.uuid4().hex
+
+
+class ShortcutStore:
+    """Holds shortcuts keyed by a stable ID with hash indexes by hotkey and path.
+
+    Shortcut dicts are kept as-is (the same objects handed out to callers),
+    so the store stays cheap to build and the UI can hold direct references.
+    Insertion order is preserved and matches the order saved to config.
+    Hotkeys are indexed by their parsed value, so 'alt+ctrl+s' finds a
+    shortcut saved as 'Ctrl+Alt+S'.
+    """
+
+    INDEXED_FIELDS = ('hotkey', 'path')
+    INDEX_KEYS = {'hotkey': hotkey_key}  # How a field's value is turned into its index key
+
+    def __init__(self, shortcuts: List[Dict] = None):
+        """Build the store, assigning IDs to any shortcut that lacks one.
+
+        Args:
+            shortcuts: Shortcut dicts as stored in config['shortcuts']
+        """
+        self._by_id = {}  # {id: shortcut}, ordered
+        self._indexes = {field: {} for field in self.INDEXED_FIELDS}  # {field: {value: {id: shortcut}}}
+        self.assigned_ids = 0  # How many IDs were created during load (migration)
+
+        for shortcut in shortcuts or []:
+            self.add(shortcut)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __iter__(self) -> Iterator[Dict]:
+        return iter(list(self._by_id.values()))
+
+    def __contains__(self, shortcut_id: str) -> bool:
+        return shortcut_id in self._by_id
+
+    def add(self, shortcut: Dict) -> Dict:
+        """Add a shortcut, giving it an ID if needed. Returns the stored dict."""
+        shortcut_id = shortcut.get('id')
+        if not shortcut_id or shortcut_id in self._by_id:
+            shortcut_id = new_shortcut_id()
+            shortcut['id'] = shortcut_id
+            self.assigned_ids += 1
+
+        self._by_id[shortcut_id] = shortcut
+        self._index(shortcut)
+        return shortcut
+
+    def get(self, shortcut_id: str) -> Optional[Dict]:
+        """Get a shortcut by ID."""
+        return self._by_id.get(shortcut_id)
+
+    def remove(self, shortcut_id: str) -> Optional[Dict]:
+        """Remove a shortcut by ID. Returns the removed dict, or None."""
+        shortcut = self._by_id.pop(shortcut_id, None)
+        if shortcut is not None:
+            self._unindex(shortcut)
+        return shortcut
+
+    def update(self, shortcut_id: str, **fields) -> Optional[Dict]:
+        """Update fields of a shortcut in place, keeping indexes current.
+
+        Example: store.update(sid, name='Editor', enabled=False)
+        """
+        shortcut = self._by_id.get(shortcut_id)
+        if shortcut is None:
+            return None
+
+        reindex = any(field in self._indexes for field in fields)
+        if reindex:
+            self._unindex(shortcut)
+        shortcut.update(fields)
+        if reindex:
+            self._index(shortcut)
+        return shortcut
+
+    def find_by_hotkey(self, hotkey: str) -> List[Dict]:
+        """Get all shortcuts bound to a hotkey."""
+        return list(self._indexes['hotkey'].get(hotkey_key(hotkey), {}).values())
+
+    def find_by_path(self, path: str) -> List[Dict]:
+        """Get all shortcuts pointing at a path."""
+        return list(self._indexes['path'].get(path, {}).values())
+
+    def has_hotkey(self, hotkey: str) -> bool:
+        """Check whether any shortcut is bound to a hotkey."""
+        return bool(self._indexes['hotkey'].get(hotkey_key(hotkey)))
+
+    def to_list(self) -> List[Dict]:
+        """Return shortcuts in order, as saved to config['shortcuts']."""
+        return list(self._by_id.values())
+
+    def _key(self, field: str, value):
+        key = self.INDEX_KEYS.get(field)
+        return key(value) if key is not None and value else value
+
+    def _index(self, shortcut: Dict):
+        """Add a shortcut to the secondary indexes."""
+        for field, index in self._indexes.items():
+            value = self._key(field, shortcut.get(field))
+            if value:
+                index.setdefault(value, {})[shortcut['id']] = shortcut
+
+    def _unindex(self, shortcut: Dict):
+        """Remove a shortcut from the secondary indexes."""
+        for field, index in self._indexes.items():
+            value = self._key(field, shortcut.get(field))
+            bucket = index.get(value) if value else None
+            if bucket is not None:
+                bucket.pop(shortcut['id'], None)
+                if not bucket:
+                    del index[value]
@@ -0,0 +1,85 @@
+"""Single-instance shortcuts: focus or signal a running copy instead of spawning."""
+import os
+import shutil
+import signal
+import subprocess
+import sys
+from typing import List, Optional, Tuple
+
+INSTANCE_ACTIONS = ('focus', 'signal')
+DEFAULT_SIGNAL = 'SIGUSR1'
+
+
+def instance_target(plan) -> Optional[Tuple[str, Optional[List[str]]]]:
+    """Get (executable, args to match) identifying a plan's running instances.
+
+    Shell plans have no single executable to look for, so they return None.
+    Arguments only have to match when the plan passes some.
+    """
+    if plan.uses_shell or not plan.executable:
+        return None
+    args = plan.argv[1:]
+    return plan.executable, (args if args else None)
+
+
+def focus_process(pid: int) -> bool:
+    """Bring a process's main window to the front. Returns False if none was found."""
+    if sys.platform == 'win32':
+        return _focus_windows(pid)
+    return _focus_x11(pid)
+
+
+def signal_process(pid: int, signal_name: str = None) -> bool:
+    """Send a signal (by name, default SIGUSR1) to a process. Returns False if it failed."""
+    signum = getattr(signal, signal_name or DEFAULT_SIGNAL, None)
+    if signum is None:
+        print(f"Unknown signal {signal_name}")
+        return False
+    try:
+        os.kill(pid, signum)
+        return True
+    except OSError as e:
+        print(f"Could not signal {pid}: {e}")
+        return False
+
+
+def _focus_windows(pid: int) -> bool:
+    """Activate the first visible top-level window owned by pid."""
+    import ctypes
+    from ctypes import wintypes
+    user32 = ctypes.windll.user32
+    found = []
+
+    @ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HWND, wintypes.LPARAM)
+    def callback(hwnd, _lparam):
+        owner = wintypes.DWORD()
+        user32.GetWindowThreadProcessId(hwnd, ctypes.byref(owner))
+        if owner.value == pid and user32.IsWindowVisible(hwnd) and not user32.GetWindow(hwnd, 4):  # GW_OWNER
+            found.append(hwnd)
+            return False
+        return True
+
+    user32.EnumWindows(callback, 0)
+    if not found:
+        return False
+    if user32.IsIconic(found[0]):
+        user32.ShowWindow(found[0], 9)  # SW_RESTORE
+    return bool(user32.SetForegroundWindow(found[0]))
+
+
+def _focus_x11(pid: int) -> bool:
+    """Activate a window of pid with xdotool or wmctrl, whichever is installed."""
+    if shutil.which('xdotool'):
+        result = subprocess.run(['xdotool', 'search', '--onlyvisible', '--pid', str(pid)],
+                                capture_output=True, text=True, timeout=2)
+        windows = result.stdout.split()
+        if windows:
+            return subprocess.run(['xdotool', 'windowactivate', windows[0]], timeout=2).returncode == 0
+
+    if shutil.which('wmctrl'):
+        result = subprocess.run(['wmctrl', '-lp'], capture_output=True, text=True, timeout=2)
+        for line in result.stdout.splitlines():
+            fields = line.split(None, 3)
+            if len(fields) >= 3 and fields[2] == str(pid):
+                return subprocess.run(['wmctrl', '-i', '-a', fields[0]], timeout=2).returncode == 0
+    return False
@@ -0,0 +1,215 @@
+"""Text snippets: typing a trigger string replaces it with stored text."""
+import ctypes
+import sys
+import threading
+import time
+from collections import deque
+from typing import Dict, List
+import keyboard
+from metrics import Metrics
+
+# Keys that don't change the typed text but also don't break a trigger
+IGNORED_KEYS = {'shift', 'left shift', 'right shift', 'caps lock'}
+# Held down, these make keystrokes commands rather than text
+MODIFIER_KEYS = {'ctrl', 'left ctrl', 'right ctrl', 'alt', 'left alt', 'right alt', 'alt gr',
+                 'windows', 'left windows', 'right windows'}
+HISTORY = 64  # States remembered for Backspace
+
+
+class SnippetAutomaton:
+    """Aho-Corasick automaton over snippet triggers, compiled to a full transition table.
+
+    goto[state] maps every character that leads somewhere other than the
+    start state, so advancing is one dictionary lookup per keystroke however
+    many snippets there are. output[state] is the snippet whose trigger ends
+    at that state (the longest one, if triggers overlap), or None.
+    """
+
+    def __init__(self, snippets: List[Dict]):
+        self.goto = [{}]
+        self.output = [None]
+        for snippet in snippets:
+            state = 0
+            for char in snippet['trigger']:
+                if char not in self.goto[state]:
+                    self.goto.append({})
+                    self.output.append(None)
+                    self.goto[state][char] = len(self.goto) - 1
+                state = self.goto[state][char]
+            self.output[state] = snippet
+
+        # Breadth-first: fill in failure transitions so every state has a complete table
+        fail = [0] * len(self.goto)
+        order = deque(self.goto[0].values())
+        while order:
+            state = order.popleft()
+            if self.output[state] is None:
+                self.output[state] = self.output[fail[state]]
+            for char, target in list(self.goto[state].items()):
+                fail[target] = self.goto[fail[state]].get(char, 0)
+                order.append(target)
+            # The failure state is shallower, so its table is already complete
+            for char, target in self.goto[fail[state]].items():
+                self.goto[state].setdefault(char, target)
+
+    def step(self, state: int, char: str) -> int:
+        return self.goto[state].get(char, 0)
+
+
+def _snippets_from(config_snippets: List[Dict]) -> List[Dict]:
+    """Valid snippets from config: {'trigger': ';sig', 'text': 'Best regards'}."""
+    snippets = []
+    for snippet in config_snippets or []:
+        if snippet.get('enabled', True) and snippet.get('trigger') and 'text' in snippet:
+            snippets.append({'trigger': snippet['trigger'], 'text': snippet['text']})
+    return snippets
+
+
+class SnippetExpander:
+    """Feeds keystrokes from the launcher's keyboard hook through a SnippetAutomaton.
+
+    Text keys advance the automaton one state; Backspace steps back; any
+    other key (Enter, arrows, Ctrl/Alt combinations...) resets it. When a
+    trigger completes, its characters are erased and the text is typed in
+    one injection: a single SendInput call on Windows, back-to-back keyboard
+    sends elsewhere. The injected key presses, which come back through the
+    hook, are not fed to the automaton.
+
+    set_snippets() compiles a new automaton on a background thread and swaps
+    it in when done; keystrokes meanwhile use the old one. Trigger-to-text
+    latency is recorded as 'snippet_ms' per trigger.
+    """
+
+    ECHO_TIMEOUT = 1.0  # Stop ignoring injected keys after this long, even if some never arrived
+
+    def __init__(self, metrics: Metrics = None):
+        self.metrics = metrics if metrics is not None else Metrics()
+        self._automaton = SnippetAutomaton([])
+        self._state = 0
+        self._history = deque(maxlen=HISTORY)
+        self._held = set()
+        self._echo = 0  # Injected key presses still expected back from the hook
+        self._echo_deadline = 0.0
+        self._build_lock = threading.Lock()
+
+    def set_snippets(self, config_snippets: List[Dict]):
+        """Compile snippets in the background and start using them when ready."""
+        snippets = _snippets_from(config_snippets)
+        threading.Thread(target=self._build, args=(snippets,), name='snippets', daemon=True).start()
+
+    def _build(self, snippets: List[Dict]):
+        with self._build_lock:  # Rebuilds finish in order
+            started = time.perf_counter()
+            automaton = SnippetAutomaton(snippets)
+            self._automaton = automaton
+            self._state = 0
+            self._history.clear()
+        if snippets:
+            print(f"Compiled {len(snippets)} snippets ({(time.perf_counter() - started) * 1000:.1f}ms)")
+
+    def feed(self, event):
+        """Advance on one keyboard event (called from the keyboard hook)."""
+        name = event.name
+        if name is None:
+            return
+        if event.event_type == keyboard.KEY_UP:
+            self._held.discard(name)
+            return
+
+        if name in IGNORED_KEYS:
+            return
+        if name in MODIFIER_KEYS:
+            self._held.add(name)
+            return
+
+        if self._echo:
+            if time.perf_counter() < self._echo_deadline:
+                self._echo -= 1
+                return
+            self._echo = 0
+
+        if name == 'backspace':
+            self._state = self._history.pop() if self._history else 0
+            return
+
+        char = ' ' if name == 'space' else name
+        if len(char) != 1 or self._held:
+            self._state = 0
+            self._history.clear()
+            return
+
+        self._history.append(self._state)
+        automaton = self._automaton
+        self._state = automaton.step(self._state, char)
+        snippet = automaton.output[self._state]
+        if snippet is not None:
+            self._state = 0
+            self._history.clear()
+            self._expand(snippet)
+
+    def _expand(self, snippet: Dict):
+        """Replace the typed trigger with the snippet text."""
+        started = time.perf_counter()
+        erase = len(snippet['trigger'])
+        try:
+            if sys.platform == 'win32':
+                sent = _send_input(erase, snippet['text'])
+            else:
+                sent = erase + len(snippet['text'])
+                for _ in range(erase):
+                    keyboard.send('backspace')
+                keyboard.write(snippet['text'])
+        except Exception as e:
+            print(f"Could not expand {snippet['trigger']}: {e}")
+            return
+        self._echo = sent
+        self._echo_deadline = time.perf_counter() + self.ECHO_TIMEOUT
+        self.metrics.record('snippet_ms', snippet['trigger'], (time.perf_counter() - started) * 1000)
+
+
+def _send_input(erase: int, text: str) -> int:
+    """Send erase Backspaces and then text as one SendInput batch. Returns the number of key presses."""
+    from ctypes import wintypes
+
+    ULONG_PTR = ctypes.c_size_t
+
+    class MOUSEINPUT(ctypes.Structure):
+        _fields_ = [('dx', wintypes.LONG), ('dy', wintypes.LONG), ('mouseData', wintypes.DWORD),
+                    ('dwFlags', wintypes.DWORD), ('time', wintypes.DWORD), ('dwExtraInfo', ULONG_PTR)]
+
+    class KEYBDINPUT(ctypes.Structure):
+        _fields_ = [('wVk', wintypes.WORD), ('wScan', wintypes.WORD), ('dwFlags', wintypes.DWORD),
+                    ('time', wintypes.DWORD), ('dwExtraInfo', ULONG_PTR)]
+
+    class HARDWAREINPUT(ctypes.Structure):
+        _fields_ = [('uMsg', wintypes.DWORD), ('wParamL', wintypes.WORD), ('wParamH', wintypes.WORD)]
+
+    class INPUT(ctypes.Structure):
+        class _INPUT(ctypes.Union):
+            # All three members, so ctypes sizes the union (and SendInput's cbSize) for 32 and 64 bits
+            _fields_ = [('mi', MOUSEINPUT), ('ki', KEYBDINPUT), ('hi', HARDWAREINPUT)]
+        _anonymous_ = ('u',)
+        _fields_ = [('type', wintypes.DWORD), ('u', _INPUT)]
+
+    KEYUP, UNICODE = 0x0002, 0x0004
+    VK_BACK, VK_RETURN, VK_TAB = 0x08, 0x0D, 0x09
+
+    strokes = [(VK_BACK, 0, 0)] * erase
+    for char in text.replace('\r\n', '\n'):
+        if char == '\n':
+            strokes.append((VK_RETURN, 0, 0))
+        elif char == '\t':
+            strokes.append((VK_TAB, 0, 0))
+        else:
+            data = char.encode('utf-16-le')
+            for i in range(0, len(data), 2):  # Characters outside the BMP are two UTF-16 units
+                strokes.append((0, int.from_bytes(data[i:i + 2], 'little'), UNICODE))
+
+    inputs = (INPUT * (2 * len(strokes)))()
+    for i, (vk, scan, flags) in enumerate(strokes):
+        for j, up in enumerate((0, KEYUP)):
+            item = inputs[2 * i + j]
+            item.type = 1  # INPUT_KEYBOARD
+            item.ki = KEYBDINPUT(vk, scan, flags | up, 0, 0)
+    ctypes.windll.user32.SendInput(len(inputs), inputs, ctypes.sizeof(INPUT))
+    return len(strokes)
@@ -1,6 +1,12 @@
+import sys
+from pathlib import Path
+from registry_source import RegFileRegistry
 from shortcut_scanner import ShortcutScanner
 
-scanner = ShortcutScanner()
+# python test_hotkeys.py [export.reg ...] reads the registry source from exported .reg files
+# Its own scan index next to this script, so a second run only re-parses what changed
+scanner = ShortcutScanner(index_path=Path(__file__).with_name('scan_index.json'),
+                          registry=RegFileRegistry(sys.argv[1:]) if sys.argv[1:] else None)
 results = scanner.scan_all()
 
 with_hotkeys = [s for s in results if s.get('hotkey') and s['hotkey'] != '']
@@ -10,3 +16,9 @@ print(f'With hotkeys: {len(with_hotkeys)}')
 print('\nShortcuts with hotkeys:')
 for s in with_hotkeys[:20]:
     print(f'  {s["name"]}: {s["hotkey"]}')
+
+print('\nSources:')
+for source in scanner.report:
+    print(f'  {source["source"]}: {source["status"]}, {source["results"]} shortcuts from {source["files"]} files '
+          f'({source["bytes"]} bytes, {source["parse_ms"]:.0f}ms parsing, {source["elapsed_ms"]:.0f}ms total, '
+          f'{len(source["errors"])} errors)')
@@ -0,0 +1,71 @@
+import random
+import sys
+import time
+from pathlib import Path
+from lnk_parser import LnkError, parse_lnk, read_lnk
+
+# python test_lnk.py [--fuzz N] [--bench N] checks lnk_parser against fixtures/lnk
+# (regenerate them with fixtures/lnk/make_fixtures.py), then optionally feeds it N truncated
+# and byte-mutated copies (only LnkError may come out) and times N parses
+FIXTURES = Path(__file__).parent / 'fixtures' / 'lnk'
+
+EXPECTED = {
+    'local.lnk': {'path': r'C:\Program Files\App\app.exe', 'arguments': '--new-window', 'hotkey': 'Ctrl+Alt+K',
+                  'working_dir': r'C:\Program Files\App', 'icon_location': r'C:\Program Files\App\app.ico',
+                  'icon_index': 2, 'description': 'The app'},
+    'unicode.lnk': {'path': r'C:\Users\Zoë\Café\café.exe', 'arguments': '--λ', 'hotkey': 'Ctrl+Shift+F1'},
+    'network.lnk': {'path': r'\\server\share\tools\run.exe', 'working_dir': r'\\server\share\tools'},
+    'environment.lnk': {'target': None, 'environment_target': r'%WINDIR%\notepad.exe', 'arguments': '/A',
+                        'known_folder': 'a77f5d77-2e2b-44c3-a6a2-aba601054a51'},
+    'relative.lnk': {'target': None, 'relative_path': r'..\bin\tool.exe',
+                     'path': str((FIXTURES.parent / 'bin' / 'tool.exe').resolve())},
+    'force_no_link_info.lnk': {'target': None, 'path': r'C:\Real\new.exe', 'arguments': '--safe'},
+    'ansi_strings.lnk': {'path': r'C:\Tools\ansi.exe', 'description': 'Résumé tool', 'hotkey': 'Shift+F5'},
+}
+
+failures = 0
+corpus = {}
+for name, expected in EXPECTED.items():
+    link = read_lnk(FIXTURES / name)
+    corpus[name] = (FIXTURES / name).read_bytes()
+    wrong = {field: (link.get(field), value) for field, value in expected.items() if link.get(field) != value}
+    if wrong:
+        failures += 1
+    print(f'{name}: ' + (', '.join(f'{field} is {got!r}, expected {value!r}' for field, (got, value) in wrong.items())
+                         if wrong else 'ok'))
+
+
+def option(flag: str) -> int:
+    return int(sys.argv[sys.argv.index(flag) + 1]) if flag in sys.argv else 0
+
+
+fuzz = option('--fuzz')
+if fuzz:
+    rng = random.Random(0)
+    rejected = 0
+    for _ in range(fuzz):
+        data = bytearray(rng.choice(list(corpus.values())))
+        if rng.random() < 0.5:
+            del data[rng.randrange(len(data)):]
+        for _ in range(rng.randint(1, 8)):
+            if data:
+                data[rng.randrange(len(data))] = rng.randrange(256)
+        try:
+            parse_lnk(bytes(data))
+        except LnkError:
+            rejected += 1
+        except Exception as e:
+            failures += 1
+            print(f'Fuzzed input raised {type(e).__name__}: {e}')
+    print(f'Fuzzed {fuzz} inputs: {rejected} rejected with LnkError, {fuzz - rejected} parsed')
+
+bench = option('--bench')
+if bench:
+    files = [FIXTURES / name for name in EXPECTED]
+    started = time.perf_counter()
+    for i in range(bench):
+        read_lnk(files[i % len(files)])
+    elapsed = time.perf_counter() - started
+    print(f'Read {bench} links in {elapsed * 1000:.0f}ms, {bench / elapsed:.0f} files/s')
+
+sys.exit(1 if failures else 0)
@@ -0,0 +1,54 @@
+import sys
+import tempfile
+import time
+from pathlib import Path
+from registry_source import RegFileRegistry
+from shortcut_scanner import ShortcutScanner, SourceRun
+
+# python test_registry.py [--bench KEYS] checks the .reg backend against fixtures/registry
+# (REGEDIT4 and version 5 exports), then optionally times it on a generated export of KEYS keys
+FIXTURES = Path(__file__).parent / 'fixtures' / 'registry'
+APPS = r'HKEY_CURRENT_USER\Software\Classes\Applications'
+
+EXPECTED_KEYS = [APPS + r'\café.exe', APPS + r'\plain.exe']  # shell\... is pruned below depth 1
+EXPECTED_VALUES = {'FriendlyAppName': 'Café "Pro"', 'Hotkey': 'alt+ctrl+c', 'Aliases': ['café', 'cafe'],
+                   'Flags': 16}
+EXPECTED_SHORTCUTS = [
+    ('Registry: 17', r'C:\Tools\Calc Plus\calc.exe', 'Launch_App1'),
+    ('Registry: 18', r'%SystemRoot%\system32\notepad.exe', 'Launch_App2'),
+    ('Registry: café.exe', APPS + r'\café.exe', 'Ctrl+Alt+C'),
+]
+
+failures = 0
+for export in sorted(FIXTURES.glob('*.reg')):
+    registry = RegFileRegistry([export])
+    walked = list(registry.walk(r'HKCU\Software\Classes\Applications', descend=lambda path, depth: depth <= 1))
+    keys = [path for path, _values in walked]
+    values = dict(walked).get(APPS + r'\café.exe')
+
+    scanner = ShortcutScanner(registry=registry)
+    shortcuts = [(s['name'], s['path'], s['hotkey']) for s in scanner._scan_registry_hotkeys(SourceRun('Registry', 10))]
+
+    for label, got, expected in (('keys', keys, EXPECTED_KEYS), ('values', values, EXPECTED_VALUES),
+                                 ('shortcuts', shortcuts, EXPECTED_SHORTCUTS)):
+        if got != expected:
+            failures += 1
+            print(f'{export.name}: {label} differ\n  got:      {got}\n  expected: {expected}')
+    print(f'{export.name}: {len(keys)} keys, {len(shortcuts)} shortcuts')
+
+if '--bench' in sys.argv:
+    count = int(sys.argv[sys.argv.index('--bench') + 1])
+    with tempfile.TemporaryDirectory() as folder:
+        export = Path(folder) / 'large.reg'
+        with open(export, 'w', encoding='utf-16') as f:
+            f.write('Windows Registry Editor Version 5.00\n\n')
+            for i in range(count):
+                f.write(f'[{APPS}\\app{i}.exe]\n"FriendlyAppName"="App {i}"\n"Hotkey"="ctrl+alt+{i % 10}"\n\n')
+                f.write(f'[{APPS}\\app{i}.exe\\shell\\open\\command]\n@="\\"C:\\\\Apps\\\\app{i}.exe\\" \\"%1\\""\n\n')
+        started = time.perf_counter()
+        walked = sum(1 for _ in RegFileRegistry([export]).walk(APPS, descend=lambda path, depth: depth <= 1))
+        elapsed = time.perf_counter() - started
+        print(f'Walked {walked} of {count * 2} keys ({export.stat().st_size} bytes) in {elapsed * 1000:.0f}ms, '
+              f'{count * 2 / elapsed:.0f} keys/s')
+
+sys.exit(1 if failures else 0)
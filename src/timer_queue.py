@@ -0,0 +1,91 @@
+"""Single-thread timer queue with monotonic deadlines."""
+import heapq
+import itertools
+import threading
+import time
+from typing import Callable
+
+
+class Timer:
+    """A scheduled callback; cancel() stops it from firing."""
+
+    __slots__ = ('deadline', 'callback', 'cancelled')
+
+    def __init__(self, deadline: float, callback: Callable):
+        self.deadline = deadline
+        self.callback = callback
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class TimerQueue:
+    """Runs callbacks at time.monotonic() deadlines from one thread.
+
+    Timers sit in one heap of (deadline, sequence, timer); the sequence keeps
+    timers with equal deadlines in the order they were added. The thread
+    sleeps until the earliest deadline (or until an earlier timer is added)
+    and fires everything due. Nothing runs while the queue is empty, so
+    there is no idle ticking. Cancelled timers are dropped when they come up.
+
+    Callbacks run on the queue's thread, one after another, and should be
+    short: anything slow (spawning, I/O) belongs on another thread.
+    """
+
+    def __init__(self, name: str = 'timer-queue'):
+        self._heap = []  # (deadline, sequence, Timer)
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def call_at(self, deadline: float, callback: Callable) -> Timer:
+        """Run callback() at a time.monotonic() deadline (past deadlines run as soon as possible)."""
+        timer = Timer(deadline, callback)
+        with self._condition:
+            heapq.heappush(self._heap, (deadline, next(self._sequence), timer))
+            if self._heap[0][2] is timer:
+                self._condition.notify()  # New earliest deadline: the thread may be sleeping past it
+        return timer
+
+    def call_later(self, delay: float, callback: Callable) -> Timer:
+        """Run callback() after delay seconds."""
+        return self.call_at(time.monotonic() + delay, callback)
+
+    def call_soon(self, callback: Callable) -> Timer:
+        """Run callback() on the queue's thread as soon as possible."""
+        return self.call_at(0, callback)
+
+    def shutdown(self):
+        """Stop the thread; pending timers are dropped."""
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+
+    def _run(self):
+        """Queue thread: sleep until the earliest deadline and fire what is due."""
+        while True:
+            with self._condition:
+                while True:
+                    if self._stopping:
+                        return
+                    if not self._heap:
+                        self._condition.wait()
+                        continue
+                    now = time.monotonic()
+                    if self._heap[0][0] <= now:
+                        break
+                    self._condition.wait(self._heap[0][0] - now)
+                due = []
+                while self._heap and self._heap[0][0] <= now:
+                    due.append(heapq.heappop(self._heap)[2])
+
+            for timer in due:
+                if timer.cancelled:
+                    continue
+                try:
+                    timer.callback()
+                except Exception as e:
+                    print(f"Timer callback failed: {e}")
@@ -8,7 +8,8 @@ import uuid
 class TrayIcon:
     """System tray icon with menu."""
 
-    def __init__(self, on_quit: Callable, on_settings: Callable = None, on_setup_wizard: Callable = None, on_manage_shortcuts: Callable = None):
+    def __init__(self, on_quit: Callable, on_settings: Callable = None, on_setup_wizard: Callable = None, on_manage_shortcuts: Callable = None,
+                 on_stop_macros: Callable = None):
         """Initialize tray icon.
 
         Args:
@@ -16,11 +17,13 @@ class TrayIcon:
             on_settings: Callback when user selects Settings (optional)
             on_setup_wizard: Callback when user selects Setup Wizard (optional)
             on_manage_shortcuts: Callback when user selects Manage Shortcuts (optional)
+            on_stop_macros: Callback when user selects Stop Macros (optional)
         """
         self.on_quit = on_quit
         self.on_settings = on_settings
         self.on_setup_wizard = on_setup_wizard
         self.on_manage_shortcuts = on_manage_shortcuts
+        self.on_stop_macros = on_stop_macros
         self.icon = None
         # Use a unique ID for this instance to avoid conflicts with old icons
         self.icon_id = f"otterly_launcher_{uuid.uuid4().hex[:8]}"
@@ -65,6 +68,11 @@ class TrayIcon:
         if self.on_manage_shortcuts:
             self.on_manage_shortcuts()
 
+    def _on_stop_macros_clicked(self, icon, item):
+        """Handle stop macros menu item click."""
+        if self.on_stop_macros:
+            self.on_stop_macros()
+
     def run(self):
         """Start the system tray icon."""
         menu_items = []
@@ -72,6 +80,9 @@ class TrayIcon:
         if self.on_manage_shortcuts:
             menu_items.append(pystray.MenuItem('Manage Shortcuts', self._on_manage_shortcuts_clicked))
 
+        if self.on_stop_macros:
+            menu_items.append(pystray.MenuItem('Stop Macros', self._on_stop_macros_clicked))
+
         if self.on_settings:
             menu_items.append(pystray.MenuItem('Settings', self._on_settings_clicked))
 
@@ -86,6 +97,15 @@ class TrayIcon:
 
         self.icon.run()
 
+    def notify(self, message: str, title: str = "Otterly Launcher"):
+        """Show a desktop notification from the tray icon (if the backend supports it)."""
+        if not self.icon:
+            return
+        try:
+            self.icon.notify(message, title)
+        except Exception as e:
+            print(f"Could not show notification: {e}")
+
     def stop(self):
         """Stop the tray icon."""
         if self.icon:
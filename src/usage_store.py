@@ -0,0 +1,217 @@
+"""Compact, memory-mapped launch statistics for frecency ranking."""
+import hashlib
+import heapq
+import math
+import mmap
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Callable, Iterable, Optional
+
+
+class UsageStore:
+    """Per-shortcut usage records in a fixed-layout file, kept apart from config.json.
+
+    File layout (little-endian):
+        header:  magic 'OTUS', version u16, reserved u16, record count u32, reserved u32
+        records: key 16s, score f64, last_used f64, launches u32, reserved u32
+
+    The score is exponentially decayed: what is stored is the score as of
+    last_used, and it halves every half_life seconds after that. Recording a
+    launch rewrites one 40-byte record in place through the memory map, so it
+    never touches config.json.
+    """
+
+    FILENAME = "usage.bin"
+    MAGIC = b'OTUS'
+    VERSION = 1
+    HEADER = struct.Struct('<4sHHII')
+    RECORD = struct.Struct('<16sddII')
+    GROW_RECORDS = 256
+    DEFAULT_HALF_LIFE_DAYS = 7
+
+    def __init__(self, config_dir: Path, half_life_days: float = None):
+        """Open (or create) the usage file.
+
+        Args:
+            config_dir: Configuration directory
+            half_life_days: Days for a launch's weight to halve (default 7)
+        """
+        self.path = Path(config_dir) / self.FILENAME
+        self.half_life = (half_life_days or self.DEFAULT_HALF_LIFE_DAYS) * 86400
+        self._slots = {}  # {key bytes: record slot}
+        self._lock = threading.Lock()
+        self._file = None
+        self._map = None
+        self._count = 0
+        self._capacity = 0
+        self._open()
+
+    def record_launch(self, shortcut_id: str, now: float = None):
+        """Add one launch to a shortcut's decayed score."""
+        now = time.time() if now is None else now
+        key = self._key(shortcut_id)
+
+        with self._lock:
+            if self._map is None:
+                return  # Closed
+            slot = self._slots.get(key)
+            if slot is None:
+                slot = self._append(key)
+                score, launches = 0.0, 0
+            else:
+                _key, score, last_used, launches, _reserved = self.RECORD.unpack_from(self._map, self._offset(slot))
+                score = self._decay(score, last_used, now)
+
+            self.RECORD.pack_into(self._map, self._offset(slot), key, score + 1.0, now, launches + 1, 0)
+
+    def score(self, shortcut_id: str, now: float = None) -> float:
+        """Get a shortcut's current frecency score (0 if never launched)."""
+        record = self._read(self._key(shortcut_id))
+        if record is None:
+            return 0.0
+        now = time.time() if now is None else now
+        score, last_used, _launches = record
+        return self._decay(score, last_used, now)
+
+    def stats(self, shortcut_id: str) -> Optional[Dict]:
+        """Get raw usage for a shortcut: {'score', 'last_used', 'launches'}, or None."""
+        record = self._read(self._key(shortcut_id))
+        if record is None:
+            return None
+        score, last_used, launches = record
+        return {'score': self._decay(score, last_used, time.time()), 'last_used': last_used, 'launches': launches}
+
+    def scorer(self, now: float = None) -> Callable[[Dict], float]:
+        """Get a key function scoring shortcut dicts, with 'now' fixed for a whole ranking pass."""
+        now = time.time() if now is None else now
+        return lambda shortcut: self.score(shortcut['id'], now)
+
+    def top(self, shortcuts: Iterable[Dict], k: int) -> List[Dict]:
+        """Get the k most frecent shortcuts that have been launched, best first.
+
+        Ties keep their original order.
+        """
+        score = self.scorer()
+        candidates = ((score(s), -i, s) for i, s in enumerate(shortcuts))
+        best = heapq.nlargest(k, (c for c in candidates if c[0] > 0), key=lambda c: c[:2])
+        return [s for _score, _order, s in best]
+
+    def close(self):
+        """Flush and close the memory map."""
+        with self._lock:
+            if self._map is not None:
+                self._map.flush()
+                self._map.close()
+                self._map = None
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _read(self, key: bytes) -> Optional[tuple]:
+        """Get (score, last_used, launches) stored for key, or None.
+
+        Takes the lock: record_launch() may grow the file and replace the map at any time.
+        """
+        with self._lock:
+            slot = self._slots.get(key)
+            if slot is None or self._map is None:
+                return None
+            _key, score, last_used, launches, _reserved = self.RECORD.unpack_from(self._map, self._offset(slot))
+        return score, last_used, launches
+
+    def _decay(self, score: float, last_used: float, now: float) -> float:
+        """Decay a score stored at last_used forward to now."""
+        elapsed = max(0.0, now - last_used)
+        return score * math.pow(0.5, elapsed / self.half_life)
+
+    def _key(self, shortcut_id: str) -> bytes:
+        """Pack a shortcut ID into 16 bytes (raw UUID, or a digest for other IDs)."""
+        if len(shortcut_id) == 32:
+            try:
+                return bytes.fromhex(shortcut_id)
+            except ValueError:
+                pass
+        return hashlib.md5(shortcut_id.encode('utf-8')).digest()
+
+    def _offset(self, slot: int) -> int:
+        return self.HEADER.size + slot * self.RECORD.size
+
+    def _open(self):
+        """Map the file, creating or repairing it as needed, and index its records."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if not self.path.exists():
+            self.path.write_bytes(b'')
+
+        self._file = open(self.path, 'r+b')
+        size = self.path.stat().st_size
+        count = 0
+        capacity = 0
+        if size >= self.HEADER.size:
+            magic, version, _r1, count, _r2 = self.HEADER.unpack(self._file.read(self.HEADER.size))
+            if magic == self.MAGIC and version == self.VERSION:
+                capacity = (size - self.HEADER.size) // self.RECORD.size
+                count = min(count, capacity)  # Drop records cut off by a short file
+            else:
+                print(f"Usage statistics file {self.path} is invalid; starting fresh.")
+                count = 0
+
+        if not capacity:
+            self._file.seek(0)
+            self._file.truncate(0)
+            self._file.write(self.HEADER.pack(self.MAGIC, self.VERSION, 0, 0, 0))
+            self._file.flush()
+
+        self._count = count
+        self._capacity = capacity if capacity > count else count + self.GROW_RECORDS
+        self._remap()
+
+        for slot in range(count):
+            offset = self._offset(slot)
+            self._slots[self._map[offset:offset + 16]] = slot
+
+    def _remap(self):
+        """(Re)create the memory map at the current capacity."""
+        if self._map is not None:
+            self._map.flush()
+            self._map.close()
+        self._file.truncate(self._offset(self._capacity))
+        self._map = mmap.mmap(self._file.fileno(), self._offset(self._capacity))
+
+    def _append(self, key: bytes) -> int:
+        """Claim the next free record slot for key, growing the file if needed."""
+        if self._count >= self._capacity:
+            # Windows cannot resize a mapped file, so unmap, grow and map again
+            self._capacity += self.GROW_RECORDS
+            self._remap()
+
+        slot = self._count
+        self._count += 1
+        self._slots[key] = slot
+        self.HEADER.pack_into(self._map, 0, self.MAGIC, self.VERSION, 0, self._count, 0)
+        return slot
+
+
+def rank_by_frecency(shortcuts: List[Dict], usage: UsageStore, k: int, tiers: List[int] = None) -> List[Dict]:
+    """Move the k best shortcuts to the front, keeping the rest in their order.
+
+    Without tiers, "best" means most frecent among launched shortcuts. With
+    tiers (one int per shortcut, e.g. search match quality) a better tier
+    always wins and frecency breaks ties within it. Uses a top-k heap
+    selection rather than sorting the whole list.
+    """
+    if usage is None or k <= 0 or not shortcuts:
+        return shortcuts
+
+    if tiers is None:
+        top = usage.top(shortcuts, k)
+    else:
+        score = usage.scorer()
+        candidates = ((tier, score(s), -i, s) for i, (s, tier) in enumerate(zip(shortcuts, tiers)))
+        top = [c[3] for c in heapq.nlargest(k, candidates, key=lambda c: c[:3])]
+
+    if not top:
+        return shortcuts
+    top_ids = {s['id'] for s in top}
+    return top + [s for s in shortcuts if s['id'] not in top_ids]
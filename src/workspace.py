@@ -0,0 +1,182 @@
+"""Workspace shortcuts: launch a set of member shortcuts together."""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, List, Callable
+
+DEFAULT_CONCURRENCY = 3
+RUNNING_POLICIES = ('skip', 'launch')
+
+
+def resolve_members(shortcut: Dict, shortcuts: List[Dict]) -> List[Dict]:
+    """Resolve a workspace's members to shortcuts, in dependency order.
+
+    The 'workspace' field looks like:
+        {"members": ["VS Code", {"shortcut": "Terminal", "after": ["VS Code"]}],
+         "concurrency": 3, "stagger_ms": 150, "if_running": "skip"}
+    Members refer to shortcuts by ID or name and must be app shortcuts.
+
+    Returns:
+        [{'shortcut': dict, 'after': set of member shortcut IDs}]
+
+    Raises:
+        ValueError: for unknown or non-app members, and dependency cycles
+    """
+    by_id = {s['id']: s for s in shortcuts if s.get('id')}
+    by_name = {}
+    for s in shortcuts:
+        by_name.setdefault(s.get('name'), s)
+
+    def lookup(ref):
+        found = by_id.get(ref) or by_name.get(ref)
+        if found is None:
+            raise ValueError(f"Workspace {shortcut.get('name')} has unknown member {ref!r}")
+        return found
+
+    members = {}  # {shortcut id: member}, in listed order
+    for entry in (shortcut.get('workspace') or {}).get('members', []):
+        ref, after = (entry.get('shortcut'), entry.get('after', [])) if isinstance(entry, dict) else (entry, [])
+        member = lookup(ref)
+        if not member.get('path') or member.get('hotkey') or member.get('steps') or member.get('workspace'):
+            raise ValueError(f"Workspace member {member.get('name')} is not an app shortcut")
+        members[member['id']] = {'shortcut': member, 'after': {lookup(dep)['id'] for dep in after}}
+
+    for member in members.values():
+        unknown = member['after'] - members.keys()
+        if unknown:
+            raise ValueError(f"{member['shortcut'].get('name')} waits for a shortcut that is not in the workspace")
+
+    # Kahn's algorithm, keeping the listed order among members that are ready together
+    ordered = []
+    placed = set()
+    while len(ordered) < len(members):
+        ready = [m for sid, m in members.items() if sid not in placed and m['after'] <= placed]
+        if not ready:
+            raise ValueError(f"Workspace {shortcut.get('name')} has a dependency cycle")
+        for member in ready:
+            ordered.append(member)
+            placed.add(member['shortcut']['id'])
+    return ordered
+
+
+class WorkspaceRun:
+    """Launches a workspace's members with bounded concurrency and staggered starts.
+
+    At most 'concurrency' spawns are in flight, consecutive spawn starts are
+    at least 'stagger_ms' apart (so apps don't all hit the disk at the same
+    instant), and a member starts only after the members it is 'after' have
+    spawned. With if_running 'skip', members that are already running (a live
+    child of this launcher, or a match in the process index) are left alone;
+    members whose dependencies failed are reported as blocked.
+
+    report holds one entry per member: {'id', 'name', 'status', 'offset_ms',
+    'spawn_ms'}, status being 'spawned', 'skipped', 'failed' or 'blocked'.
+    """
+
+    def __init__(self, executor, shortcut: Dict, members: List[Dict], on_done: Callable = None):
+        """Initialize the run.
+
+        Args:
+            executor: LaunchExecutor that spawns and tracks the members
+            shortcut: The workspace shortcut
+            members: Resolved members from resolve_members()
+            on_done: Optional callback(report) when every member is handled
+        """
+        options = shortcut.get('workspace') or {}
+        self.executor = executor
+        self.shortcut = shortcut
+        self.members = members
+        self.on_done = on_done
+        self.concurrency = max(1, int(options.get('concurrency', DEFAULT_CONCURRENCY)))
+        self.stagger = max(0.0, float(options.get('stagger_ms', 0))) / 1000.0
+        self.if_running = options.get('if_running', 'skip')
+        if self.if_running not in RUNNING_POLICIES:
+            raise ValueError(f"if_running must be one of {', '.join(RUNNING_POLICIES)}")
+
+        self.report = []
+        self.finished = threading.Event()
+        self._started = None
+        self._thread = threading.Thread(target=self._run, name='workspace', daemon=True)
+
+    def start(self):
+        """Start launching in the background."""
+        self._thread.start()
+
+    def _run(self):
+        """Run thread: dispatch ready members until all are handled."""
+        self._started = time.perf_counter()
+        pending = list(self.members)
+        done = set()  # IDs of members that spawned or were skipped
+        failed = set()
+        last_start = None
+        in_flight = {}  # {future: member}
+
+        print(f"Opening workspace {self.shortcut.get('name')} ({len(pending)} members)")
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='workspace') as pool:
+            while pending or in_flight:
+                for member in list(pending):
+                    if len(in_flight) >= self.concurrency:
+                        break
+                    member_id = member['shortcut']['id']
+                    if member['after'] & failed:
+                        pending.remove(member)
+                        failed.add(member_id)
+                        self._record(member, 'blocked')
+                        continue
+                    if not member['after'] <= done:
+                        continue
+
+                    pending.remove(member)
+                    if self.if_running == 'skip' and self.executor.find_instances(member['shortcut']):
+                        done.add(member_id)
+                        self._record(member, 'skipped')
+                        continue
+
+                    if last_start is not None and self.stagger:
+                        delay = last_start + self.stagger - time.perf_counter()
+                        if delay > 0:
+                            time.sleep(delay)
+                    last_start = time.perf_counter()
+                    in_flight[pool.submit(self._spawn, member)] = member
+
+                if not in_flight:
+                    continue
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    member = in_flight.pop(future)
+                    (done if future.result() else failed).add(member['shortcut']['id'])
+
+        total_ms = (time.perf_counter() - self._started) * 1000
+        self.executor.metrics.record('workspace_ms', self.shortcut.get('id'), total_ms)
+        print(f"Workspace {self.shortcut.get('name')} opened in {total_ms:.0f}ms:")
+        for entry in self.report:
+            spawn = f", spawn {entry['spawn_ms']:.1f}ms" if entry['spawn_ms'] is not None else ''
+            print(f"  {entry['name']}: {entry['status']} at +{entry['offset_ms']:.0f}ms{spawn}")
+
+        self.finished.set()
+        if self.on_done:
+            try:
+                self.on_done(self.report)
+            except Exception as e:
+                print(f"Workspace callback failed: {e}")
+
+    def _spawn(self, member: Dict) -> bool:
+        """Pool thread: spawn one member and report it."""
+        offset = time.perf_counter()
+        process = self.executor.launch_now(member['shortcut'])
+        spawn_ms = (time.perf_counter() - offset) * 1000
+        self._record(member, 'spawned' if process else 'failed', offset, spawn_ms)
+        if process:
+            key = f"{self.shortcut.get('id')}/{member['shortcut']['id']}"
+            self.executor.metrics.record('workspace_spawn_ms', key, spawn_ms)
+        return process is not None
+
+    def _record(self, member: Dict, status: str, at: float = None, spawn_ms: float = None):
+        at = time.perf_counter() if at is None else at
+        self.report.append({
+            'id': member['shortcut']['id'],
+            'name': member['shortcut'].get('name'),
+            'status': status,
+            'offset_ms': (at - self._started) * 1000,
+            'spawn_ms': spawn_ms,
+        })